@@ -138,6 +138,11 @@ ALLOWED_HOSTS = [
 
 LOG_DIR = ENV_TOKENS['LOG_DIR']
 
+COURSE_ASSETS_DISK_CACHE = ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE', COURSE_ASSETS_DISK_CACHE)
+COURSE_STRUCTURE_MEMORY_CACHE_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_MEMORY_CACHE_SIZE', COURSE_STRUCTURE_MEMORY_CACHE_SIZE
+)
+
 CACHES = ENV_TOKENS['CACHES']
 # Cache used for location mapping -- called many times with the same key/value
 # in a given request.
@@ -426,6 +426,20 @@ XBLOCK_SELECT_FUNCTION = prefer_xmodules
 # Paths to wrapper methods which should be applied to every XBlock's FieldData.
 XBLOCK_FIELD_DATA_WRAPPERS = ()
 
+# Local on-disk cache of course assets too large to be cached in the
+# "course_assets" cache, so that they need not be read from the contentstore
+# for each request.  The least recently used assets are evicted to keep the
+# cache under MAX_SIZE bytes.  The disk cache is disabled if DIRECTORY is None.
+COURSE_ASSETS_DISK_CACHE = {
+    'DIRECTORY': None,
+    'MAX_SIZE': 2 * 1024 * 1024 * 1024,
+}
+
+# In-process cache of the most recently used course structures of the Split
+# modulestore, consulted before the "course_structure_cache" cache.  It holds
+# up to this many bytes of (pickled) structures per process; 0 disables it.
+COURSE_STRUCTURE_MEMORY_CACHE_SIZE = 128 * 1024 * 1024
+
 ############################ Modulestore Configuration ################################
 MODULESTORE_BRANCH = 'draft-preferred'
 
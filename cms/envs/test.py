@@ -182,6 +182,9 @@ CACHES = {
     },
 }
 
+# Don't cache course structures across tests
+COURSE_STRUCTURE_MEMORY_CACHE_SIZE = 0
+
 # hide ratelimit warnings while running tests
 filterwarnings('ignore', message='No request passed to the backend, unable to rate-limit')
 
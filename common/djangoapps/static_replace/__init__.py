@@ -1,9 +1,11 @@
 import logging
 import re
+from uuid import uuid4
 
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
 from django.conf import settings
+from django.core.cache import cache
 
 from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
 from xmodule.modulestore.django import modulestore
@@ -32,6 +34,107 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+# Compiled url replacement regexes, keyed by their prefix regex.
+_URL_REPLACE_REGEXES = {}
+
+
+def _compiled_url_replace_regex(prefix):
+    """
+    Return the compiled _url_replace_regex for the given prefix, compiling it
+    only the first time it is needed.
+    """
+    regex = _URL_REPLACE_REGEXES.get(prefix)
+    if regex is None:
+        regex = _URL_REPLACE_REGEXES[prefix] = re.compile(_url_replace_regex(prefix))
+    return regex
+
+
+def _static_url_prefix(data_dir):
+    """
+    Return the regex of the prefix of static urls, which don't already point
+    into `data_dir`.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+JUMP_TO_ID_URL_PREFIX = '/jump_to_id/'
+COURSE_URL_PREFIX = '/course/'
+
+# How long a course's table of resolved asset urls is cached for, in seconds.
+ASSET_URL_TABLE_TIMEOUT = 24 * 60 * 60
+
+
+def _asset_url_table_keys(course_id):
+    """
+    Return the cache keys of the generation and of the table of resolved
+    asset urls of the given course.
+
+    The urls of static files depend on the deployed revision, whose files
+    may have different hashed names, and on the STATIC_URL of the service
+    resolving them, so each revision and STATIC_URL has its own table.
+    """
+    course_id = unicode(course_id).encode('utf-8')
+    return (
+        'static_replace.asset_url_table.generation.{}'.format(course_id),
+        'static_replace.asset_url_table.{}.{}.{}'.format(
+            course_id,
+            getattr(settings, 'EDX_PLATFORM_REVISION', None),
+            settings.STATIC_URL,
+        ),
+    )
+
+
+def get_asset_url_table(course_id, asset_url_config):
+    """
+    Return the generation of the given course's table of resolved asset urls,
+    and the cached table, a dict of the rest of a static url to its resolved url.
+
+    The table is empty if it isn't cached, or if it was resolved with an asset
+    url configuration other than `asset_url_config`.
+    """
+    generation_key, table_key = _asset_url_table_keys(course_id)
+    cached = cache.get_many([generation_key, table_key])
+    generation = cached.get(generation_key)
+    if generation is None:
+        generation = uuid4().hex
+        if not cache.add(generation_key, generation, None):
+            generation = cache.get(generation_key, generation)
+
+    table = cached.get(table_key)
+    if table is None or table['generation'] != generation or table['config'] != asset_url_config:
+        return generation, {}
+    return generation, table['urls']
+
+
+def set_asset_url_table(course_id, generation, asset_url_config, urls):
+    """
+    Cache the given course's table of resolved asset urls, resolved with the
+    given asset url configuration since the table had the given generation.
+    """
+    __, table_key = _asset_url_table_keys(course_id)
+    table = {
+        'generation': generation,
+        'config': asset_url_config,
+        'urls': urls,
+    }
+    cache.set(table_key, table, ASSET_URL_TABLE_TIMEOUT)
+
+
+def invalidate_asset_url_table(course_id):
+    """
+    Invalidate the given course's table of resolved asset urls, after its assets
+    have changed or it has been published.
+
+    This starts a new generation of the table, rather than deleting it, so that
+    a table resolved before this call and cached after it is never used.
+    """
+    generation_key, __ = _asset_url_table_keys(course_id)
+    cache.set(generation_key, uuid4().hex, None)
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -68,12 +171,20 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
     output: <text> after the link rewriting rules are applied
     """
 
+    return _compiled_url_replace_regex(JUMP_TO_ID_URL_PREFIX).sub(
+        _jump_to_id_url_replacer(jump_to_id_base_url), text
+    )
+
+
+def _jump_to_id_url_replacer(jump_to_id_base_url):
+    """
+    Return a function which replaces a matched /jump_to_id/ url; see replace_jump_to_id_urls.
+    """
     def replace_jump_to_id_url(match):
         quote = match.group('quote')
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
-
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return replace_jump_to_id_url
 
 
 def replace_course_urls(text, course_key):
@@ -86,14 +197,20 @@ def replace_course_urls(text, course_key):
     returns: text with the links replaced
     """
 
+    return _compiled_url_replace_regex(COURSE_URL_PREFIX).sub(_course_url_replacer(course_key), text)
+
+
+def _course_url_replacer(course_key):
+    """
+    Return a function which replaces a matched /course/ url; see replace_course_urls.
+    """
     course_id = course_key.to_deprecated_string()
 
     def replace_course_url(match):
         quote = match.group('quote')
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
-
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return replace_course_url
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -101,6 +218,16 @@ def process_static_urls(text, replacement_function, data_dir=None):
     Run an arbitrary replacement function on any urls matching the static file
     directory
     """
+    return _compiled_url_replace_regex(_static_url_prefix(data_dir)).sub(
+        _static_url_replacer(replacement_function), text
+    )
+
+
+def _static_url_replacer(replacement_function):
+    """
+    Return a function which runs `replacement_function` on a matched static url;
+    see process_static_urls.
+    """
     def wrap_part_extraction(match):
         """
         Unwraps a match group for the captures specified in _url_replace_regex
@@ -122,15 +249,7 @@ def process_static_urls(text, replacement_function, data_dir=None):
             return original
 
         return replacement_function(original, prefix, quote, rest)
-
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return wrap_part_extraction
 
 
 def make_static_urls_absolute(request, html):
@@ -162,41 +281,131 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     course_id: The course identifier used to distinguish static content for this course in studio
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
+    replace_static_url, save_resolved_urls = _static_url_resolver(data_directory, course_id, static_asset_path)
+    text = process_static_urls(
+        text,
+        replace_static_url,
+        data_dir=static_asset_path or data_directory
+    )
+    save_resolved_urls()
+    return text
 
-    def replace_static_url(original, prefix, quote, rest):
+
+def replace_urls(text, course_id, jump_to_id_base_url, data_directory=None, static_asset_path=''):
+    """
+    Replace the /static/, /course/ and /jump_to_id/ urls in `text`, as done by
+    replace_static_urls, replace_course_urls and replace_jump_to_id_urls, in a
+    single pass over the text.
+
+    text: The source text to do the substitution in
+    course_id: The course in which this rewrite happens
+    jump_to_id_base_url: The absolute path to the base of the jump_to_id handler; see replace_jump_to_id_urls
+    data_directory: The directory in which course data is stored
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    """
+    replacers = {
+        COURSE_URL_PREFIX: _course_url_replacer(course_id),
+        JUMP_TO_ID_URL_PREFIX: _jump_to_id_url_replacer(jump_to_id_base_url),
+    }
+    resolve_static_url, save_resolved_urls = _static_url_resolver(data_directory, course_id, static_asset_path)
+    replace_static_url = _static_url_replacer(resolve_static_url)
+
+    def replace_url(match):
         """
-        Replace a single matched url.
+        Replace a matched url with the replacer for its prefix.
         """
-        # Don't mess with things that end in '?raw'
-        if rest.endswith('?raw'):
-            return original
+        return replacers.get(match.group('prefix'), replace_static_url)(match)
+
+    prefix = u'{static}|{course}|{jump_to_id}'.format(
+        static=_static_url_prefix(static_asset_path or data_directory),
+        course=COURSE_URL_PREFIX,
+        jump_to_id=JUMP_TO_ID_URL_PREFIX,
+    )
+    text = _compiled_url_replace_regex(prefix).sub(replace_url, text)
+    save_resolved_urls()
+    return text
+
+
+def _static_url_resolver(data_directory=None, course_id=None, static_asset_path=''):
+    """
+    Return a function which replaces a single matched static url (see
+    replace_static_urls), and a function which saves the course asset urls
+    it resolved, to be called once all the urls have been replaced.
+
+    Each distinct url is only resolved once by the returned function, and the
+    asset url configuration is only read once.  Course asset urls are looked up
+    in the course's cached table of resolved asset urls, so that rendering
+    course content doesn't look up its assets in the contentstore once the
+    table has been filled.
+    """
+    # Map of the rest of a static url to its resolved url.
+    resolved_urls = {}
+    # The asset base url and excluded extensions, read when first needed.
+    asset_url_config = []
+    # The generation and urls of the course's table of resolved asset urls, and
+    # the urls resolved since, loaded when first needed.
+    asset_url_table = {}
+
+    def get_asset_url_config():
+        """
+        Return the asset base url and excluded extensions.
+        """
+        if not asset_url_config:
+            asset_url_config.extend([
+                AssetBaseUrlConfig.get_base_url(),
+                AssetExcludedExtensionsConfig.get_excluded_extensions(),
+            ])
+        return asset_url_config
+
+    def load_asset_url_table():
+        """
+        Return the course's table of resolved asset urls.
+        """
+        if not asset_url_table:
+            generation, urls = get_asset_url_table(course_id, tuple(get_asset_url_config()))
+            asset_url_table.update(generation=generation, urls=urls, new_urls={})
+        return asset_url_table
+
+    def resolve_course_asset_url(rest):
+        """
+        Resolve the url of a static url in a course with studio style urls.
+        """
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            url = staticfiles_storage.url(rest)
+        else:
+            # if not, then assume it's courseware specific content and then look in the
+            # Mongo-backed database
+            base_url, excluded_exts = get_asset_url_config()
+            url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
 
+            if AssetLocator.CANONICAL_NAMESPACE in url:
+                url = url.replace('block@', 'block/', 1)
+        return url
+
+    def resolve_static_url(prefix, rest):
+        """
+        Resolve the url of a single matched static url, or return None if
+        the url shouldn't be replaced.
+        """
         # In debug mode, if we can find the url as is,
         if settings.DEBUG and finders.find(rest, True):
-            return original
+            return None
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+            table = load_asset_url_table()
+            url = table['urls'].get(rest)
+            if url is None:
+                url = table['new_urls'][rest] = resolve_course_asset_url(rest)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -213,6 +422,32 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
                     rest, str(err)))
                 url = "".join([prefix, course_path])
 
+        return url
+
+    def replace_static_url(original, prefix, quote, rest):
+        """
+        Replace a single matched url.
+        """
+        # Don't mess with things that end in '?raw'
+        if rest.endswith('?raw'):
+            return original
+
+        if (prefix, rest) not in resolved_urls:
+            resolved_urls[(prefix, rest)] = resolve_static_url(prefix, rest)
+        url = resolved_urls[(prefix, rest)]
+        if url is None:
+            return original
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    def save_resolved_urls():
+        """
+        Add the course asset urls resolved by replace_static_url to the course's
+        table of resolved asset urls.
+        """
+        if asset_url_table and asset_url_table['new_urls']:
+            urls = asset_url_table['urls']
+            urls.update(asset_url_table['new_urls'])
+            set_asset_url_table(course_id, asset_url_table['generation'], tuple(get_asset_url_config()), urls)
+            asset_url_table['new_urls'] = {}
+
+    return replace_static_url, save_resolved_urls
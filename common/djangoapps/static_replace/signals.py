@@ -0,0 +1,16 @@
+"""
+Signal handlers for invalidating the cached tables of resolved asset urls.
+"""
+from django.dispatch.dispatcher import receiver
+from xmodule.modulestore.django import SignalHandler
+
+from static_replace import invalidate_asset_url_table
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Catches the signal that a course has been published in Studio and
+    invalidates the course's table of resolved asset urls.
+    """
+    invalidate_asset_url_table(course_key)
@@ -4,6 +4,7 @@
 import ddt
 import re
 
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import override_settings
 from django.utils.http import urlquote, urlencode
 from urlparse import urlparse, urlunparse, parse_qsl
@@ -13,6 +14,9 @@ from nose.tools import assert_equals, assert_true, assert_false  # pylint: disab
 from static_replace import (
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_urls,
+    invalidate_asset_url_table,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
@@ -118,6 +122,7 @@ def test_storage_url_not_exists(mock_storage):
 @patch('static_replace.AssetBaseUrlConfig.get_base_url')
 @patch('static_replace.AssetExcludedExtensionsConfig.get_excluded_extensions')
 def test_mongo_filestore(mock_get_excluded_extensions, mock_get_base_url, mock_modulestore, mock_static_content):
+    invalidate_asset_url_table(COURSE_KEY)
 
     mock_modulestore.return_value = Mock(MongoModuleStore)
     mock_static_content.get_canonicalized_asset_path.return_value = "c4x://mock_url"
@@ -169,6 +174,7 @@ def test_static_url_with_query(mock_modulestore, mock_storage):
      query params that contain "^/static/" are converted to full location urls
      query params that do not contain "^/static/" are left unchanged
     """
+    invalidate_asset_url_table(COURSE_KEY)
     mock_storage.exists.return_value = False
     mock_modulestore.return_value = Mock(MongoModuleStore)
 
@@ -177,6 +183,84 @@ def test_static_url_with_query(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_storage_url_resolved_once(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.png'
+
+    text = STATIC_SOURCE + " '/static/file.png' " + STATIC_SOURCE
+    assert_equals(
+        '"/static/file.png" \'/static/file.png\' "/static/file.png"',
+        replace_static_urls(text, DATA_DIRECTORY)
+    )
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_storage.url.assert_called_once_with('file.png')
+
+
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.modulestore', autospec=True)
+def test_replace_urls(mock_modulestore, mock_storage):
+    """
+    Make sure that replace_urls replaces static, course and jump_to_id urls
+    the same way as replacing each of them in turn.
+    """
+    invalidate_asset_url_table(COURSE_KEY)
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+
+    text = (
+        '<img src="/static/file.png"/><a href="/course/info">info</a>'
+        '<a href="/jump_to_id/block_id">block</a><img src="/static/file.png?raw"/>'
+    )
+    assert_equals(
+        replace_jump_to_id_urls(
+            replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+            COURSE_KEY,
+            jump_to_id_base_url
+        ),
+        replace_urls(text, COURSE_KEY, jump_to_id_base_url, data_directory=DATA_DIRECTORY)
+    )
+
+
+@patch('static_replace.cache', LocMemCache('static_replace_test', {}))
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.AssetBaseUrlConfig.get_base_url')
+@patch('static_replace.AssetExcludedExtensionsConfig.get_excluded_extensions')
+def test_asset_url_table(mock_get_excluded_extensions, mock_get_base_url, mock_storage, mock_static_content):
+    """
+    Make sure that course asset urls are resolved once, until the course's
+    table of resolved asset urls is invalidated.
+    """
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.return_value = "/c4x/org/course/asset/file.png"
+    mock_get_base_url.return_value = u''
+    mock_get_excluded_extensions.return_value = ['foobar']
+    expected = '"/c4x/org/course/asset/file.png"'
+
+    for __ in range(2):
+        assert_equals(expected, replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_KEY))
+    assert_equals(1, mock_static_content.get_canonicalized_asset_path.call_count)
+
+    # A different asset url configuration doesn't use the urls resolved with the previous one
+    mock_get_base_url.return_value = u'cdn.example.com'
+    assert_equals(expected, replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_KEY))
+    assert_equals(2, mock_static_content.get_canonicalized_asset_path.call_count)
+
+    invalidate_asset_url_table(COURSE_KEY)
+    assert_equals(expected, replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_KEY))
+    assert_equals(3, mock_static_content.get_canonicalized_asset_path.call_count)
+
+    # Other revisions and services don't use the urls resolved with other static files
+    with override_settings(EDX_PLATFORM_REVISION='other-revision'):
+        assert_equals(expected, replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_KEY))
+    assert_equals(4, mock_static_content.get_canonicalized_asset_path.call_count)
+    with override_settings(STATIC_URL='https://example.com/static/'):
+        assert_equals(expected, replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_KEY))
+    assert_equals(5, mock_static_content.get_canonicalized_asset_path.call_count)
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
@@ -204,6 +288,7 @@ def test_static_url_with_xblock_resource(mock_modulestore, mock_storage):
     Make sure that for URLs with XBlock resource URL, which start with /static/,
     we don't rewrite them.
     """
+    invalidate_asset_url_table(COURSE_KEY)
     mock_storage.exists.return_value = False
     mock_modulestore.return_value = Mock(MongoModuleStore)
 
@@ -220,6 +305,7 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     Make sure that for URLs with XBlock resource URL, which start with /static/,
     we don't rewrite them, even if these are served from an absolute URL like a CDN.
     """
+    invalidate_asset_url_table(COURSE_KEY)
     mock_storage.exists.return_value = False
     mock_modulestore.return_value = Mock(MongoModuleStore)
 
@@ -238,6 +324,8 @@ class CanonicalContentTest(SharedModuleStoreTestCase):
 
     def setUp(self):
         super(CanonicalContentTest, self).setUp()
+        for course in self.courses.values():
+            invalidate_asset_url_table(course.id)
 
     @classmethod
     def setUpClass(cls):
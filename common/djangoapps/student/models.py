@@ -1441,6 +1441,20 @@ class CourseEnrollment(models.Model):
     def enrollments_for_user(cls, user):
         return cls.objects.filter(user=user, is_active=1)
 
+    @classmethod
+    def prefetch_course_overviews(cls, enrollments):
+        """
+        Loads the course overviews of the given enrollments in a single
+        query, so that their course_overview doesn't query them one at a
+        time.  Course overviews which are missing or outdated in the
+        database are still loaded by course_overview.
+        """
+        course_overviews = CourseOverview.get_from_ids_if_exists(
+            [enrollment.course_id for enrollment in enrollments]
+        )
+        for enrollment in enrollments:
+            enrollment._course_overview = course_overviews.get(enrollment.course_id)  # pylint: disable=protected-access
+
     @classmethod
     def enrollment_status_hash_cache_key(cls, user):
         """ Returns the cache key for the cached enrollment status hash.
@@ -0,0 +1,199 @@
+"""
+Event tracker backend that sends events to another backend asynchronously.
+
+Events are buffered in a bounded in-memory queue, and sent in batches to the
+wrapped backend by a background thread, so that sending an event doesn't block
+the request thread on the wrapped backend.  For example::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {...},
+              },
+              'max_queue_size': 10000,
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import Queue
+import threading
+import time
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+
+class _FlushRequest(object):
+    """
+    Queued by `BufferedBackend.flush`, to be notified by the worker thread
+    once it has sent the events queued before it.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that buffers events in memory, and sends them
+    in batches to the wrapped backend from a background thread.
+
+    When the queue is full, events are dropped (optionally after waiting
+    for room in the queue), and counted in `dropped`.  Buffered events are
+    flushed to the wrapped backend when the process exits, for up to
+    `flush_timeout` seconds.
+
+    Events must not be modified once they have been sent.
+    """
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, block_timeout=0, flush_timeout=5,
+                 **kwargs):
+        """
+        Event tracker backend that sends events to another backend asynchronously.
+
+        :Parameters:
+
+          - `backend`: configuration of the wrapped backend, a dict with
+            its 'ENGINE' and 'OPTIONS' as in TRACKING_BACKENDS
+          - `max_queue_size`: the maximum number of events buffered
+          - `batch_size`: the maximum number of events sent to the
+            wrapped backend at once
+          - `block_timeout`: the number of seconds to wait for room in a
+            full queue before dropping an event; 0 to drop it immediately
+          - `flush_timeout`: the maximum number of seconds `flush` waits
+            for the buffered events to be sent
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        # Imported here to avoid a circular import, as the tracker
+        # instantiates its backends when it is imported.
+        from track.tracker import _instantiate_backend_from_name
+
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+        self.metric_tags = [u'backend:{}'.format(backend['ENGINE'])]
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.flush_timeout = flush_timeout
+
+        # Number of events dropped because the queue was full
+        self.dropped = 0
+        # Number of events handed to the wrapped backend
+        self.sent = 0
+
+        self._queue = None
+        self._worker = None
+        self._worker_pid = None
+        self._lock = threading.Lock()
+
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Buffer the event, to be sent to the wrapped backend."""
+        event_queue = self._get_queue()
+        try:
+            if self.block_timeout:
+                event_queue.put(event, timeout=self.block_timeout)
+            else:
+                event_queue.put_nowait(event)
+        except Queue.Full:
+            with self._lock:
+                self.dropped += 1
+            dog_stats_api.increment('track.buffered.dropped', tags=self.metric_tags)
+
+    def flush(self, timeout=None):
+        """
+        Wait for the worker thread to send the events buffered so far to
+        the wrapped backend, for up to `timeout` seconds (`flush_timeout`
+        by default), and return whether they have all been sent.
+
+        Only the process which started the worker thread flushes its events,
+        so this does nothing in a process forked from it, which has no events
+        of its own buffered until it starts its own worker.
+        """
+        if self._worker_pid != os.getpid():
+            return True
+
+        timeout = self.flush_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        flush_request = _FlushRequest()
+        try:
+            self._queue.put(flush_request, timeout=timeout)
+        except Queue.Full:
+            flushed = False
+        else:
+            flushed = flush_request.done.wait(max(deadline - time.time(), 0))
+        if not flushed:
+            log.warning('Timed out flushing the events of the buffered event tracker backend')
+        return flushed
+
+    def _get_queue(self):
+        """
+        Return the queue of buffered events, starting the worker thread which
+        consumes it if it isn't running in this process yet.
+
+        Threads don't survive a fork, so a process forked after the backend
+        was created starts its own worker, with its own queue.
+        """
+        if self._worker_pid != os.getpid():
+            with self._lock:
+                if self._worker_pid != os.getpid():
+                    self._queue = Queue.Queue(maxsize=self.max_queue_size)
+                    self._worker = threading.Thread(target=self._run, name='BufferedBackend')
+                    self._worker.daemon = True
+                    self._worker.start()
+                    self._worker_pid = os.getpid()
+        return self._queue
+
+    def _run(self):
+        """Send the buffered events in batches, forever."""
+        while True:
+            self._send_next_batch()
+
+    def _send_next_batch(self):
+        """
+        Wait for events to be buffered, and send up to `batch_size` of them
+        to the wrapped backend.
+
+        A batch ends at a flush request, which is notified once the batch
+        has been sent.
+        """
+        events = []
+        flush_request = None
+        try:
+            while len(events) < self.batch_size:
+                item = self._queue.get(block=not events)
+                if isinstance(item, _FlushRequest):
+                    flush_request = item
+                    break
+                events.append(item)
+        except Queue.Empty:
+            pass
+
+        if events:
+            try:
+                self.backend.send_batch(events)
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Error sending events to the buffered event tracker backend')
+                dog_stats_api.increment('track.buffered.errors', tags=self.metric_tags)
+            with self._lock:
+                self.sent += len(events)
+            dog_stats_api.histogram('track.buffered.batch_size', len(events), tags=self.metric_tags)
+            dog_stats_api.gauge('track.buffered.queue_size', self._queue.qsize(), tags=self.metric_tags)
+
+        if flush_request is not None:
+            flush_request.done.set()
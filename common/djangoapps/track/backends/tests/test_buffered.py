@@ -0,0 +1,108 @@
+"""Tests for the buffered event tracker backend."""
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+from mock import patch
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """A backend that records the batches of events it is sent."""
+
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+        # Set once the backend is sent its first batch
+        self.sending = threading.Event()
+        # Cleared to make the backend wait before recording a batch
+        self.ready = threading.Event()
+        self.ready.set()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.sending.set()
+        self.ready.wait()
+        self.batches.append(events)
+
+    @property
+    def events(self):
+        """All the events sent, in order."""
+        return [event for batch in self.batches for event in batch]
+
+
+class TestBufferedBackend(TestCase):
+    """Tests for BufferedBackend."""
+
+    def create_backend(self, **kwargs):
+        """Return a BufferedBackend wrapping an InMemoryBackend."""
+        return BufferedBackend(
+            backend={'ENGINE': 'track.backends.tests.test_buffered.InMemoryBackend'},
+            **kwargs
+        )
+
+    def test_send(self):
+        backend = self.create_backend()
+        events = [{'test': index} for index in range(10)]
+        for event in events:
+            backend.send(event)
+        self.assertTrue(backend.flush())
+
+        self.assertEqual(backend.backend.events, events)
+        self.assertEqual(backend.sent, 10)
+        self.assertEqual(backend.dropped, 0)
+
+    def test_batch_size(self):
+        backend = self.create_backend(batch_size=3)
+        backend.backend.ready.clear()
+        for index in range(10):
+            backend.send({'test': index})
+        backend.backend.ready.set()
+        self.assertTrue(backend.flush())
+
+        self.assertEqual(len(backend.backend.events), 10)
+        self.assertTrue(all(len(batch) <= 3 for batch in backend.backend.batches))
+
+    def test_drop_when_full(self):
+        backend = self.create_backend(max_queue_size=2, batch_size=1)
+        backend.backend.ready.clear()
+        backend.send({'test': 'blocking'})
+        # Wait for the worker to take the first event, and block on sending it
+        self.assertTrue(backend.backend.sending.wait(5))
+        for index in range(4):
+            backend.send({'test': index})
+        backend.backend.ready.set()
+        self.assertTrue(backend.flush())
+
+        self.assertEqual(backend.dropped, 2)
+        self.assertEqual(backend.sent, 3)
+        self.assertEqual(backend.backend.events, [{'test': 'blocking'}, {'test': 0}, {'test': 1}])
+
+    def test_flush_timeout(self):
+        backend = self.create_backend()
+        backend.backend.ready.clear()
+        backend.send({'test': 'blocking'})
+        self.assertFalse(backend.flush(timeout=0.01))
+        self.assertEqual(backend.sent, 0)
+
+        backend.backend.ready.set()
+        self.assertTrue(backend.flush())
+        self.assertEqual(backend.sent, 1)
+
+    def test_flush_in_forked_process(self):
+        backend = self.create_backend()
+        backend.backend.ready.clear()
+        backend.send({'test': 'parent'})
+        # A forked process doesn't flush the events buffered by its parent
+        with patch('track.backends.buffered.os.getpid', return_value=-1):
+            self.assertTrue(backend.flush(timeout=0))
+        self.assertEqual(backend.sent, 0)
+
+        backend.backend.ready.set()
+        self.assertTrue(backend.flush())
+        self.assertEqual(backend.backend.events, [{'test': 'parent'}])
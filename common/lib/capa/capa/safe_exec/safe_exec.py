@@ -106,6 +106,11 @@ def safe_exec(
 
     If `unsafely` is true, then the code will actually be executed without sandboxing.
 
+    Cache hits and misses are counted in the `capa.safe_exec.cache` metric, and
+    the time spent executing the code (excluding cache lookups) is recorded in
+    the `capa.safe_exec.exec.time` metric, so the cache hit rate and the cost
+    of the sandbox can be monitored.
+
     """
     # Check the cache for a previous result.
     if cache:
@@ -115,6 +120,10 @@ def safe_exec(
         update_hash(md5er, safe_globals)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
         cached = cache.get(key)
+        dog_stats_api.increment(
+            'capa.safe_exec.cache',
+            tags=[u'result:{}'.format('miss' if cached is None else 'hit')],
+        )
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -134,15 +143,16 @@ def safe_exec(
         exec_fn = codejail_safe_exec
 
     # Run the code!  Results are side effects in globals_dict.
-    try:
-        exec_fn(
-            code_prolog + LAZY_IMPORTS + code, globals_dict,
-            python_path=python_path, extra_files=extra_files, slug=slug,
-        )
-    except SafeExecException as e:
-        emsg = e.message
-    else:
-        emsg = None
+    with dog_stats_api.timer('capa.safe_exec.exec.time', tags=[u'unsafely:{}'.format(bool(unsafely))]):
+        try:
+            exec_fn(
+                code_prolog + LAZY_IMPORTS + code, globals_dict,
+                python_path=python_path, extra_files=extra_files, slug=slug,
+            )
+        except SafeExecException as e:
+            emsg = e.message
+        else:
+            emsg = None
 
     # Put the result back in the cache.  This is complicated by the fact that
     # the globals dict might not be entirely serializable.
@@ -7,6 +7,8 @@ import random
 import textwrap
 import unittest
 
+from dogapi import dog_stats_api
+from mock import call, patch
 from nose.plugins.skip import SkipTest
 
 from capa.safe_exec import safe_exec, update_hash
@@ -127,6 +129,19 @@ class TestSafeExecCaching(unittest.TestCase):
         safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
         self.assertEqual(g['a'], 17)
 
+    def test_cache_metrics(self):
+        cache = DictCache({})
+        with patch.object(dog_stats_api, 'increment') as mock_increment:
+            safe_exec("a = 17", {}, cache=cache)
+            safe_exec("a = 17", {}, cache=cache)
+        self.assertEqual(
+            mock_increment.call_args_list,
+            [
+                call('capa.safe_exec.cache', tags=[u'result:miss']),
+                call('capa.safe_exec.cache', tags=[u'result:hit']),
+            ]
+        )
+
     def test_cache_large_code_chunk(self):
         # Caching used to die on memcache with more than 250 bytes of code.
         # Check that it doesn't any more.
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Records the timings of modulestore performance tests as machine-readable results,
+and compares the results of two runs (e.g. of two commits) to find regressions.
+
+Results are stored as JSON lines, one timing per line, such as:
+
+    {"revision": "0123abc", "timestamp": "...", "benchmark": "import", "store": "mixed_split",
+     "num_blocks": 341, "num_assets": 10, "elapsed_ms": 1234.5}
+"""
+
+from contextlib import contextmanager
+import datetime
+import json
+import subprocess
+import sys
+import time
+
+try:
+    import click
+except ImportError:
+    click = None
+
+# The fields of a result which aren't parameters of the benchmark.
+RESULT_FIELDS = ('revision', 'timestamp', 'elapsed_ms')
+
+# A benchmark whose median timing grows by more than this ratio is reported as a regression.
+REGRESSION_THRESHOLD = 1.2
+
+
+def current_revision():
+    """
+    Return the git commit of the working tree, or None if it can't be determined.
+    """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD']).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkResults(object):
+    """
+    Appends the timings of benchmarks to a JSON lines file.
+    """
+    def __init__(self, results_path, revision=None):
+        self.results_path = results_path
+        self.revision = revision or current_revision()
+
+    @contextmanager
+    def timer(self, benchmark, **params):
+        """
+        Time the wrapped block of code and record it as a result of `benchmark`, with
+        the given parameters (such as the modulestore and the size of the course).
+        """
+        start = time.time()
+        yield
+        elapsed_ms = (time.time() - start) * 1000
+        self.record(benchmark, elapsed_ms, **params)
+
+    def record(self, benchmark, elapsed_ms, **params):
+        """
+        Record a single timing of `benchmark`.
+        """
+        result = dict(params)
+        result.update({
+            'revision': self.revision,
+            'timestamp': datetime.datetime.utcnow().isoformat(),
+            'benchmark': benchmark,
+            'elapsed_ms': elapsed_ms,
+        })
+        with open(self.results_path, 'a') as results_file:
+            results_file.write(json.dumps(result, sort_keys=True) + '\n')
+
+
+def read_results(results_file):
+    """
+    Return a dict mapping each benchmark (identified by a sorted tuple of its parameters)
+    to the list of its timings in the given JSON lines file.
+    """
+    timings = {}
+    for line in results_file:
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        key = tuple(sorted(
+            (name, value) for name, value in result.iteritems() if name not in RESULT_FIELDS
+        ))
+        timings.setdefault(key, []).append(result['elapsed_ms'])
+    return timings
+
+
+def median(values):
+    """
+    Return the median of a non-empty list of numbers.
+    """
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def compare_results(baseline_timings, current_timings):
+    """
+    Compare the median timings of the benchmarks run in both the baseline and the current results.
+
+    Returns a list of (benchmark key, baseline median, current median, ratio) tuples, sorted
+    from the largest slowdown to the largest speedup.
+    """
+    comparison = []
+    for key in set(baseline_timings) & set(current_timings):
+        baseline = median(baseline_timings[key])
+        current = median(current_timings[key])
+        ratio = current / baseline if baseline else float('inf')
+        comparison.append((key, baseline, current, ratio))
+    comparison.sort(key=lambda row: row[3], reverse=True)
+    return comparison
+
+
+if click is not None:
+    @click.command()
+    @click.argument('baseline', type=click.File('r'))
+    @click.argument('current', type=click.File('r'))
+    @click.option('--threshold', type=click.FLOAT, default=REGRESSION_THRESHOLD,
+                  help='Slowdown ratio above which a benchmark is reported as a regression.')
+    def cli(baseline, current, threshold):
+        """
+        Compare two benchmark result files and exit with an error if any benchmark regressed.
+        """
+        regressed = False
+        for key, baseline_ms, current_ms, ratio in compare_results(read_results(baseline), read_results(current)):
+            is_regression = ratio > threshold
+            regressed = regressed or is_regression
+            click.echo("{:<80} {:>12.1f} {:>12.1f} {:>7.2f}{}".format(
+                ' '.join('{}={}'.format(name, value) for name, value in key),
+                baseline_ms,
+                current_ms,
+                ratio,
+                ' REGRESSION' if is_regression else '',
+            ))
+        sys.exit(1 if regressed else 0)
+
+if __name__ == '__main__':
+    if click is not None:
+        cli()  # pylint: disable=no-value-for-parameter
+    else:
+        print "Aborted! Module 'click' is not installed."
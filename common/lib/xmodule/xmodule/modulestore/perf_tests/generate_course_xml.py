@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Generates synthetic course XML of a configurable size, for use in modulestore performance tests.
+"""
+
+import os
+from lxml import etree
+
+try:
+    import click
+except ImportError:
+    click = None
+
+# The categories of the blocks at each level of the generated course, from the top down.
+# The deepest level of a course always consists of html blocks.
+CONTAINER_CATEGORIES = ('chapter', 'sequential', 'vertical')
+LEAF_CATEGORY = 'html'
+MAX_DEPTH = len(CONTAINER_CATEGORIES) + 1
+
+# Number of bytes in each generated static asset.
+ASSET_SIZE = 1024
+
+
+def block_categories(depth):
+    """
+    Return the categories of the blocks at each level of a course of the given depth (not counting the course).
+    """
+    if not 1 <= depth <= MAX_DEPTH:
+        raise ValueError("Course depth must be between 1 and {}, not {}.".format(MAX_DEPTH, depth))
+    return CONTAINER_CATEGORIES[:depth - 1] + (LEAF_CATEGORY,)
+
+
+def num_blocks(breadth, depth):
+    """
+    Return the number of blocks, including the course, in a course generated with the given breadth and depth.
+    """
+    return sum(breadth ** level for level in xrange(depth + 1))
+
+
+def add_children(parent, categories, breadth, url_name_prefix):
+    """
+    Add `breadth` children of the first category in `categories` to the `parent` XML element,
+    each with its own subtree of the remaining categories.
+    """
+    category = categories[0]
+    for index in xrange(breadth):
+        url_name = '{}_{}'.format(url_name_prefix, index)
+        child = etree.SubElement(
+            parent,
+            category,
+            url_name='{}_{}'.format(category, url_name),
+            display_name='{} {}'.format(category.capitalize(), url_name),
+        )
+        if len(categories) > 1:
+            add_children(child, categories[1:], breadth, url_name)
+        else:
+            child.text = 'Synthetic content of block {}.'.format(url_name)
+
+
+def make_course_xml(course_dir, org, course, run, breadth, depth, num_assets):
+    """
+    Write a synthetic course to `course_dir`.
+
+    Arguments:
+        course_dir: the directory to write the course to; it is created if it doesn't exist.
+        org, course, run: the identifiers of the course.
+        breadth: the number of children of the course and of each of its container blocks.
+        depth: the number of levels of blocks below the course.
+        num_assets: the number of static assets in the course.
+    """
+    if not os.path.isdir(course_dir):
+        os.makedirs(course_dir)
+
+    course_root = etree.Element(
+        'course',
+        org=org,
+        course=course,
+        url_name=run,
+        display_name='Synthetic course of {} blocks'.format(num_blocks(breadth, depth)),
+    )
+    add_children(course_root, block_categories(depth), breadth, 'block')
+    with open(os.path.join(course_dir, 'course.xml'), 'w') as xml_file:
+        etree.ElementTree(course_root).write(xml_file, pretty_print=True)
+
+    static_dir = os.path.join(course_dir, 'static')
+    if not os.path.isdir(static_dir):
+        os.makedirs(static_dir)
+    for index in xrange(num_assets):
+        with open(os.path.join(static_dir, 'asset_{}.txt'.format(index)), 'wb') as asset_file:
+            asset_file.write(os.urandom(ASSET_SIZE))
+
+
+if click is not None:
+    # pylint: disable=bad-continuation
+    @click.command()
+    @click.argument('course_dir', type=click.Path())
+    @click.option('--breadth',
+                  type=click.INT,
+                  default=4,
+                  help="Number of children of the course and of each container block.",
+                  required=False
+                  )
+    @click.option('--depth',
+                  type=click.INT,
+                  default=MAX_DEPTH,
+                  help="Number of levels of blocks below the course.",
+                  required=False
+                  )
+    @click.option('--num_assets',
+                  type=click.INT,
+                  default=10,
+                  help="Number of static assets in the course.",
+                  required=False
+                  )
+    def cli(course_dir, breadth, depth, num_assets):
+        """
+        Generates a synthetic course of the given size in COURSE_DIR.
+        """
+        make_course_xml(course_dir, 'perf', 'course', 'run', breadth, depth, num_assets)
+
+if __name__ == '__main__':
+    if click is not None:
+        cli()  # pylint: disable=no-value-for-parameter
+    else:
+        print "Aborted! Module 'click' is not installed."
@@ -0,0 +1,101 @@
+"""
+Performance tests of course import, export, publish and reads in the modulestore, using
+synthetic courses of different sizes.
+
+To run the tests, set the MODULESTORE_PERF_RESULTS environment variable to the path of the
+file the timings are appended to, and run this module with the unit test runner.  The results
+of runs on two different commits can be compared with benchmark_results.py to find regressions.
+"""
+import itertools
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+import unittest
+
+import ddt
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.perf_tests.benchmark_results import BenchmarkResults
+from xmodule.modulestore.perf_tests.generate_course_xml import LEAF_CATEGORY, make_course_xml, num_blocks
+from xmodule.modulestore.tests.utils import MIXED_MODULESTORE_SETUPS, SHORT_NAME_MAP
+from xmodule.modulestore.xml_exporter import export_course_to_xml
+from xmodule.modulestore.xml_importer import import_course_from_xml
+
+# The file the timings are appended to; the tests are skipped when this isn't set.
+PERF_RESULTS_PATH = os.environ.get('MODULESTORE_PERF_RESULTS')
+
+# Sizes of the synthetic courses, as (breadth, depth, number of assets) tuples.
+COURSE_SIZES = (
+    (2, 4, 10),
+    (4, 4, 100),
+    (6, 4, 1000),
+    (10, 3, 100),
+)
+
+COURSE_DIR = 'perf_course'
+
+
+@ddt.ddt
+@unittest.skipUnless(PERF_RESULTS_PATH, "Set MODULESTORE_PERF_RESULTS to run the modulestore performance tests.")
+class CourseImportExportPerfTest(unittest.TestCase):
+    """
+    This class exists to time the import, export, publishing and reading of synthetic
+    courses of different sizes in the different modulestores.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(CourseImportExportPerfTest, self).setUp()
+        self.data_dir = mkdtemp()
+        self.addCleanup(rmtree, self.data_dir, ignore_errors=True)
+        self.results = BenchmarkResults(PERF_RESULTS_PATH)
+
+    @ddt.data(*itertools.product(
+        MIXED_MODULESTORE_SETUPS,
+        COURSE_SIZES,
+    ))
+    @ddt.unpack
+    def test_course_timings(self, store_builder, course_size):
+        """
+        Generate timings for import, publish, reads and export of a synthetic course.
+        """
+        breadth, depth, num_assets = course_size
+        make_course_xml(os.path.join(self.data_dir, COURSE_DIR), 'perf', 'course', 'run', breadth, depth, num_assets)
+
+        params = {
+            'store': SHORT_NAME_MAP[store_builder],
+            'num_blocks': num_blocks(breadth, depth),
+            'depth': depth,
+            'num_assets': num_assets,
+        }
+
+        with store_builder.build() as (content_store, store):
+            course_key = store.make_course_key('perf', 'course', 'run')
+
+            with self.results.timer('import', **params):
+                import_course_from_xml(
+                    store,
+                    ModuleStoreEnum.UserID.test,
+                    self.data_dir,
+                    source_dirs=[COURSE_DIR],
+                    static_content_store=content_store,
+                    target_id=course_key,
+                    create_if_not_present=True,
+                    raise_on_failure=True,
+                )
+
+            with self.results.timer('publish', **params):
+                store.publish(store.make_course_usage_key(course_key), ModuleStoreEnum.UserID.test)
+
+            with self.results.timer('get_course', **params):
+                course = store.get_course(course_key, depth=None)
+            self.assertIsNotNone(course)
+
+            with self.results.timer('get_items', **params):
+                items = store.get_items(course_key, qualifiers={'category': LEAF_CATEGORY})
+            self.assertEqual(len(items), breadth ** depth)
+
+            with self.results.timer('export', **params):
+                export_course_to_xml(store, content_store, course_key, self.data_dir, 'exported_course')
@@ -8,6 +8,8 @@ import zlib
 import pymongo
 import pytz
 import re
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -15,6 +17,7 @@ from time import time
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -225,27 +228,117 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class StructureMemoryCache(object):
+    """
+    In-process LRU cache of deserialized course structures, keyed by structure id.
+
+    Structures never change once saved, so entries never need to be invalidated;
+    the least recently used structures are evicted to keep the total (pickled)
+    size of the cached structures under `max_size` bytes.
+
+    The cached structures are shared by all callers, which must not modify them.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        # dict {structure id: (structure, size)}, from least to most recently used
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, course_context=None):
+        """Return the cached structure with the given id, or None if it isn't cached."""
+        with TIMER.timer("StructureMemoryCache.get", course_context) as tagger:
+            with self._lock:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    # re-insert the entry to mark it as the most recently used
+                    self._entries[key] = entry
+            tagger.tag(from_cache=str(entry is not None).lower())
+            return entry[0] if entry is not None else None
+
+    def set(self, key, structure, size, course_context=None):
+        """
+        Cache the given structure, whose pickled size is `size` bytes, evicting the
+        least recently used structures as needed.  Structures larger than the cache
+        are not cached.
+        """
+        if size > self.max_size:
+            return
+
+        with TIMER.timer("StructureMemoryCache.set", course_context) as tagger:
+            evicted = 0
+            with self._lock:
+                previous_entry = self._entries.pop(key, None)
+                if previous_entry is not None:
+                    self.size -= previous_entry[1]
+                while self._entries and self.size + size > self.max_size:
+                    __, (__, evicted_size) = self._entries.popitem(last=False)
+                    self.size -= evicted_size
+                    evicted += 1
+                self._entries[key] = (structure, size)
+                self.size += size
+            tagger.measure('uncompressed_size', size)
+            tagger.measure('evicted', evicted)
+
+    def clear(self):
+        """Remove all structures from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# The process-wide StructureMemoryCache; see get_structure_memory_cache.
+_STRUCTURE_MEMORY_CACHE = None
+
+
+def get_structure_memory_cache():
+    """
+    Return the process-wide StructureMemoryCache, sized by the
+    COURSE_STRUCTURE_MEMORY_CACHE_SIZE setting, or None if that setting is 0
+    (or django isn't available).
+    """
+    global _STRUCTURE_MEMORY_CACHE  # pylint: disable=global-statement
+    max_size = getattr(settings, 'COURSE_STRUCTURE_MEMORY_CACHE_SIZE', 0) if DJANGO_AVAILABLE else 0
+    if not max_size:
+        return None
+    if _STRUCTURE_MEMORY_CACHE is None or _STRUCTURE_MEMORY_CACHE.max_size != max_size:
+        _STRUCTURE_MEMORY_CACHE = StructureMemoryCache(max_size)
+    return _STRUCTURE_MEMORY_CACHE
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    Structures are also cached in the in-process StructureMemoryCache (if
+    enabled), which is consulted first so that recently used structures need
+    not be decompressed and unpickled again.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
     def __init__(self):
         self.cache = None
+        self.memory_cache = None
         if DJANGO_AVAILABLE:
             try:
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+            else:
+                self.memory_cache = get_structure_memory_cache()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
         if self.cache is None:
             return None
 
+        if self.memory_cache is not None:
+            structure = self.memory_cache.get(key, course_context)
+            if structure is not None:
+                return structure
+
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
             compressed_pickled_data = self.cache.get(key)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
@@ -260,7 +353,10 @@ class CourseStructureCache(object):
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            return pickle.loads(pickled_data)
+            structure = pickle.loads(pickled_data)
+            if self.memory_cache is not None:
+                self.memory_cache.set(key, structure, len(pickled_data), course_context)
+            return structure
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
@@ -278,6 +374,9 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+        if self.memory_cache is not None:
+            self.memory_cache.set(key, structure, len(pickled_data), course_context)
+
 
 class MongoConnection(object):
     """
@@ -84,6 +84,7 @@ from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
@@ -754,12 +755,17 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 definitions = {definition['_id']: definition
                                for definition in descendent_definitions}
 
-                for block in new_module_data.itervalues():
+                for block_id, block in new_module_data.iteritems():
                     if block.definition in definitions:
                         definition = definitions[block.definition]
+                        # Copy the block, so the definition's fields aren't added to the block in the
+                        # structure, which may be shared with other callers (see StructureMemoryCache)
+                        block = copy.copy(block)
                         # convert_fields gets done later in the runtime's xblock_from_json
+                        block.fields = dict(block.fields)
                         block.fields.update(definition.get('fields'))
                         block.definition_loaded = True
+                        new_module_data[block_id] = block
 
             system.module_data.update(new_module_data)
             return system.module_data
@@ -814,8 +820,10 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 del self.request_cache.data.setdefault('course_cache', {})[course_version_guid]
             except KeyError:
                 pass
+            self.request_cache.data.setdefault('structure_index_cache', {}).pop(course_version_guid, None)
         else:
             self.request_cache.data['course_cache'] = {}
+            self.request_cache.data['structure_index_cache'] = {}
 
     def _lookup_course(self, course_key, head_validation=True):
         """
@@ -1209,20 +1217,25 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
-        # No need of these caches unless include_orphans is set to False
-        path_cache = None
-        parents_cache = None
+        # Only look at the blocks of the requested types, if they can be looked up in the index
+        block_types = self._indexable_block_types(qualifiers.get('block_type'))
 
-        if not include_orphans:
-            path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+        # No need of the index unless looking up block types or include_orphans is set to False
+        structure_index = None
+        if block_types is not None or not include_orphans:
+            structure_index = self._get_structure_index(course.course_key, course.structure)
 
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+        if block_types is not None:
+            block_ids = structure_index.blocks_of_types(block_types)
+        else:
+            block_ids = course.structure['blocks'].iterkeys()
+
+        for block_id in block_ids:
+            if _block_matches_all(course.structure['blocks'][block_id]):
                 if not include_orphans:
                     if (  # pylint: disable=bad-continuation
                         block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
+                        structure_index.has_path_to_root(block_id)
                     ):
                         items.append(block_id)
                 else:
@@ -1233,6 +1246,38 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
+    @staticmethod
+    def _indexable_block_types(criteria):
+        """
+        Return the list of block types matched by the given block_type qualifier of get_items,
+        or None if the qualifier doesn't restrict the block types to a list of values (e.g. a
+        regex or a function), so the types can't be looked up in the structure index.
+        """
+        if isinstance(criteria, basestring):
+            return [criteria]
+        if isinstance(criteria, dict) and criteria.keys() == ['$in']:
+            if all(isinstance(block_type, basestring) for block_type in criteria['$in']):
+                return criteria['$in']
+        return None
+
+    def _get_structure_index(self, course_key, structure):
+        """
+        Return the StructureIndex of the given structure.
+
+        The index of a saved structure version is cached, since such a version can't change;
+        the index of a structure being edited in a bulk operation is built anew on each call.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        is_saved = not bulk_write_record.active or structure['_id'] in bulk_write_record.structures_in_db
+        if self.request_cache is None or not is_saved:
+            return StructureIndex(structure)
+
+        index_cache = self.request_cache.data.setdefault('structure_index_cache', {})
+        structure_index = index_cache.get(structure['_id'])
+        if structure_index is None:
+            structure_index = index_cache[structure['_id']] = StructureIndex(structure)
+        return structure_index
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
@@ -1301,14 +1346,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        structure_index = self._get_structure_index(course.course_key, course.structure)
+        all_parent_ids = structure_index.get_parents(BlockKey.from_usage_key(locator))
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
         parent_ids = [
             valid_parent
-            for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
+            for valid_parent in set(all_parent_ids)
+            if structure_index.has_path_to_root(valid_parent)
         ]
 
         if len(parent_ids) == 0:
@@ -0,0 +1,72 @@
+"""
+Secondary indexes of a split course structure, used to answer get_items and parent
+queries without scanning every block in the structure.
+"""
+from collections import defaultdict
+
+
+# Block types which are the root of a course tree when they have no parents.
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+
+class StructureIndex(object):
+    """
+    Indexes of the blocks of a single structure version.
+
+    Since a saved structure version never changes, its index can be built once and reused
+    for every query of that version.
+    """
+    def __init__(self, structure):
+        """
+        Arguments:
+            structure (dict): the db json of a course structure, as returned by get_structure.
+        """
+        blocks = structure['blocks']
+
+        # dict {block_type: [BlockKey]}
+        blocks_by_type = defaultdict(list)
+        # dict {BlockKey: [BlockKey]} of a block to its parents
+        parents = defaultdict(list)
+        for block_key, block_data in blocks.iteritems():
+            blocks_by_type[block_key.type].append(block_key)
+            for child_key in block_data.fields.get('children', []):
+                parents[child_key].append(block_key)
+        self.blocks_by_type = dict(blocks_by_type)
+        self.parents = dict(parents)
+
+        # The set of blocks which have a path to the root of the course, i.e. which aren't orphans.
+        self.reachable = set()
+        stack = [
+            block_key for block_key in blocks
+            if block_key.type in ROOT_BLOCK_TYPES and block_key not in self.parents
+        ]
+        while stack:
+            block_key = stack.pop()
+            if block_key in self.reachable:
+                continue
+            self.reachable.add(block_key)
+            block_data = blocks.get(block_key)
+            if block_data is not None:
+                stack.extend(block_data.fields.get('children', []))
+
+    def get_parents(self, block_key):
+        """
+        Return the keys of the parents of the given block.
+        """
+        return self.parents.get(block_key, [])
+
+    def has_path_to_root(self, block_key):
+        """
+        Return whether the given block has a path to the root of the course.
+        """
+        return block_key in self.reachable
+
+    def blocks_of_types(self, block_types):
+        """
+        Return the keys of all the blocks of any of the given types.
+        """
+        return [
+            block_key
+            for block_type in set(block_types)
+            for block_key in self.blocks_by_type.get(block_type, [])
+        ]
@@ -1,7 +1,7 @@
 """ Test the behavior of split_mongo/MongoConnection """
 import unittest
 from mock import patch
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, StructureMemoryCache
 from xmodule.exceptions import HeartbeatFailure
 
 
@@ -17,3 +17,38 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestStructureMemoryCache(unittest.TestCase):
+    """ Test the LRU eviction of StructureMemoryCache """
+    def setUp(self):
+        super(TestStructureMemoryCache, self).setUp()
+        self.cache = StructureMemoryCache(100)
+
+    def test_get(self):
+        structure = {'_id': 'a'}
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.set('a', structure, 10)
+        self.assertIs(self.cache.get('a'), structure)
+        self.assertEqual(self.cache.size, 10)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 'structure a', 40)
+        self.cache.set('b', 'structure b', 40)
+        self.cache.get('a')
+        self.cache.set('c', 'structure c', 40)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'structure a')
+        self.assertEqual(self.cache.get('c'), 'structure c')
+        self.assertEqual(self.cache.size, 80)
+
+    def test_set_again(self):
+        self.cache.set('a', 'structure a', 40)
+        self.cache.set('a', 'structure a', 40)
+        self.assertEqual(self.cache.size, 40)
+
+    def test_too_large(self):
+        self.cache.set('a', 'structure a', 40)
+        self.cache.set('b', 'structure b', 101)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'structure a')
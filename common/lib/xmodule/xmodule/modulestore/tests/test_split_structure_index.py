@@ -0,0 +1,59 @@
+""" Test the indexes of split_mongo/structure_index """
+import unittest
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
+
+
+class TestStructureIndex(unittest.TestCase):
+    """ Test that StructureIndex answers queries the same way as scanning the structure """
+    def setUp(self):
+        super(TestStructureIndex, self).setUp()
+        self.course = BlockKey('course', 'course')
+        self.chapter = BlockKey('chapter', 'chapter')
+        self.sequential = BlockKey('sequential', 'sequential')
+        self.problem = BlockKey('problem', 'problem')
+        self.orphan_sequential = BlockKey('sequential', 'orphan')
+        self.orphan_problem = BlockKey('problem', 'orphan_problem')
+        children = {
+            self.course: [self.chapter],
+            self.chapter: [self.sequential],
+            self.sequential: [self.problem],
+            self.orphan_sequential: [self.orphan_problem, self.problem],
+            self.problem: [],
+            self.orphan_problem: [],
+        }
+        self.structure = {
+            'root': self.course,
+            'blocks': {
+                block_key: BlockData(block_type=block_key.type, fields={'children': block_children})
+                for block_key, block_children in children.iteritems()
+            },
+        }
+        self.index = StructureIndex(self.structure)
+
+    def test_blocks_of_types(self):
+        self.assertItemsEqual(self.index.blocks_of_types(['problem']), [self.problem, self.orphan_problem])
+        self.assertItemsEqual(
+            self.index.blocks_of_types(['chapter', 'sequential', 'chapter']),
+            [self.chapter, self.sequential, self.orphan_sequential],
+        )
+        self.assertEqual(self.index.blocks_of_types(['video']), [])
+
+    def test_get_parents(self):
+        self.assertEqual(self.index.get_parents(self.course), [])
+        self.assertEqual(self.index.get_parents(self.chapter), [self.course])
+        self.assertItemsEqual(self.index.get_parents(self.problem), [self.sequential, self.orphan_sequential])
+
+    def test_has_path_to_root(self):
+        for block_key in (self.course, self.chapter, self.sequential, self.problem):
+            self.assertTrue(self.index.has_path_to_root(block_key))
+        for block_key in (self.orphan_sequential, self.orphan_problem):
+            self.assertFalse(self.index.has_path_to_root(block_key))
+
+    def test_cycle(self):
+        self.structure['blocks'][self.orphan_problem].fields['children'] = [self.orphan_sequential]
+        index = StructureIndex(self.structure)
+        self.assertFalse(index.has_path_to_root(self.orphan_sequential))
+        self.assertFalse(index.has_path_to_root(self.orphan_problem))
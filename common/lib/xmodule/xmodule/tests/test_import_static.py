@@ -39,3 +39,21 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+    def test_import_static_files_in_parallel(self):
+        """
+        Test that importing static files with several workers imports the same files as a single worker
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+        remap_dicts = []
+        saved_names = []
+        for num_workers in (1, 4):
+            content_store = Mock()
+            content_store.generate_thumbnail.return_value = ("content", "location")
+            remap_dicts.append(import_static_content(course_dir, content_store, course_id, num_workers=num_workers))
+            saved_names.append(sorted(call[0][0].name for call in content_store.save.call_args_list))
+        self.assertEquals(remap_dicts[0], remap_dicts[1])
+        self.assertEquals(saved_names[0], saved_names[1])
+        self.assertIn("example.txt", saved_names[1])
+        self.assertNotIn("._example.txt", saved_names[1])
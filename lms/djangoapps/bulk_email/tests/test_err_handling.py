@@ -299,6 +299,20 @@ class TestEmailErrors(ModuleStoreTestCase):
         with self.assertRaisesRegexp(DuplicateTaskException, 'already completed'):
             send_course_email(entry_id, bogus_email_id, to_list, global_email_context, new_subtask_status.to_dict())
 
+    def test_update_completed_subtask(self):
+        entry = InstructorTask.create(self.course.id, "task_type", "task_key", "task_input", self.instructor)
+        entry_id = entry.id
+        subtask_ids = ["subtask-id-value", "other-subtask-id-value"]
+        initialize_subtask_info(entry, "emailed", 100, subtask_ids)
+        subtask_status = SubtaskStatus.create(subtask_ids[0], succeeded=1, state=SUCCESS)
+        update_subtask_status(entry_id, subtask_ids[0], subtask_status)
+        # the status of a duplicate of the completed subtask is not counted again:
+        self.assertFalse(update_subtask_status(entry_id, subtask_ids[0], subtask_status))
+        entry = InstructorTask.objects.get(pk=entry_id)
+        self.assertEquals(json.loads(entry.subtasks)['succeeded'], 1)
+        self.assertEquals(json.loads(entry.task_output)['succeeded'], 1)
+        self.assertNotEquals(entry.task_state, SUCCESS)
+
     def test_send_email_running_subtask(self):
         # test at a lower level, to ensure that the course gets checked down below too.
         entry = InstructorTask.create(self.course.id, "task_type", "task_key", "task_input", self.instructor)
@@ -126,7 +126,7 @@ def get_certificate_for_user(username, course_key):
 
 
 def generate_user_certificates(student, course_key, course=None, insecure=False, generation_mode='batch',
-                               forced_grade=None):
+                               forced_grade=None, course_grade=None):
     """
     It will add the add-cert request into the xqueue.
 
@@ -147,6 +147,8 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
         in case of django command and `self` if student initiated the request.
         forced_grade - a string indicating to replace grade parameter. if present grading
                        will be skipped.
+        course_grade - the student's CourseGrade, if already computed; for
+                       instance by CourseGradeFactory.iter for a batch of students.
     """
     xqueue = XQueueCertInterface()
     if insecure:
@@ -157,7 +159,8 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
         course_key,
         course=course,
         generate_pdf=generate_pdf,
-        forced_grade=forced_grade
+        forced_grade=forced_grade,
+        course_grade=course_grade,
     )
     # If cert_status is not present in certificate valid_statuses (for example unverified) then
     # add_cert returns None and raises AttributeError while accesing cert attributes.
@@ -55,6 +55,7 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
 from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.fields import CreationDateTimeField
@@ -66,6 +67,7 @@ from openedx.core.djangoapps.signals.signals import COURSE_CERT_AWARDED
 from badges.events.course_complete import course_badge_check
 from badges.events.course_meta import completion_check, course_group_check
 from config_models.models import ConfigurationModel
+import request_cache
 from lms.djangoapps.instructor_task.models import InstructorTask
 from util.milestones_helpers import fulfill_course_milestone, is_prerequisite_courses_enabled
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, NoneToEmptyManager
@@ -253,6 +255,10 @@ class GeneratedCertificate(models.Model):
         This returns the certificate for a student for a particular course
         or None if no such certificate exits.
         """
+        prefetched_certificates = cls._prefetched_certificates()
+        if (student.id, course_id) in prefetched_certificates:
+            return prefetched_certificates[(student.id, course_id)]
+
         try:
             return cls.objects.get(user=student, course_id=course_id)
         except cls.DoesNotExist:
@@ -260,6 +266,45 @@ class GeneratedCertificate(models.Model):
 
         return None
 
+    @classmethod
+    def prefetch_certificates_for_student(cls, student, course_ids):
+        """
+        Loads the certificates of a student for the given courses in a
+        single query, and keeps them for the rest of the request, so that
+        certificate_for_student doesn't query them one course at a time.
+        """
+        certificates = {
+            certificate.course_id: certificate
+            for certificate in cls.objects.filter(user=student, course_id__in=course_ids)
+        }
+        prefetched_certificates = cls._prefetched_certificates()
+        for course_id in course_ids:
+            prefetched_certificates[(student.id, course_id)] = certificates.get(course_id)
+
+    @classmethod
+    def prefetch_certificates_for_course(cls, course_id, students):
+        """
+        Loads the certificates of the given students for a course in a
+        single query, and keeps them for the rest of the request, so that
+        certificate_for_student doesn't query them one student at a time.
+        """
+        user_ids = [student.id for student in students]
+        certificates = {
+            certificate.user_id: certificate
+            for certificate in cls.objects.filter(user_id__in=user_ids, course_id=course_id)
+        }
+        prefetched_certificates = cls._prefetched_certificates()
+        for user_id in user_ids:
+            prefetched_certificates[(user_id, course_id)] = certificates.get(user_id)
+
+    @classmethod
+    def _prefetched_certificates(cls):
+        """
+        Returns the request cache of the prefetched certificates, keyed by
+        (user id, course id); None where the user has no certificate.
+        """
+        return request_cache.get_cache('GeneratedCertificate.prefetched_certificates')
+
     @classmethod
     def get_unique_statuses(cls, course_key=None, flat=False):
         """
@@ -469,6 +514,16 @@ def handle_course_cert_awarded(sender, user, course_key, **kwargs):  # pylint: d
         fulfill_course_milestone(course_key, user)
 
 
+@receiver([post_save, post_delete], sender=GeneratedCertificate)
+def _clear_prefetched_certificate(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the prefetched certificate of the user in the course when it changes.
+    """
+    GeneratedCertificate._prefetched_certificates().pop(  # pylint: disable=protected-access
+        (instance.user_id, instance.course_id), None
+    )
+
+
 def certificate_status_for_student(student, course_id):
     '''
     This returns a dictionary with a key for status, and other information.
@@ -504,9 +559,8 @@ def certificate_status_for_student(student, course_id):
     # the course_modes app is loaded, resulting in a Django deprecation warning.
     from course_modes.models import CourseMode
 
-    try:
-        generated_certificate = GeneratedCertificate.objects.get(  # pylint: disable=no-member
-            user=student, course_id=course_id)
+    generated_certificate = GeneratedCertificate.certificate_for_student(student, course_id)
+    if generated_certificate is not None:
         cert_status = {
             'status': generated_certificate.status,
             'mode': generated_certificate.mode,
@@ -528,8 +582,6 @@ def certificate_status_for_student(student, course_id):
 
         return cert_status
 
-    except GeneratedCertificate.DoesNotExist:
-        pass
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor, 'uuid': None}
 
 
@@ -184,7 +184,8 @@ class XQueueCertInterface(object):
         raise NotImplementedError
 
     # pylint: disable=too-many-statements
-    def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True):
+    def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True,
+                 course_grade=None):
         """
         Request a new certificate for a student.
 
@@ -195,6 +196,8 @@ class XQueueCertInterface(object):
                          the certificate request. If this is given, grading
                          will be skipped.
           generate_pdf - Boolean should a message be sent in queue to generate certificate PDF
+          course_grade - the student's CourseGrade, if it has already been
+                         computed. Otherwise, the student is graded here.
 
         Will change the certificate status to 'generating' or
         `downloadable` in case of web view certificates.
@@ -271,7 +274,9 @@ class XQueueCertInterface(object):
         self.request.session = {}
 
         is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
-        grade = CourseGradeFactory().create(student, course).summary
+        if course_grade is None:
+            course_grade = CourseGradeFactory().create(student, course)
+        grade = course_grade.summary
         enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
         mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
         user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
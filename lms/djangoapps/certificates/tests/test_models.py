@@ -19,6 +19,7 @@ from certificates.models import (
     GeneratedCertificate,
     CertificateStatuses,
     CertificateGenerationHistory,
+    certificate_status_for_student,
 )
 from certificates.tests.factories import (
     CertificateInvalidationFactory,
@@ -26,6 +27,7 @@ from certificates.tests.factories import (
 )
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from opaque_keys.edx.locator import CourseLocator
+from request_cache.middleware import RequestCache
 from student.tests.factories import AdminFactory, UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -240,6 +242,50 @@ class EligibleCertificateManagerTest(SharedModuleStoreTestCase):
         )
 
 
+@attr(shard=1)
+class PrefetchedCertificatesTest(TestCase):
+    """
+    Test prefetching a student's certificates for a set of courses.
+    """
+    def setUp(self):
+        super(PrefetchedCertificatesTest, self).setUp()
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.user = UserFactory()
+        self.course_ids = [CourseLocator('org', 'course{}'.format(index), 'run') for index in range(3)]
+        self.certificate = GeneratedCertificateFactory.create(
+            status=CertificateStatuses.downloadable,
+            user=self.user,
+            course_id=self.course_ids[0],
+        )
+
+    def test_prefetch(self):
+        with self.assertNumQueries(1):
+            GeneratedCertificate.prefetch_certificates_for_student(self.user, self.course_ids)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                GeneratedCertificate.certificate_for_student(self.user, self.course_ids[0]), self.certificate
+            )
+            self.assertIsNone(GeneratedCertificate.certificate_for_student(self.user, self.course_ids[1]))
+            self.assertEqual(
+                certificate_status_for_student(self.user, self.course_ids[1])['status'],
+                CertificateStatuses.unavailable
+            )
+
+    def test_prefetch_invalidated(self):
+        GeneratedCertificate.prefetch_certificates_for_student(self.user, self.course_ids)
+        certificate = GeneratedCertificateFactory.create(
+            status=CertificateStatuses.downloadable,
+            user=self.user,
+            course_id=self.course_ids[1],
+        )
+        self.assertEqual(GeneratedCertificate.certificate_for_student(self.user, self.course_ids[1]), certificate)
+
+        GeneratedCertificate.prefetch_certificates_for_student(self.user, self.course_ids)
+        self.certificate.delete()
+        self.assertIsNone(GeneratedCertificate.certificate_for_student(self.user, self.course_ids[0]))
+
+
 @attr(shard=1)
 @ddt.ddt
 class TestCertificateGenerationHistory(TestCase):
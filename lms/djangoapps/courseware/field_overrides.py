@@ -28,6 +28,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+INHERITED_OVERRIDES_KEY = u'courseware.field_overrides.inherited_overrides'
 
 
 def resolve_dotted(name):
@@ -90,6 +91,15 @@ def overrides_disabled():
     return bool(_OVERRIDES_DISABLED.disabled)
 
 
+def clear_override_cache():
+    """
+    Clears the overrides of inheritable fields resolved during the current
+    request.  This must be called when an override is set or cleared, so that
+    the rest of the request sees the change.
+    """
+    RequestCache.get_request_cache().data.pop(INHERITED_OVERRIDES_KEY, None)
+
+
 class FieldOverrideProvider(object):
     """
     Abstract class which defines the interface that a `FieldOverrideProvider`
@@ -196,6 +206,7 @@ class OverrideFieldData(FieldData):
         return enabled_providers
 
     def __init__(self, user, fallback, providers):
+        self.user = user
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
 
@@ -232,11 +243,8 @@ class OverrideFieldData(FieldData):
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if self.get_inherited_override(block, name) is not NOTSET:
+                return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -246,15 +254,49 @@ class OverrideFieldData(FieldData):
     def default(self, block, name):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
-        if self.providers and not overrides_disabled():
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+        if self.providers:
+            value = self.get_inherited_override(block, name)
+            if value is not NOTSET:
+                return value
         return self.fallback.default(block, name)
 
+    def get_inherited_override(self, block, name):
+        """
+        Returns the override of the field identified by `name` which `block`
+        inherits from its closest ancestor with an override for it, or `NOTSET`
+        if the field isn't inheritable or none of the ancestors override it.
+
+        The overrides inherited from each ancestor are remembered for the rest
+        of the request, so the ancestors of a block are only checked for
+        overrides once for all of their descendants.
+        """
+        if overrides_disabled() or name not in InheritanceMixin.fields:
+            return NOTSET
+
+        # The overrides which the children of each block inherit, keyed by the
+        # location of the block and the name of the field.
+        inherited_overrides = RequestCache.get_request_cache().data.setdefault(
+            INHERITED_OVERRIDES_KEY, {}
+        ).setdefault(
+            (getattr(self.user, 'id', None), tuple(type(provider) for provider in self.providers)), {}
+        )
+
+        unresolved = []
+        value = NOTSET
+        for ancestor in _lineage(block):
+            key = (ancestor.location, name)
+            if key in inherited_overrides:
+                value = inherited_overrides[key]
+                break
+            unresolved.append(key)
+            value = self.get_override(ancestor, name)
+            if value is not NOTSET:
+                break
+
+        for key in unresolved:
+            inherited_overrides[key] = value
+        return value
+
 
 class OverrideModulestoreFieldData(OverrideFieldData):
     """Apply field data overrides at the modulestore level. No student context required."""
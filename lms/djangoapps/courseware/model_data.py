@@ -15,6 +15,7 @@ pieces of information for each scope, and thus how to cache, prefetch, and creat
 entries.
 
 UserStateCache: A cache for Scope.user_state
+MultiUserFieldDataCache: A prefetch cache of Scope.user_state for many users at once
 UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
@@ -87,6 +88,30 @@ def _all_block_types(descriptors, aside_types):
     return block_types
 
 
+def _get_child_descriptors(descriptor, depth, descriptor_filter):
+    """
+    Return a list of all child descriptors down to the specified depth
+    that match the descriptor filter. Includes `descriptor`
+
+    descriptor: The parent to search inside
+    depth: The number of levels to descend, or None for infinite depth
+    descriptor_filter(descriptor): A function that returns True
+        if descriptor should be included in the results
+    """
+    if descriptor_filter(descriptor):
+        descriptors = [descriptor]
+    else:
+        descriptors = []
+
+    if depth is None or depth > 0:
+        new_depth = depth - 1 if depth is not None else depth
+
+        for child in descriptor.get_children() + descriptor.get_required_module_descriptors():
+            descriptors.extend(_get_child_descriptors(child, new_depth, descriptor_filter))
+
+    return descriptors
+
+
 class DjangoKeyValueStore(KeyValueStore):
     """
     This KeyValueStore will read and write data in the following scopes to django models
@@ -350,11 +375,23 @@ class UserStateCache(object):
     """
     Cache for Scope.user_state xblock field data.
     """
-    def __init__(self, user, course_id):
+    def __init__(self, user, course_id, prefetched_states=None):
+        """
+        Arguments:
+            user (User): The user whose state is cached.
+            course_id (CourseKey): The course whose state is cached.
+            prefetched_states (dict): An optional map of the usage keys
+                whose state was already loaded for the user (such as by
+                a :class:`~MultiUserFieldDataCache`) to their field state,
+                or to None if the user has no state for the block.  The
+                state of these blocks is cached from this map rather than
+                read from the database.
+        """
         self._cache = defaultdict(dict)
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
+        self._prefetched_states = prefetched_states
 
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
@@ -366,9 +403,19 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
+        usage_keys = _all_usage_keys(xblocks, aside_types)
+        if self._prefetched_states is not None:
+            for usage_key in usage_keys.intersection(self._prefetched_states):
+                field_state = self._prefetched_states[usage_key]
+                if field_state is not None:
+                    self._cache[usage_key] = dict(field_state)
+            usage_keys.difference_update(self._prefetched_states)
+            if not usage_keys:
+                return
+
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            usage_keys,
         )
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
@@ -687,7 +734,8 @@ class FieldDataCache(object):
     A cache of django model objects needed to supply the data
     for a module and its descendants
     """
-    def __init__(self, descriptors, course_id, user, select_for_update=False, asides=None):
+    def __init__(self, descriptors, course_id, user, select_for_update=False, asides=None,
+                 prefetched_user_states=None):
         """
         Find any courseware.models objects that are needed by any descriptor
         in descriptors. Attempts to minimize the number of queries to the database.
@@ -700,6 +748,8 @@ class FieldDataCache(object):
         user: The user for which to cache data
         select_for_update: Ignored
         asides: The list of aside types to load, or None to prefetch no asides.
+        prefetched_user_states: An optional map of usage keys to the user's
+            already loaded Scope.user_state data, as accepted by UserStateCache.
         """
         if asides is None:
             self.asides = []
@@ -714,6 +764,7 @@ class FieldDataCache(object):
             Scope.user_state: UserStateCache(
                 self.user,
                 self.course_id,
+                prefetched_user_states,
             ),
             Scope.user_info: UserInfoCache(
                 self.user,
@@ -752,31 +803,8 @@ class FieldDataCache(object):
                 should be cached
         """
 
-        def get_child_descriptors(descriptor, depth, descriptor_filter):
-            """
-            Return a list of all child descriptors down to the specified depth
-            that match the descriptor filter. Includes `descriptor`
-
-            descriptor: The parent to search inside
-            depth: The number of levels to descend, or None for infinite depth
-            descriptor_filter(descriptor): A function that returns True
-                if descriptor should be included in the results
-            """
-            if descriptor_filter(descriptor):
-                descriptors = [descriptor]
-            else:
-                descriptors = []
-
-            if depth is None or depth > 0:
-                new_depth = depth - 1 if depth is not None else depth
-
-                for child in descriptor.get_children() + descriptor.get_required_module_descriptors():
-                    descriptors.extend(get_child_descriptors(child, new_depth, descriptor_filter))
-
-            return descriptors
-
         with modulestore().bulk_operations(descriptor.location.course_key):
-            descriptors = get_child_descriptors(descriptor, depth, descriptor_filter)
+            descriptors = _get_child_descriptors(descriptor, depth, descriptor_filter)
 
         self.add_descriptors_to_cache(descriptors)
 
@@ -931,6 +959,95 @@ class FieldDataCache(object):
         return sum(len(cache) for cache in self.cache.values())
 
 
+class MultiUserFieldDataCache(object):
+    """
+    A prefetch cache of the Scope.user_state data of a set of users for
+    the same descriptors, as needed to load those descriptors for each of
+    the users in turn (for example, to rescore a problem for all students).
+
+    The state of all of the users is read at once, with a single query per
+    chunk of users, when the first user's FieldDataCache is requested, and
+    each user's FieldDataCache is then populated from the prefetched state
+    rather than with separate queries.
+    """
+    def __init__(self, descriptors, course_id, users, asides=None):
+        """
+        Arguments:
+            descriptors ([XModuleDescriptor]): The descriptors whose state
+                is prefetched.
+            course_id (CourseKey): The id of the current course.
+            users ([User]): The users whose state is prefetched.
+            asides ([str]): The list of aside types to load, or None to
+                prefetch no asides.
+        """
+        assert isinstance(course_id, CourseKey)
+        self.descriptors = descriptors
+        self.course_id = course_id
+        self.users = users
+        self.asides = [] if asides is None else asides
+
+        self._usage_keys = None
+        self._user_states = None
+
+    @classmethod
+    def cache_for_descriptors_descendents(cls, course_id, users, descriptors, depth=None,
+                                          descriptor_filter=lambda descriptor: True, asides=None):
+        """
+        Returns a MultiUserFieldDataCache for the given `users`, for all
+        descendants of each of the given `descriptors` (including the
+        descriptors themselves).
+
+        depth is the number of levels of descendant modules to load StudentModules for, in addition to
+            the supplied descriptors. If depth is None, load all descendant StudentModules
+        descriptor_filter is a function that accepts a descriptor and return whether the field data
+            should be cached
+        """
+        all_descriptors = []
+        for descriptor in descriptors:
+            with modulestore().bulk_operations(descriptor.location.course_key):
+                all_descriptors.extend(_get_child_descriptors(descriptor, depth, descriptor_filter))
+        return cls(all_descriptors, course_id, users, asides=asides)
+
+    def _prefetch_user_states(self):
+        """
+        Reads the Scope.user_state data of all of the users for all of the
+        descriptors.
+        """
+        self._usage_keys = _all_usage_keys(self.descriptors, self.asides)
+        self._user_states = {user.username: {} for user in self.users}
+        authenticated_users = [user for user in self.users if user.is_authenticated()]
+        if not authenticated_users or not self._usage_keys:
+            return
+
+        client = DjangoXBlockUserStateClient()
+        for user_state in client.get_many_for_users(authenticated_users, self._usage_keys):
+            self._user_states[user_state.username][user_state.block_key] = user_state.state
+
+    def field_data_cache_for_user(self, user):
+        """
+        Returns a FieldDataCache for the given user and the descriptors of
+        this cache, with the user's prefetched Scope.user_state data.  If
+        the user is not one of the users of this cache, a FieldDataCache
+        that reads the user's data itself is returned.
+        """
+        if self._user_states is None:
+            self._prefetch_user_states()
+
+        user_states = self._user_states.get(user.username)
+        prefetched_states = None
+        if user_states is not None:
+            prefetched_states = {
+                usage_key: user_states.get(usage_key) for usage_key in self._usage_keys
+            }
+        return FieldDataCache(
+            self.descriptors,
+            self.course_id,
+            user,
+            asides=self.asides,
+            prefetched_user_states=prefetched_states,
+        )
+
+
 class ScoresClient(object):
     """
     Basic client interface for retrieving Score information.
@@ -957,15 +1074,18 @@ class ScoresClient(object):
             course_id=self.course_key,
             module_state_key__in=set(locations),
         )
+        for location, correct, total in scores_qset.values_list('module_state_key', 'grade', 'max_grade'):
+            self._add_score(location, correct, total)
+        self._has_fetched = True
+
+    def _add_score(self, location, correct, total):
+        """Add the score information for the given serialized location."""
         # Locations in StudentModule don't necessarily have course key info
         # attached to them (since old mongo identifiers don't include runs).
         # So we have to add that info back in before we put it into our lookup.
-        self._locations_to_scores.update({
-            UsageKey.from_string(location).map_into_course(self.course_key): self.Score(correct, total)
-            for location, correct, total
-            in scores_qset.values_list('module_state_key', 'grade', 'max_grade')
-        })
-        self._has_fetched = True
+        self._locations_to_scores[UsageKey.from_string(location).map_into_course(self.course_key)] = self.Score(
+            correct, total
+        )
 
     def get(self, location):
         """
@@ -989,6 +1109,28 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def bulk_create_for_locations(cls, course_id, user_ids, scorable_locations):
+        """
+        Create ScoresClients for each of the given users with pre-fetched data
+        for the given locations, using a single query for all the users.
+
+        Returns a dict of user_id to ScoresClient.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=clients.keys(),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade'
+        ):
+            clients[user_id]._add_score(location, correct, total)  # pylint: disable=protected-access
+        for client in clients.itervalues():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
@@ -4,7 +4,9 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+import request_cache
+
+from .field_overrides import FieldOverrideProvider, clear_override_cache
 from .models import StudentFieldOverride
 
 
@@ -29,31 +31,52 @@ def get_override_for_user(user, block, name, default=None):
     specify the block and the name of the field.  If the field is not
     overridden for the given user, returns `default`.
     """
-    if not hasattr(block, '_student_overrides'):
-        block._student_overrides = {}  # pylint: disable=protected-access
-    overrides = block._student_overrides.get(user.id)  # pylint: disable=protected-access
-    if overrides is None:
-        overrides = _get_overrides_for_user(user, block)
-        block._student_overrides[user.id] = overrides  # pylint: disable=protected-access
-    return overrides.get(name, default)
+    overrides = _get_overrides_for_user(user, block.runtime.course_id)
+    block_overrides = overrides.get(_location_key(block.location), {})
+    if name in block_overrides:
+        return block.fields[name].from_json(block_overrides[name])
+    return default
 
 
-def _get_overrides_for_user(user, block):
+def _location_key(location):
     """
-    Gets all of the individual student overrides for given user and block.
-    Returns a dictionary of field override values keyed by field name.
+    Returns the key of the overrides of the block at `location`, which is the
+    location as it is stored in the database.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
-    overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
-    return overrides
+    return StudentFieldOverride._meta.get_field('location').get_prep_value(location)  # pylint: disable=protected-access
+
+
+def _get_overrides_for_user(user, course_id):
+    """
+    Gets all of the individual student overrides for given user in the given
+    course, with a single query per request.  Returns a dictionary mapping the
+    key of each overridden block (see `_location_key`) to a dictionary of its
+    field override values, serialized to json, keyed by field name.
+    """
+    overrides_cache = request_cache.get_cache('courseware.student_field_overrides')
+    cache_key = (user.id, course_id)
+
+    if cache_key not in overrides_cache:
+        overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            student_id=user.id,
+        )
+        for override in query:
+            block_overrides = overrides.setdefault(_location_key(override.location), {})
+            block_overrides[override.field] = json.loads(override.value)
+        overrides_cache[cache_key] = overrides
+
+    return overrides_cache[cache_key]
+
+
+def _clear_overrides_for_user(user, course_id):
+    """
+    Clears the overrides of the given user read during the current request,
+    after they have been changed.
+    """
+    request_cache.get_cache('courseware.student_field_overrides').pop((user.id, course_id), None)
+    clear_override_cache()
 
 
 def override_field_for_user(user, block, name, value):
@@ -70,6 +93,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_overrides_for_user(user, block.runtime.course_id)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +111,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_overrides_for_user(user, block.runtime.course_id)
@@ -7,11 +7,13 @@ from nose.plugins.attrib import attr
 
 from django.test.utils import override_settings
 from xblock.field_data import DictFieldData
+from request_cache.middleware import RequestCache
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 
 from ..field_overrides import (
     resolve_dotted,
+    clear_override_cache,
     disable_overrides,
     FieldOverrideProvider,
     OverrideFieldData,
@@ -142,6 +144,74 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+class StubBlock(object):
+    """
+    A block in a tree of blocks, with just enough of an XBlock to find its ancestors.
+    """
+    def __init__(self, location, parent=None):
+        self.location = location
+        self.parent = parent
+
+    def get_parent(self):
+        return self.parent
+
+
+class InheritedOverrideProvider(FieldOverrideProvider):
+    """
+    Overrides the due date of the blocks in `due_dates`, and records the
+    blocks it is asked for overrides of.
+    """
+    due_dates = {}
+    lookups = []
+
+    def get(self, block, name, default):
+        self.lookups.append(block.location)
+        if name == 'due':
+            return self.due_dates.get(block.location, default)
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
+@attr(shard=1)
+class InheritedOverridesTests(unittest.TestCase):
+    """
+    Tests for the overrides of inheritable fields in `OverrideFieldData`.
+    """
+    def setUp(self):
+        super(InheritedOverridesTests, self).setUp()
+        self.addCleanup(RequestCache.clear_request_cache)
+        InheritedOverrideProvider.due_dates = {'chapter': 'chapter due'}
+        InheritedOverrideProvider.lookups = []
+
+        course = StubBlock('course')
+        chapter = StubBlock('chapter', course)
+        sequential = StubBlock('sequential', chapter)
+        self.problems = [StubBlock('problem{}'.format(index), sequential) for index in range(2)]
+        self.data = OverrideFieldData(TESTUSER, DictFieldData({}), [InheritedOverrideProvider])
+
+    def test_inherited_override(self):
+        for problem in self.problems:
+            self.assertEqual(self.data.default(problem, 'due'), 'chapter due')
+            self.assertFalse(self.data.has(problem, 'due'))
+        with disable_overrides():
+            with self.assertRaises(KeyError):
+                self.data.default(self.problems[0], 'due')
+
+    def test_ancestors_checked_once(self):
+        for problem in self.problems:
+            self.data.default(problem, 'due')
+        self.assertEqual(InheritedOverrideProvider.lookups, ['sequential', 'chapter'])
+
+    def test_clear_override_cache(self):
+        self.assertEqual(self.data.default(self.problems[0], 'due'), 'chapter due')
+        InheritedOverrideProvider.due_dates = {'sequential': 'sequential due'}
+        clear_override_cache()
+        self.assertEqual(self.data.default(self.problems[0], 'due'), 'sequential due')
+
+
 @attr(shard=1)
 class ResolveDottedTests(unittest.TestCase):
     """
@@ -6,7 +6,7 @@ from mock import Mock, patch
 from nose.plugins.attrib import attr
 from functools import partial
 
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError, MultiUserFieldDataCache
 from courseware.models import StudentModule, XModuleUserStateSummaryField
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
@@ -283,6 +283,57 @@ class TestMissingStudentModule(TestCase):
             self.assertFalse(self.kvs.has(user_state_key('a_field')))
 
 
+@attr(shard=1)
+class TestMultiUserFieldDataCache(TestCase):
+    """Tests for user_state prefetched for several users at once"""
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestMultiUserFieldDataCache, self).setUp()
+        self.users = [
+            StudentModuleFactory(state=json.dumps({'a_field': 'value {}'.format(index)})).student
+            for index in range(3)
+        ]
+        self.users.append(UserFactory.create())
+        self.descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+        self.field_data_caches = MultiUserFieldDataCache([self.descriptor], course_id, self.users)
+
+    def kvs_key(self, user):
+        """Return the key of the user's `a_field` user_state field"""
+        return DjangoKeyValueStore.Key(Scope.user_state, user.id, location('usage_id'), 'a_field')
+
+    def test_prefetched_state(self):
+        # The state of all users is read with a single query
+        with self.assertNumQueries(1):
+            kvs_by_user = [
+                DjangoKeyValueStore(self.field_data_caches.field_data_cache_for_user(user)) for user in self.users
+            ]
+
+        with self.assertNumQueries(0):
+            for index, kvs in enumerate(kvs_by_user[:3]):
+                self.assertEquals('value {}'.format(index), kvs.get(self.kvs_key(self.users[index])))
+            self.assertFalse(kvs_by_user[3].has(self.kvs_key(self.users[3])))
+
+    def test_set_prefetched_field(self):
+        kvs = DjangoKeyValueStore(self.field_data_caches.field_data_cache_for_user(self.users[0]))
+        kvs.set(self.kvs_key(self.users[0]), 'new_value')
+
+        student_module = StudentModule.objects.get(student=self.users[0])
+        self.assertEquals({'a_field': 'new_value'}, json.loads(student_module.state))
+        other_kvs = DjangoKeyValueStore(self.field_data_caches.field_data_cache_for_user(self.users[1]))
+        self.assertEquals('value 1', other_kvs.get(self.kvs_key(self.users[1])))
+
+    def test_other_user(self):
+        other_user = StudentModuleFactory(state=json.dumps({'a_field': 'other value'})).student
+        self.field_data_caches.field_data_cache_for_user(self.users[0])
+
+        # The state of a user that was not prefetched is read separately
+        with self.assertNumQueries(1):
+            kvs = DjangoKeyValueStore(self.field_data_caches.field_data_cache_for_user(other_user))
+        self.assertEquals('other value', kvs.get(self.kvs_key(other_user)))
+
+
 @attr(shard=1)
 class StorageTestBase(object):
     """
@@ -9,7 +9,7 @@ from mock import patch
 from courseware.tests.factories import BetaTesterFactory
 from courseware.access import has_access
 from lms.djangoapps.ccx.tests.test_overrides import inject_field_overrides
-from lms.djangoapps.django_comment_client.utils import get_accessible_discussion_xblocks
+from lms.djangoapps.django_comment_client.utils import get_accessible_discussion_topics
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData, OverrideModulestoreFieldData
 from openedx.core.djangoapps.self_paced.models import SelfPacedConfiguration
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -61,7 +61,7 @@ class SelfPacedDateOverrideTest(ModuleStoreTestCase):
 
     def create_discussion_xblocks(self, parent):
         # Create a released discussion xblock
-        ItemFactory.create(
+        released = ItemFactory.create(
             parent=parent,
             category='discussion',
             display_name='released',
@@ -69,12 +69,13 @@ class SelfPacedDateOverrideTest(ModuleStoreTestCase):
         )
 
         # Create a scheduled discussion xblock
-        ItemFactory.create(
+        scheduled = ItemFactory.create(
             parent=parent,
             category='discussion',
             display_name='scheduled',
             start=self.future,
         )
+        return released, scheduled
 
     def test_instructor_paced_due_date(self):
         __, ip_section = self.setup_course(display_name="Instructor Paced Course", self_paced=False)
@@ -124,13 +125,11 @@ class SelfPacedDateOverrideTest(ModuleStoreTestCase):
         not visible to students in an instructor-paced course.
         """
         course, section = self.setup_course(start=self.now, self_paced=False)
-        self.create_discussion_xblocks(section)
+        released, __ = self.create_discussion_xblocks(section)
 
         # Only the released xblocks should be visible when the course is instructor-paced.
-        xblocks = get_accessible_discussion_xblocks(course, self.non_staff_user)
-        self.assertTrue(
-            all(xblock.display_name == 'released' for xblock in xblocks)
-        )
+        topics = get_accessible_discussion_topics(course, self.non_staff_user)
+        self.assertEqual([topic.discussion_id for topic in topics], [released.discussion_id])
 
     @patch.dict('courseware.access.settings.FEATURES', {'DISABLE_START_DATES': False})
     def test_self_paced_discussion_xblock_visibility(self):
@@ -139,11 +138,11 @@ class SelfPacedDateOverrideTest(ModuleStoreTestCase):
         in the future are visible to students in a self-paced course.
         """
         course, section = self.setup_course(start=self.now, self_paced=True)
-        self.create_discussion_xblocks(section)
+        released, scheduled = self.create_discussion_xblocks(section)
 
         # The scheduled xblocks should be visible when the course is self-paced.
-        xblocks = get_accessible_discussion_xblocks(course, self.non_staff_user)
-        self.assertEqual(len(xblocks), 2)
-        self.assertTrue(
-            any(xblock.display_name == 'scheduled' for xblock in xblocks)
+        topics = get_accessible_discussion_topics(course, self.non_staff_user)
+        self.assertItemsEqual(
+            [topic.discussion_id for topic in topics],
+            [released.discussion_id, scheduled.discussion_id],
         )
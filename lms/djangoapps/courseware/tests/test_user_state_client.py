@@ -7,6 +7,7 @@ from collections import defaultdict
 from unittest import skip
 
 from django.test import TestCase
+from opaque_keys.edx.locator import CourseLocator
 
 from edx_user_state_client.tests import UserStateClientTestBase
 from courseware.user_state_client import DjangoXBlockUserStateClient
@@ -34,6 +35,33 @@ class TestDjangoUserStateClient(UserStateClientTestBase, TestCase):
         self.client = DjangoXBlockUserStateClient()
         self.users = defaultdict(UserFactory.create)
 
+    def test_set_many_queries(self):
+        username = self._user(0)
+        block_keys = [
+            CourseLocator('org', 'course', 'run').make_usage_key('problem', 'problem{}'.format(index))
+            for index in range(4)
+        ]
+        self.client.set_many(username, {block_key: {'a_field': 'a_value'} for block_key in block_keys[:2]})
+
+        # The existing rows are read with a single query, and updated with a single
+        # UPDATE, and the new rows are created with a single INSERT, and read back.
+        with self.assertNumQueries(9, using='default'):
+            self.client.set_many(username, {block_key: {'b_field': 'b_value'} for block_key in block_keys})
+
+        states = {
+            user_state.block_key: user_state.state
+            for user_state in self.client.get_many(username, block_keys)
+        }
+        self.assertEqual(states, {
+            block_keys[0]: {'a_field': 'a_value', 'b_field': 'b_value'},
+            block_keys[1]: {'a_field': 'a_value', 'b_field': 'b_value'},
+            block_keys[2]: {'b_field': 'b_value'},
+            block_keys[3]: {'b_field': 'b_value'},
+        })
+        for block_key in block_keys:
+            history = list(self.client.get_history(username, block_key))
+            self.assertEqual(history[0].state, states[block_key])
+
     # We're skipping these tests because the iter_all_by_block and iter_all_by_course
     # are not implemented in the DjangoXBlockUserStateClient
     @skip("Not supported by DjangoXBlockUserStateClient")
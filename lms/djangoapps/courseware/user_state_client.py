@@ -16,9 +16,12 @@ import newrelic_custom_metrics
 import dogstats_wrapper as dog_stats_api
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Case, TextField, Value, When
+from django.db.models.signals import post_save
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from xblock.fields import Scope
-from courseware.models import StudentModule, BaseStudentModuleHistory
+from courseware.models import StudentModule, BaseStudentModuleHistory, chunks
 from edx_user_state_client.interface import XBlockUserStateClient, XBlockUserState
 
 log = logging.getLogger(__name__)
@@ -47,6 +50,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
     # Use this sample rate for DataDog events.
     API_DATADOG_SAMPLE_RATE = 0.1
 
+    # The maximum number of rows updated by a single UPDATE statement in set_many.
+    SET_MANY_UPDATE_BATCH_SIZE = 100
+
     class ServiceUnavailable(XBlockUserStateClient.ServiceUnavailable):
         """
         This error is raised if the service backing this client is currently unavailable.
@@ -183,20 +189,92 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported, not {}".format(scope))
 
+        modules = (
+            (username, student_module, usage_key)
+            for student_module, usage_key in self._get_student_modules(username, block_keys)
+        )
+        for user_state in self._get_user_states('get_many', modules, len(block_keys), scope, fields):
+            yield user_state
+
+    def get_many_for_users(self, users, block_keys, scope=Scope.user_state, fields=None):
+        """
+        Retrieve the stored XBlock state of each of the specified users for
+        the specified XBlock usages, reading the state of all of the users
+        with a single query per chunk of users.
+
+        Arguments:
+            users ([User]): The users whose state should be retrieved
+            block_keys ([UsageKey]): A list of UsageKeys identifying which xblock states to load.
+            scope (Scope): The scope to load data from
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+
+        Yields:
+            XBlockUserState tuples for each of the users and each specified
+            UsageKey in block_keys.  field_state is a dict mapping field
+            names to values.
+        """
+        if scope != Scope.user_state:
+            raise ValueError("Only Scope.user_state is supported, not {}".format(scope))
+
+        usernames = {user.id: user.username for user in users}
+        modules = (
+            (usernames[student_module.student_id], student_module, usage_key)
+            for student_module, usage_key in self._get_student_modules_for_users(usernames.keys(), block_keys)
+        )
+        for user_state in self._get_user_states('get_many_for_users', modules, len(block_keys), scope, fields):
+            yield user_state
+
+    def _get_student_modules_for_users(self, user_ids, block_keys):
+        """
+        Retrieve the :class:`~StudentModule`s for the supplied ``user_ids`` and ``block_keys``.
+
+        Arguments:
+            user_ids (list of int): The ids of the users to load `StudentModule`s for.
+            block_keys (list of :class:`~UsageKey`): The set of XBlocks to load data for.
+        """
+        course_key_func = attrgetter('course_key')
+        by_course = itertools.groupby(
+            sorted(block_keys, key=course_key_func),
+            course_key_func,
+        )
+
+        for course_key, usage_keys in by_course:
+            query = StudentModule.objects.chunked_filter(
+                'student_id__in',
+                user_ids,
+                module_state_key__in=list(usage_keys),
+                course_id=course_key,
+            )
+
+            for student_module in query:
+                usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+                yield (student_module, usage_key)
+
+    def _get_user_states(self, function_name, modules, num_blocks_requested, scope, fields):
+        """
+        Yields an XBlockUserState tuple for each of the supplied ``modules``
+        with a non-empty state, reporting metrics for ``function_name``.
+
+        Arguments:
+            function_name (str): The name of the public method the states are retrieved for.
+            modules: An iterable of (username, :class:`~StudentModule`, :class:`~UsageKey`) tuples.
+            num_blocks_requested (int): The number of blocks whose state was requested.
+            scope (Scope): The scope the data was loaded from
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+        """
         total_block_count = 0
         evt_time = time()
 
         # count how many times this function gets called
-        self._nr_stat_increment('get_many', 'calls')
+        self._nr_stat_increment(function_name, 'calls')
 
         # keep track of blocks requested
-        self._ddog_histogram(evt_time, 'get_many.blks_requested', len(block_keys))
-        self._nr_stat_accumulate('get_many', 'blocks_requested', len(block_keys))
+        self._ddog_histogram(evt_time, '{}.blks_requested'.format(function_name), num_blocks_requested)
+        self._nr_stat_accumulate(function_name, 'blocks_requested', num_blocks_requested)
 
-        modules = self._get_student_modules(username, block_keys)
-        for module, usage_key in modules:
+        for username, module, usage_key in modules:
             if module.state is None:
-                self._ddog_increment(evt_time, 'get_many.empty_state')
+                self._ddog_increment(evt_time, '{}.empty_state'.format(function_name))
                 continue
 
             state = json.loads(module.state)
@@ -204,7 +282,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
             # record this metric before the check for empty state, so that we
             # have some visibility into empty blocks.
-            self._ddog_histogram(evt_time, 'get_many.block_size', state_length)
+            self._ddog_histogram(evt_time, '{}.block_size'.format(function_name), state_length)
 
             # If the state is the empty dict, then it has been deleted, and so
             # conformant UserStateClients should treat it as if it doesn't exist.
@@ -212,8 +290,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 continue
 
             # collect statistics for metric reporting
-            self._nr_block_stat_increment('get_many', usage_key.block_type, 'blocks_out')
-            self._nr_block_stat_accumulate('get_many', usage_key.block_type, 'size', state_length)
+            self._nr_block_stat_increment(function_name, usage_key.block_type, 'blocks_out')
+            self._nr_block_stat_accumulate(function_name, usage_key.block_type, 'size', state_length)
             total_block_count += 1
 
             # filter state on fields
@@ -229,9 +307,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         finish_time = time()
         duration = (finish_time - evt_time) * 1000  # milliseconds
 
-        self._ddog_histogram(evt_time, 'get_many.blks_out', total_block_count)
-        self._ddog_histogram(evt_time, 'get_many.response_time', duration)
-        self._nr_stat_accumulate('get_many', 'duration', duration)
+        self._ddog_histogram(evt_time, '{}.blks_out'.format(function_name), total_block_count)
+        self._ddog_histogram(evt_time, '{}.response_time'.format(function_name), duration)
+        self._nr_stat_accumulate(function_name, 'duration', duration)
 
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
@@ -251,7 +329,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         # count how many times this function gets called
         self._nr_stat_increment('set_many', 'calls')
 
-        # We do a find_or_create for every block (rather than re-using field objects
+        # We read the rows of the blocks again (rather than re-using field objects
         # that were queried in get_many) so that if the score has
         # been changed by some other piece of the code, we don't overwrite
         # that score.
@@ -267,41 +345,64 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
-        for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
-            )
-
-            num_fields_before = num_fields_after = num_new_fields_set = len(state)
-            num_fields_updated = 0
-            if not created:
-                if student_module.state is None:
-                    current_state = {}
-                else:
-                    current_state = json.loads(student_module.state)
-                num_fields_before = len(current_state)
+        # Read all of the existing rows at once, rather than doing a get_or_create
+        # for every block, and merge the new state into them.
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules_for_users([user.id], block_keys_to_state.keys())
+        }
+        new_modules = {}
+        updated_modules = {}
+        num_fields_before = {}
+        for usage_key, state in block_keys_to_state.iteritems():
+            student_module = existing_modules.get(usage_key)
+            if student_module is None:
+                new_modules[usage_key] = StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    state=json.dumps(state),
+                    module_type=usage_key.block_type,
+                )
+                num_fields_before[usage_key] = len(state)
+            else:
+                current_state = {} if student_module.state is None else json.loads(student_module.state)
+                num_fields_before[usage_key] = len(current_state)
                 current_state.update(state)
-                num_fields_after = len(current_state)
                 student_module.state = json.dumps(current_state)
-                try:
-                    with transaction.atomic():
-                        # Updating the object - force_update guarantees no INSERT will occur.
-                        student_module.save(force_update=True)
-                except IntegrityError:
-                    # The UPDATE above failed. Log information - but ignore the error.
-                    # See https://openedx.atlassian.net/browse/TNL-5365
-                    log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
-                        user, repr(unicode(usage_key.course_key)), usage_key
-                    ))
-                    log.warning("set_many: All {} block keys: {}".format(
-                        len(block_keys_to_state), block_keys_to_state.keys()
-                    ))
+                updated_modules[usage_key] = student_module
+
+        for usage_keys in chunks(updated_modules.keys(), self.SET_MANY_UPDATE_BATCH_SIZE):
+            try:
+                with transaction.atomic():
+                    self._update_student_modules([updated_modules[usage_key] for usage_key in usage_keys])
+            except IntegrityError:
+                # The UPDATE above failed. Log information - but ignore the error.
+                # See https://openedx.atlassian.net/browse/TNL-5365
+                for usage_key in usage_keys:
+                    self._log_set_many_integrity_error(user, usage_key, block_keys_to_state)
+
+        if new_modules:
+            try:
+                with transaction.atomic():
+                    new_modules = self._create_student_modules(user, new_modules)
+            except IntegrityError:
+                # Some of the rows were created by another request since we read
+                # them, so fall back to setting the state of each block in turn.
+                for usage_key in new_modules.keys():
+                    student_module, created, num_fields_before[usage_key] = self._set_block_state(
+                        user, usage_key, block_keys_to_state[usage_key], block_keys_to_state
+                    )
+                    if created:
+                        new_modules[usage_key] = student_module
+                    else:
+                        del new_modules[usage_key]
+                        updated_modules[usage_key] = student_module
+
+        for usage_key, state in block_keys_to_state.iteritems():
+            created = usage_key in new_modules
+            student_module = new_modules[usage_key] if created else updated_modules[usage_key]
+            num_fields_after = len(state) if created else len(json.loads(student_module.state))
 
             # DataDog and New Relic reporting
 
@@ -320,7 +421,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             self._ddog_histogram(evt_time, 'set_many.fields_in', len(state))
 
             # Event to record number of new fields set in set/set_many.
-            num_new_fields_set = num_fields_after - num_fields_before
+            num_new_fields_set = num_fields_after - num_fields_before[usage_key]
             self._ddog_histogram(evt_time, 'set_many.fields_set', num_new_fields_set)
 
             # Event to record number of existing fields updated in set/set_many.
@@ -334,6 +435,116 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'set_many.response_time', duration)
         self._nr_stat_accumulate('set_many', 'duration', duration)
 
+    def _create_student_modules(self, user, student_modules):
+        """
+        Insert the new rows of the given :class:`~StudentModule`s, and return
+        them as saved.
+
+        Arguments:
+            user (:class:`~User`): The user the modules belong to.
+            student_modules (dict): A dict mapping UsageKeys to unsaved :class:`~StudentModule`s.
+
+        Raises:
+            IntegrityError if any of the rows already exists.
+        """
+        if len(student_modules) == 1:
+            for student_module in student_modules.itervalues():
+                student_module.save(force_insert=True)
+            return student_modules
+
+        StudentModule.objects.bulk_create(student_modules.values())
+
+        # bulk_create doesn't set the ids of the new rows on all databases, and
+        # doesn't send post_save, which records the history of the modules, so
+        # read the rows back and send it ourselves.
+        saved_modules = dict(student_modules)
+        for student_module, usage_key in self._get_student_modules_for_users([user.id], student_modules.keys()):
+            saved_modules[usage_key] = student_module
+            post_save.send(
+                sender=StudentModule,
+                instance=student_module,
+                created=True,
+                update_fields=None,
+                raw=False,
+                using=student_module._state.db,  # pylint: disable=protected-access
+            )
+        return saved_modules
+
+    def _update_student_modules(self, student_modules):
+        """
+        Update the state of the given :class:`~StudentModule`s with a single
+        UPDATE statement.
+
+        Only the state and modification time of the rows are updated, so that
+        the grades of the modules set by other code since they were read are kept.
+        """
+        modified = timezone.now()
+        StudentModule.objects.filter(id__in=[student_module.id for student_module in student_modules]).update(
+            state=Case(
+                *[When(id=student_module.id, then=Value(student_module.state)) for student_module in student_modules],
+                output_field=TextField()
+            ),
+            modified=modified,
+        )
+        for student_module in student_modules:
+            student_module.modified = modified
+            post_save.send(
+                sender=StudentModule,
+                instance=student_module,
+                created=False,
+                update_fields=['state', 'modified'],
+                raw=False,
+                using=student_module._state.db,  # pylint: disable=protected-access
+            )
+
+    def _set_block_state(self, user, usage_key, state, block_keys_to_state):
+        """
+        Overlay the given state over the stored state of a single block, creating
+        its row if it doesn't exist.
+
+        Returns a tuple of the :class:`~StudentModule`, whether it was created, and
+        the number of fields stored before the state was set.
+        """
+        student_module, created = StudentModule.objects.get_or_create(
+            student=user,
+            course_id=usage_key.course_key,
+            module_state_key=usage_key,
+            defaults={
+                'state': json.dumps(state),
+                'module_type': usage_key.block_type,
+            },
+        )
+
+        num_fields_before = len(state)
+        if not created:
+            if student_module.state is None:
+                current_state = {}
+            else:
+                current_state = json.loads(student_module.state)
+            num_fields_before = len(current_state)
+            current_state.update(state)
+            student_module.state = json.dumps(current_state)
+            try:
+                with transaction.atomic():
+                    # Updating the object - force_update guarantees no INSERT will occur.
+                    student_module.save(force_update=True)
+            except IntegrityError:
+                # The UPDATE above failed. Log information - but ignore the error.
+                # See https://openedx.atlassian.net/browse/TNL-5365
+                self._log_set_many_integrity_error(user, usage_key, block_keys_to_state)
+        return student_module, created, num_fields_before
+
+    def _log_set_many_integrity_error(self, user, usage_key, block_keys_to_state):
+        """
+        Log the failure to update the state of a block in set_many.
+        """
+        log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
+            user, repr(unicode(usage_key.course_key)), usage_key
+        ))
+        log.warning("set_many: All {} block keys: {}".format(
+            len(block_keys_to_state), block_keys_to_state.keys()
+        ))
+
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Delete the stored XBlock state for a many xblock usages.
@@ -19,6 +19,7 @@ from opaque_keys.edx.locator import CourseKey
 from courseware.courses import get_course_with_access
 
 from discussion_api.exceptions import ThreadNotFoundError, CommentNotFoundError, DiscussionDisabledError
+from discussion_api.executor import RequestExecutor
 from discussion_api.forms import CommentActionsForm, ThreadActionsForm
 from discussion_api.permissions import (
     can_delete,
@@ -42,10 +43,11 @@ from django_comment_common.signals import (
     comment_voted,
     comment_deleted,
 )
-from django_comment_client.utils import get_accessible_discussion_xblocks, is_commentable_cohorted
+from django_comment_client.utils import get_accessible_discussion_topics, is_commentable_cohorted
 from lms.djangoapps.discussion_api.pagination import DiscussionAPIPagination
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
+from lms.lib.comment_client.user import User as CommentClientUser
 from lms.lib.comment_client.utils import CommentClientRequestError
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id
 from openedx.core.lib.exceptions import CourseNotFoundError, PageNotFoundError, DiscussionNotFoundError
@@ -86,6 +88,16 @@ def _get_course(course_key, user):
     return course
 
 
+def _start_cc_requester_retrieval(request):
+    """
+    Start retrieving the requesting user from the comments service in the
+    background, returning the PendingCall for it, so that the retrieval
+    overlaps with the course and database lookups which build the context.
+    """
+    cc_requester = CommentClientUser.from_django_user(request.user)
+    return RequestExecutor.for_request(request).submit(cc_requester.retrieve)
+
+
 def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
     """
     Retrieve the given thread and build a serializer context for it, returning
@@ -101,9 +113,10 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
         if "mark_as_read" not in retrieve_kwargs:
             retrieve_kwargs["mark_as_read"] = False
         cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
+        cc_requester = _start_cc_requester_retrieval(request)
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        context = get_context(course, request, cc_thread, cc_requester)
         if (
                 not context["is_requester_privileged"] and
                 cc_thread["group_id"] and
@@ -228,7 +241,7 @@ def get_courseware_topics(request, course_key, course, topic_ids):
         """Returns key sorted xblocks by category"""
         return sorted(xblocks_by_category[category], key=get_xblock_sort_key)
 
-    discussion_xblocks = get_accessible_discussion_xblocks(course, request.user)
+    discussion_xblocks = get_accessible_discussion_topics(course, request.user)
     xblocks_by_category = defaultdict(list)
     for xblock in discussion_xblocks:
         xblocks_by_category[xblock.discussion_category].append(xblock)
@@ -534,8 +547,9 @@ def get_thread_list(
             "order_direction": ["Invalid value. '{}' must be 'desc'".format(order_direction)]
         })
 
+    cc_requester = _start_cc_requester_retrieval(request)
     course = _get_course(course_key, request.user)
-    context = get_context(course, request)
+    context = get_context(course, request, cc_requester=cc_requester)
 
     query_params = {
         "user_id": unicode(request.user.id),
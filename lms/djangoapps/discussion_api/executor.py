@@ -0,0 +1,105 @@
+"""
+Concurrent execution of the independent calls made to serve a discussion API
+request.
+"""
+import sys
+import threading
+
+import six
+from django.conf import settings
+from django.db import connections
+from django.utils import translation
+
+
+class PendingCall(object):
+    """
+    The result of a call submitted to a RequestExecutor.
+    """
+    def __init__(self):
+        self._done = threading.Event()
+        self._value = None
+        self._exc_info = None
+
+    def run(self, func, args, kwargs):
+        """
+        Call func with the given arguments, and record its result.
+        """
+        try:
+            self._value = func(*args, **kwargs)
+        except Exception:  # pylint: disable=broad-except
+            self._exc_info = sys.exc_info()
+        finally:
+            self._done.set()
+
+    def result(self):
+        """
+        Wait for the call to complete, and return its return value, or raise
+        the exception it raised.
+        """
+        self._done.wait()
+        if self._exc_info:
+            six.reraise(*self._exc_info)
+        return self._value
+
+
+class RequestExecutor(object):
+    """
+    Runs independent calls made to serve a discussion API request, such as
+    requests to the comments service, in background threads, so that their
+    latencies overlap rather than add up.
+
+    At most max_workers of the submitted calls run at once.  If max_workers is
+    1 or less, calls are made in the calling thread as they are submitted.
+
+    Calls made in background threads use their own database connections, so
+    they must not depend on the calling thread's open transaction.
+    """
+    def __init__(self, max_workers=None):
+        if max_workers is None:
+            max_workers = settings.DISCUSSION_API_MAX_CONCURRENT_REQUESTS
+        self.max_workers = max_workers
+        self._semaphore = threading.BoundedSemaphore(max(max_workers, 1))
+
+    @classmethod
+    def for_request(cls, request):
+        """
+        Return the RequestExecutor shared by the calls made to serve the
+        given request, so that they share its max_workers.
+        """
+        executor = getattr(request, '_discussion_api_executor', None)
+        if executor is None:
+            executor = cls()
+            request._discussion_api_executor = executor  # pylint: disable=protected-access
+        return executor
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Schedule func(*args, **kwargs) to be called, and return the
+        PendingCall for its result.
+        """
+        pending_call = PendingCall()
+        if self.max_workers <= 1:
+            pending_call.run(func, args, kwargs)
+        else:
+            thread = threading.Thread(
+                target=self._run,
+                args=(pending_call, translation.get_language(), func, args, kwargs),
+                name='RequestExecutor',
+            )
+            thread.daemon = True
+            thread.start()
+        return pending_call
+
+    def _run(self, pending_call, language, func, args, kwargs):
+        """
+        Make the call in a background thread, in the submitting thread's language.
+        """
+        with self._semaphore:
+            if language:
+                translation.activate(language)
+            try:
+                pending_call.run(func, args, kwargs)
+            finally:
+                translation.deactivate()
+                for connection in connections.all():
+                    connection.close()
@@ -0,0 +1,73 @@
+"""
+Tests for the Discussion API's RequestExecutor
+"""
+import threading
+from unittest import TestCase
+
+from django.test import RequestFactory
+from django.utils import translation
+
+from discussion_api.executor import RequestExecutor
+
+
+class RequestExecutorTest(TestCase):
+    """Tests for RequestExecutor"""
+    def test_concurrent(self):
+        executor = RequestExecutor(max_workers=2)
+        first_started = threading.Event()
+        second_started = threading.Event()
+
+        def call(started, other_started):
+            """Return whether the other call started while this one was running."""
+            started.set()
+            return other_started.wait(5)
+
+        first = executor.submit(call, first_started, second_started)
+        second = executor.submit(call, second_started, first_started)
+        self.assertTrue(first.result())
+        self.assertTrue(second.result())
+
+    def test_max_workers(self):
+        executor = RequestExecutor(max_workers=2)
+        lock = threading.Lock()
+        release = threading.Event()
+        running = []
+        max_running = []
+
+        def call():
+            """Record the number of calls running at once, until released."""
+            with lock:
+                running.append(None)
+                max_running.append(len(running))
+            release.wait(5)
+            with lock:
+                running.pop()
+
+        pending_calls = [executor.submit(call) for __ in range(5)]
+        release.set()
+        for pending_call in pending_calls:
+            pending_call.result()
+        self.assertLessEqual(max(max_running), 2)
+
+    def test_inline(self):
+        executor = RequestExecutor(max_workers=1)
+        pending_call = executor.submit(threading.current_thread)
+        self.assertIs(pending_call.result(), threading.current_thread())
+
+    def test_exception(self):
+        executor = RequestExecutor(max_workers=2)
+        pending_call = executor.submit(int, 'not a number')
+        with self.assertRaises(ValueError):
+            pending_call.result()
+
+    def test_language(self):
+        executor = RequestExecutor(max_workers=2)
+        with translation.override('eo'):
+            pending_call = executor.submit(translation.get_language)
+        self.assertEqual(pending_call.result(), 'eo')
+
+    def test_for_request(self):
+        request = RequestFactory().get("/test")
+        executor = RequestExecutor.for_request(request)
+        self.assertIs(RequestExecutor.for_request(request), executor)
+        self.assertIsNot(RequestExecutor.for_request(RequestFactory().get("/test")), executor)
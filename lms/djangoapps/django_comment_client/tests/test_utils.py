@@ -2,6 +2,7 @@
 import datetime
 import json
 import ddt
+import httpretty
 import mock
 from mock import patch, Mock
 from nose.plugins.attrib import attr
@@ -16,7 +17,10 @@ from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 import django_comment_client.utils as utils
-from lms.lib.comment_client.utils import perform_request, CommentClientMaintenanceError
+from lms.lib.comment_client import settings as cc_settings
+from lms.lib.comment_client.utils import (
+    perform_request, get_session, CommentClientMaintenanceError, CommentsServiceSession
+)
 from django_comment_common.models import ForumsConfig
 
 from courseware.tests.factories import InstructorFactory
@@ -29,7 +33,7 @@ from openedx.core.djangoapps.content.course_structures.models import CourseStruc
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
 from student.roles import CourseStaffRole
 from xmodule.modulestore import ModuleStoreEnum
-from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, ToyCourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, ToyCourseFactory, check_mongo_calls
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, TEST_DATA_MIXED_MODULESTORE
 from xmodule.modulestore.django import modulestore
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
@@ -178,11 +182,10 @@ class CoursewareContextTestCase(ModuleStoreTestCase):
         assertThreadCorrect(threads[0], self.discussion1, "Chapter / Discussion 1")
         assertThreadCorrect(threads[1], self.discussion2, "Subsection / Discussion 2")
 
-    @ddt.data((ModuleStoreEnum.Type.mongo, 2), (ModuleStoreEnum.Type.split, 1))
-    @ddt.unpack
-    def test_get_accessible_discussion_xblocks(self, modulestore_type, expected_discussion_xblocks):
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_get_accessible_discussion_topics_without_orphans(self, modulestore_type):
         """
-        Tests that the accessible discussion xblocks having no parents do not get fetched for split modulestore.
+        Tests that the topics of discussion xblocks having no parents are not listed.
         """
         course = CourseFactory.create(default_store=modulestore_type)
 
@@ -193,7 +196,7 @@ class CoursewareContextTestCase(ModuleStoreTestCase):
         self.assertNotIn(test_discussion.location, self.store.get_orphans(course.id))
 
         # Assert that there is only one discussion xblock in the course at the moment.
-        self.assertEqual(len(utils.get_accessible_discussion_xblocks(course, self.user)), 1)
+        self.assertEqual(len(utils.get_accessible_discussion_topics(course, self.user)), 1)
 
         # Add an orphan discussion xblock to that course
         orphan = course.id.make_usage_key('discussion', 'orphan_discussion')
@@ -202,7 +205,32 @@ class CoursewareContextTestCase(ModuleStoreTestCase):
         # Assert that the discussion xblock is an orphan.
         self.assertIn(orphan, self.store.get_orphans(course.id))
 
-        self.assertEqual(len(utils.get_accessible_discussion_xblocks(course, self.user)), expected_discussion_xblocks)
+        self.assertEqual(len(utils.get_accessible_discussion_topics(course, self.user)), 1)
+
+    def test_get_accessible_discussion_topics(self):
+        """
+        Tests that the discussion topics are read from the course's block structure.
+        """
+        expected_topics = [
+            (xblock.location, xblock.discussion_id, xblock.discussion_category, xblock.discussion_target)
+            for xblock in (self.discussion1, self.discussion2)
+        ]
+
+        def assert_topics(topics):
+            """Asserts that the topics are those of the course's discussion xblocks."""
+            self.assertItemsEqual(
+                [
+                    (topic.location, topic.discussion_id, topic.discussion_category, topic.discussion_target)
+                    for topic in topics
+                ],
+                expected_topics
+            )
+
+        assert_topics(utils.get_accessible_discussion_topics(self.course, self.user))
+        # The collected block structure is cached, so the modulestore is not accessed again.
+        with check_mongo_calls(0):
+            assert_topics(utils.get_accessible_discussion_topics(self.course, self.user))
+            assert_topics(utils.get_accessible_discussion_topics(self.course, None, include_all=True))
 
 
 @attr(shard=3)
@@ -290,6 +318,11 @@ class CachedDiscussionIdMapTestCase(ModuleStoreTestCase):
         CourseStructure.objects.all().delete()
         self.verify_discussion_metadata()
 
+    def test_get_discussion_id_map_without_loading_xblocks(self):
+        with patch('django_comment_client.utils.modulestore') as mock_modulestore:
+            self.verify_discussion_metadata()
+        self.assertFalse(mock_modulestore.called)
+
     def test_get_missing_discussion_id_map_from_cache(self):
         metadata = utils.get_cached_discussion_id_map(self.course, ['bogus_id'], self.user)
         self.assertEqual(metadata, {})
@@ -1198,6 +1231,26 @@ class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase
             requesting_user=self.non_cohorted_user
         )
 
+    def test_accessible_discussion_topics(self):
+        """
+        Verify that the accessible discussion topics are those of the
+        discussion xblocks visible to the user's content group, or all of
+        them when include_all is True.
+        """
+        def assert_discussion_ids(user, expected_discussion_ids, include_all=False):
+            """Asserts the discussion ids of the topics accessible to the given user."""
+            topics = utils.get_accessible_discussion_topics(self.course, user, include_all=include_all)
+            self.assertItemsEqual([topic.discussion_id for topic in topics], expected_discussion_ids)
+
+        assert_discussion_ids(self.alpha_user, ['alpha_group_discussion', 'global_group_discussion'])
+        assert_discussion_ids(self.beta_user, ['beta_group_discussion', 'global_group_discussion'])
+        assert_discussion_ids(self.non_cohorted_user, ['global_group_discussion'])
+        assert_discussion_ids(
+            self.non_cohorted_user,
+            ['alpha_group_discussion', 'beta_group_discussion', 'global_group_discussion'],
+            include_all=True,
+        )
+
 
 class JsonResponseTestCase(TestCase, UnicodeTestMixin):
     def _test_unicode_data(self, text):
@@ -1441,7 +1494,7 @@ class ClientConfigurationTestCase(TestCase):
         with self.assertRaises(CommentClientMaintenanceError):
             perform_request('GET', 'http://www.google.com')
 
-    @patch('requests.request')
+    @patch('lms.lib.comment_client.utils.CommentsServiceSession.request')
     def test_enabled(self, mock_request):
         """Ensures that requests proceed normally when forums are enabled."""
         config = ForumsConfig.current()
@@ -1456,3 +1509,44 @@ class ClientConfigurationTestCase(TestCase):
 
         result = perform_request('GET', 'http://www.google.com')
         self.assertEqual(result, {})
+
+    @patch('lms.lib.comment_client.utils.CommentsServiceSession.request')
+    def test_session_reused(self, mock_request):
+        """Ensures that the requests made by a process share a pooled session."""
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: {}
+        mock_request.return_value = response
+
+        perform_request('GET', 'http://www.google.com')
+        perform_request('GET', 'http://www.google.com')
+        self.assertEqual(mock_request.call_count, 2)
+
+        session = get_session()
+        self.assertIs(get_session(), session)
+        adapter = session.get_adapter('http://www.google.com')
+        self.assertEqual(adapter._pool_maxsize, cc_settings.POOL_SIZE)  # pylint: disable=protected-access
+        self.assertEqual(adapter.max_retries.total, cc_settings.MAX_RETRIES)
+
+        with patch('lms.lib.comment_client.utils.os.getpid', return_value=-1):
+            self.assertIsNot(get_session(), session)
+
+    @httpretty.activate
+    def test_session_keeps_no_cookies(self):
+        """Ensures that the cookies set by the comment service are not sent with later requests."""
+        httpretty.register_uri(
+            httpretty.GET,
+            'http://www.example.com/api/v1/threads',
+            body='{}',
+            content_type='application/json',
+            adding_headers={'Set-Cookie': 'session_id=abc; Path=/'},
+        )
+        session = CommentsServiceSession()
+        for __ in range(2):
+            session.get('http://www.example.com/api/v1/threads')
+        self.assertEqual(len(session.cookies), 0)
+        self.assertNotIn('Cookie', httpretty.last_request().headers)
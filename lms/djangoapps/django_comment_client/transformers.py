@@ -0,0 +1,86 @@
+"""
+Discussion Topics Transformer
+"""
+from collections import namedtuple
+
+from openedx.core.lib.block_structure.transformer import BlockStructureTransformer
+
+
+# The fields of a discussion xblock that its discussion topic is made of.
+DiscussionTopicEntry = namedtuple(
+    'DiscussionTopicEntry',
+    ['location', 'discussion_id', 'discussion_category', 'discussion_target', 'sort_key', 'start'],
+)
+
+
+class DiscussionTopicsTransformer(BlockStructureTransformer):
+    """
+    The DiscussionTopicsTransformer collects the discussion topic of each
+    discussion xblock in the course, so that the topics accessible to a user
+    can be listed from the block structure without loading the xblocks.
+
+    No runtime transformations are performed; the blocks the user can't
+    access are removed by the course block access transformers.
+
+    The following value is stored as a transformer_block_field on each
+    discussion block which has all the fields required for its topic:
+
+        topic: (DiscussionTopicEntry) the fields of the discussion topic
+    """
+    VERSION = 1
+    TOPIC = 'topic'
+
+    # The fields a discussion xblock must have to be listed as a topic.
+    REQUIRED_FIELDS = ('discussion_id', 'discussion_category', 'discussion_target')
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return u'discussion_topics'
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the discussion topic of each discussion block.
+        """
+        for block_key in block_structure:
+            if block_key.block_type != 'discussion':
+                continue
+            xblock = block_structure.get_xblock(block_key)
+            if any(getattr(xblock, field, None) is None for field in cls.REQUIRED_FIELDS):
+                continue
+            block_structure.set_transformer_block_field(
+                block_key,
+                cls,
+                cls.TOPIC,
+                DiscussionTopicEntry(
+                    location=block_key,
+                    discussion_id=xblock.discussion_id,
+                    discussion_category=xblock.discussion_category,
+                    discussion_target=xblock.discussion_target,
+                    sort_key=xblock.sort_key,
+                    start=xblock.start,
+                ),
+            )
+
+    def transform(self, block_structure, usage_context):
+        """
+        Perform no transformations.
+        """
+        pass
+
+    @classmethod
+    def get_topics(cls, block_structure):
+        """
+        Returns the DiscussionTopicEntry of each discussion block in the
+        given block structure.
+        """
+        topics = (
+            block_structure.get_transformer_block_field(block_key, cls, cls.TOPIC)
+            for block_key in block_structure
+            if block_key.block_type == 'discussion'
+        )
+        return [topic for topic in topics if topic is not None]
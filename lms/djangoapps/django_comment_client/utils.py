@@ -23,11 +23,15 @@ from edxmako import lookup_template
 
 from courseware import courses
 from courseware.access import has_access
+from django_comment_client.transformers import DiscussionTopicsTransformer
+from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, get_course_blocks
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_course_cohorted
 )
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
+from openedx.core.lib.block_structure.transformers import BlockStructureTransformers
 from request_cache.middleware import request_cached
 
 
@@ -125,22 +129,32 @@ def has_required_keys(xblock):
     return True
 
 
-def get_accessible_discussion_xblocks(course, user, include_all=False):  # pylint: disable=invalid-name
+def get_accessible_discussion_topics(course, user, include_all=False):  # pylint: disable=invalid-name
     """
-    Return a list of all valid discussion xblocks in this course that
-    are accessible to the given user.
-    """
-    all_xblocks = modulestore().get_items(course.id, qualifiers={'category': 'discussion'}, include_orphans=False)
+    Return the DiscussionTopicEntry of all valid discussion xblocks in this
+    course that are accessible to the given user.
 
-    return [
-        xblock for xblock in all_xblocks
-        if has_required_keys(xblock) and (include_all or has_access(user, 'load', xblock, course.id))
-    ]
+    The topics are read from the course's collected block structure, which is
+    recollected when the course is published, so the discussion xblocks are
+    not loaded from the modulestore.  The course block access transformers
+    filter out the topics the user can't access, unless include_all is True.
+    """
+    if include_all:
+        block_structure = get_course_in_cache(course.id)
+    else:
+        block_structure = get_course_blocks(
+            user,
+            course.location,
+            BlockStructureTransformers(COURSE_BLOCK_ACCESS_TRANSFORMERS + [DiscussionTopicsTransformer()]),
+        )
+    return DiscussionTopicsTransformer.get_topics(block_structure)
 
 
 def get_discussion_id_map_entry(xblock):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
+
+    The xblock may also be a DiscussionTopicEntry, as returned by get_accessible_discussion_topics().
     """
     return (
         xblock.discussion_id,
@@ -175,22 +189,17 @@ def get_cached_discussion_key(course_id, discussion_id):
 
 def get_cached_discussion_id_map(course, discussion_ids, user):
     """
-    Returns a dict mapping discussion_ids to respective discussion xblock metadata if it is cached and visible to the
-    user. If not, returns the result of get_discussion_id_map
+    Returns a dict mapping discussion_ids to respective discussion xblock metadata if it is visible to the user.
+
+    The metadata is taken from the topics of the course's cached block structure, see
+    get_accessible_discussion_topics, so the discussion xblocks are not loaded from the modulestore.
     """
-    try:
-        entries = []
-        for discussion_id in discussion_ids:
-            key = get_cached_discussion_key(course.id, discussion_id)
-            if not key:
-                continue
-            xblock = modulestore().get_item(key)
-            if not (has_required_keys(xblock) and has_access(user, 'load', xblock, course.id)):
-                continue
-            entries.append(get_discussion_id_map_entry(xblock))
-        return dict(entries)
-    except DiscussionIdMapIsNotCached:
-        return get_discussion_id_map(course, user)
+    discussion_ids = set(discussion_ids)
+    return dict(
+        get_discussion_id_map_entry(topic)
+        for topic in get_accessible_discussion_topics(course, user)
+        if topic.discussion_id in discussion_ids
+    )
 
 
 def get_discussion_id_map(course, user):
@@ -198,7 +207,7 @@ def get_discussion_id_map(course, user):
     Transform the list of this course's discussion xblocks (visible to a given user) into a dictionary of metadata keyed
     by discussion_id.
     """
-    return dict(map(get_discussion_id_map_entry, get_accessible_discussion_xblocks(course, user)))
+    return dict(map(get_discussion_id_map_entry, get_accessible_discussion_topics(course, user)))
 
 
 def _filter_unstarted_categories(category_map, course):
@@ -307,7 +316,7 @@ def get_discussion_category_map(course, user, cohorted_if_in_list=False, exclude
     """
     unexpanded_category_map = defaultdict(list)
 
-    xblocks = get_accessible_discussion_xblocks(course, user)
+    xblocks = get_accessible_discussion_topics(course, user)
 
     course_cohort_settings = get_course_cohort_settings(course.id)
 
@@ -426,7 +435,7 @@ def get_discussion_categories_ids(course, user, include_all=False):
 
     """
     accessible_discussion_ids = [
-        xblock.discussion_id for xblock in get_accessible_discussion_xblocks(course, user, include_all=include_all)
+        topic.discussion_id for topic in get_accessible_discussion_topics(course, user, include_all=include_all)
     ]
     return course.top_level_discussion_topic_ids + accessible_discussion_ids
 
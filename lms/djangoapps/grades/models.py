@@ -15,11 +15,15 @@ import json
 from lazy import lazy
 import logging
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.timezone import now
 from eventtracking import tracker
 from model_utils.models import TimeStampedModel
+import request_cache
 from track import contexts
 from track.event_transaction_utils import get_event_transaction_id, get_event_transaction_type
 
@@ -71,8 +75,18 @@ class BlockRecordList(tuple):
         of the binary digest.  In the future, different algorithms could be
         supported by adding a label indicated which algorithm was used, e.g.,
         "sha256$j0NDRmSPa5bfid2pAcUXaxCm2Dlh3TwayItZstwyeqQ=".
+
+        Most students of a course share the same lists of visible blocks, so
+        the hash values are kept for the rest of the request, and the lists
+        are only serialized and hashed once per request.
         """
-        return b64encode(sha1(self.json_value).digest())
+        hash_values = request_cache.get_cache('grades.BlockRecordList.hash_values')
+        cache_key = (self.course_key, self.version, tuple(self))
+        hash_value = hash_values.get(cache_key)
+        if hash_value is None:
+            hash_value = b64encode(sha1(self.json_value).digest())
+            hash_values[cache_key] = hash_value
+        return hash_value
 
     @lazy
     def json_value(self):
@@ -132,10 +146,14 @@ class VisibleBlocksQuerySet(models.QuerySet):
 
         Argument 'blocks' should be a BlockRecordList.
         """
-        model, _ = self.get_or_create(
-            hashed=blocks.hash_value,
-            defaults={u'blocks_json': blocks.json_value, u'course_id': blocks.course_key},
-        )
+        saved_visible_blocks = VisibleBlocks.saved_visible_blocks()
+        model = saved_visible_blocks.get(blocks.hash_value)
+        if model is None:
+            model, _ = self.get_or_create(
+                hashed=blocks.hash_value,
+                defaults={u'blocks_json': blocks.json_value, u'course_id': blocks.course_key},
+            )
+            saved_visible_blocks[model.hashed] = model
         return model
 
 
@@ -171,16 +189,6 @@ class VisibleBlocks(models.Model):
         """
         return BlockRecordList.from_json(self.blocks_json)
 
-    @classmethod
-    def bulk_read(cls, course_key):
-        """
-        Reads all visible block records for the given course.
-
-        Arguments:
-            course_key: The course identifier for the desired records
-        """
-        return cls.objects.filter(course_id=course_key)
-
     @classmethod
     def bulk_create(cls, block_record_lists):
         """
@@ -202,10 +210,30 @@ class VisibleBlocks(models.Model):
         Bulk creates VisibleBlocks for the given iterator of
         BlockRecordList objects for the given course_key, but
         only for those that aren't already created.
+
+        Only the VisibleBlocks that haven't been saved or read earlier
+        in the request are looked up, by their hash values.
         """
-        existent_records = {record.hashed: record for record in cls.bulk_read(course_key)}
-        non_existent_brls = {brl for brl in block_record_lists if brl.hash_value not in existent_records}
-        cls.bulk_create(non_existent_brls)
+        saved_visible_blocks = cls.saved_visible_blocks()
+        unknown_brls = {
+            brl.hash_value: brl for brl in block_record_lists if brl.hash_value not in saved_visible_blocks
+        }
+        if not unknown_brls:
+            return
+
+        for record in cls.objects.filter(course_id=course_key, hashed__in=unknown_brls.keys()):
+            saved_visible_blocks[record.hashed] = record
+            del unknown_brls[record.hashed]
+        for record in cls.bulk_create(unknown_brls.itervalues()):
+            saved_visible_blocks[record.hashed] = record
+
+    @classmethod
+    def saved_visible_blocks(cls):
+        """
+        Returns the request cache of the VisibleBlocks known to be saved,
+        keyed by their hash values.
+        """
+        return request_cache.get_cache('grades.VisibleBlocks.saved')
 
 
 class PersistentSubsectionGrade(TimeStampedModel):
@@ -327,6 +355,20 @@ class PersistentSubsectionGrade(TimeStampedModel):
             course_id=course_key,
         )
 
+    @classmethod
+    def bulk_read_grades_for_users(cls, user_ids, course_key):
+        """
+        Reads all grades for the given users and course.
+
+        Arguments:
+            user_ids: The users associated with the desired grades
+            course_key: The course identifier for the desired grades
+        """
+        return cls.objects.select_related('visible_blocks').filter(
+            user_id__in=user_ids,
+            course_id=course_key,
+        )
+
     @classmethod
     def update_or_create_grade(cls, **params):
         """
@@ -381,7 +423,9 @@ class PersistentSubsectionGrade(TimeStampedModel):
             cls._prepare_attempted_for_create(params, first_attempt_timestamp)
         grades = [PersistentSubsectionGrade(**params) for params in grade_params_iter]
         for grade in grades:
-            grade.full_clean()
+            # The VisibleBlocks were saved above, so there's no need to
+            # query them again to validate the grades' foreign keys.
+            grade.full_clean(exclude=['visible_blocks'])
         grades = cls.objects.bulk_create(grades)
         for grade in grades:
             cls._emit_grade_calculated_event(grade)
@@ -494,6 +538,19 @@ class PersistentCourseGrade(TimeStampedModel):
     # Information related to course completion
     passed_timestamp = models.DateTimeField(u'Date learner earned a passing grade', blank=True, null=True)
 
+    # Version of the format of the grades cached by read_course_grade;
+    # incremented to ignore the grades cached by earlier versions.
+    CACHE_VERSION = 2
+    # The grades are cached for a day, unless they are updated sooner.
+    CACHE_TIMEOUT = 60 * 60 * 24
+    # The absence of a grade is only cached for a minute.
+    MISSING_GRADE_CACHE_TIMEOUT = 60
+    # When a grade is updated, its cache entry is replaced by a marker which
+    # keeps readers from caching the grade until the update is committed.
+    INVALIDATED_CACHE_VALUE = 'invalidated'
+    INVALIDATED_CACHE_TIMEOUT = 60 * 5
+    REQUEST_CACHE_NAME = 'grades.PersistentCourseGrade'
+
     def __unicode__(self):
         """
         Returns a string representation of this model.
@@ -510,7 +567,10 @@ class PersistentCourseGrade(TimeStampedModel):
     @classmethod
     def read_course_grade(cls, user_id, course_id):
         """
-        Reads a grade from database
+        Reads a grade from database, through the request cache and the
+        django cache, in which it is kept until it is updated.  The cached
+        grade records the course version and grading policy with which it
+        was computed, so callers must still check that it is up to date.
 
         Arguments:
             user_id: The user associated with the desired grade
@@ -518,7 +578,68 @@ class PersistentCourseGrade(TimeStampedModel):
 
         Raises PersistentCourseGrade.DoesNotExist if applicable
         """
-        return cls.objects.get(user_id=user_id, course_id=course_id)
+        cache_key = cls.cache_key(user_id, course_id)
+        grades_request_cache = request_cache.get_cache(cls.REQUEST_CACHE_NAME)
+        if cache_key in grades_request_cache:
+            grade = grades_request_cache[cache_key]
+        else:
+            cached_grade = cache.get(cache_key)
+            if cached_grade is None or cached_grade == cls.INVALIDATED_CACHE_VALUE:
+                try:
+                    grade = cls.objects.get(user_id=user_id, course_id=course_id)
+                    timeout = cls.CACHE_TIMEOUT
+                except cls.DoesNotExist:
+                    # Cache the absence of a grade too, as False since
+                    # the django cache returns None for missing keys.
+                    grade = False
+                    timeout = cls.MISSING_GRADE_CACHE_TIMEOUT
+                if cached_grade is None:
+                    # Unlike set, add doesn't replace the entry if it was
+                    # invalidated since it was read, by an update which may
+                    # not be committed yet.
+                    cache.add(cache_key, grade, timeout)
+            else:
+                grade = cached_grade
+            grades_request_cache[cache_key] = grade
+
+        if not grade:
+            raise cls.DoesNotExist
+        return grade
+
+    @classmethod
+    def cache_key(cls, user_id, course_id):
+        """
+        Returns the key of the cached grade of the user in the course.
+        """
+        return u'grades.course_grade.v{version}.{user_id}.{course_id}'.format(
+            version=cls.CACHE_VERSION,
+            user_id=user_id,
+            course_id=course_id,
+        )
+
+    @classmethod
+    def invalidate_cached_grade(cls, user_id, course_id):
+        """
+        Removes the cached grade of the user in the course.
+
+        Since the grade may be invalidated before its update is committed,
+        the grade is not cached again for INVALIDATED_CACHE_TIMEOUT, so that
+        a concurrent reader doesn't cache the outdated grade.
+        """
+        cache_key = cls.cache_key(user_id, course_id)
+        request_cache.get_cache(cls.REQUEST_CACHE_NAME).pop(cache_key, None)
+        cache.set(cache_key, cls.INVALIDATED_CACHE_VALUE, cls.INVALIDATED_CACHE_TIMEOUT)
+
+    @classmethod
+    def bulk_read_course_grades(cls, user_ids, course_id):
+        """
+        Reads the grades for the given users and course from database
+
+        Arguments:
+            user_ids: The users associated with the desired grades
+            course_id: The id of the course associated with the desired grades
+        """
+        return cls.objects.filter(user_id__in=user_ids, course_id=course_id)
 
     @classmethod
     def update_or_create_course_grade(cls, user_id, course_id, **kwargs):
@@ -566,3 +687,11 @@ class PersistentCourseGrade(TimeStampedModel):
                     'grading_policy_hash': unicode(grade.grading_policy_hash),
                 }
             )
+
+
+@receiver([post_save, post_delete], sender=PersistentCourseGrade)
+def invalidate_cached_course_grade(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached grade of the user in the course when it changes.
+    """
+    PersistentCourseGrade.invalidate_cached_grade(instance.user_id, instance.course_id)
@@ -0,0 +1,114 @@
+"""
+BulkGradesData Class
+"""
+from collections import defaultdict
+
+from courseware.model_data import ScoresClient
+from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
+from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
+from lms.djangoapps.grades.scores import possibly_scored
+from student.models import anonymous_id_for_user
+from submissions.models import ScoreSummary
+
+
+class BulkGradesData(object):
+    """
+    The grades-related data of a batch of students in a course, as
+    needed to compute their course grades, prefetched with a fixed
+    number of bulk queries for the whole batch rather than with
+    separate queries for each student.
+    """
+    def __init__(self, course_key, students, collected_block_structure):
+        """
+        Arguments:
+            course_key (CourseKey) - The course for which the data is
+                prefetched.
+
+            students ([User]) - The students for whom the data is
+                prefetched.
+
+            collected_block_structure (BlockStructureBlockData) - The
+                collected (untransformed) block structure of the
+                course, used to determine the scorable locations.
+        """
+        self.course_key = course_key
+        user_ids = [student.id for student in students]
+        scorable_locations = [block_key for block_key in collected_block_structure if possibly_scored(block_key)]
+
+        self._csm_scores = ScoresClient.bulk_create_for_locations(course_key, user_ids, scorable_locations)
+
+        # The anonymous ids of students with submissions are already
+        # saved, so they need not be saved again here.
+        anonymous_user_ids = {
+            student.id: anonymous_id_for_user(student, course_key, save=False) for student in students
+        }
+        self._submissions_scores = self._bulk_read_submissions_scores(course_key, anonymous_user_ids)
+
+        self._course_grades = None
+        self._subsection_grades = None
+        if PersistentGradesEnabledFlag.feature_enabled(course_key):
+            self._course_grades = {
+                grade.user_id: grade for grade in PersistentCourseGrade.bulk_read_course_grades(user_ids, course_key)
+            }
+            self._subsection_grades = defaultdict(dict)
+            for grade in PersistentSubsectionGrade.bulk_read_grades_for_users(user_ids, course_key):
+                self._subsection_grades[grade.user_id][grade.full_usage_key] = grade
+
+    def csm_scores(self, user_id):
+        """
+        Returns the ScoresClient with the user's scores stored in the
+        user state (in CSM) for the course.
+        """
+        return self._csm_scores[user_id]
+
+    def submissions_scores(self, user_id):
+        """
+        Returns the user's scores stored by the Submissions API for the
+        course, in the format returned by submissions_api.get_scores.
+        """
+        return self._submissions_scores[user_id]
+
+    def subsection_grades(self, user_id):
+        """
+        Returns a dict of subsection usage key to the user's
+        PersistentSubsectionGrade for the course, or None if
+        persistent grades are not enabled for the course.
+        """
+        if self._subsection_grades is None:
+            return None
+        return self._subsection_grades[user_id]
+
+    def course_grade(self, user_id):
+        """
+        Returns the user's PersistentCourseGrade for the course.
+
+        Raises PersistentCourseGrade.DoesNotExist if not found.
+        """
+        if self._course_grades is None or user_id not in self._course_grades:
+            raise PersistentCourseGrade.DoesNotExist
+        return self._course_grades[user_id]
+
+    @staticmethod
+    def _bulk_read_submissions_scores(course_key, anonymous_user_ids):
+        """
+        Returns a dict of user_id to the user's scores stored by the
+        Submissions API for the course, reading the scores for all
+        users with a single query equivalent to that of
+        submissions_api.get_scores.
+        """
+        user_ids_by_anonymous_id = {
+            anonymous_user_id: user_id for user_id, anonymous_user_id in anonymous_user_ids.iteritems()
+        }
+        scores = {user_id: {} for user_id in anonymous_user_ids}
+        score_summaries = ScoreSummary.objects.filter(
+            student_item__course_id=unicode(course_key),
+            student_item__student_id__in=user_ids_by_anonymous_id.keys(),
+        ).select_related('latest', 'student_item')
+        for summary in score_summaries:
+            if not summary.latest.is_hidden():
+                user_id = user_ids_by_anonymous_id[summary.student_item.student_id]
+                scores[user_id][summary.student_item.item_id] = (
+                    summary.latest.points_earned,
+                    summary.latest.points_possible,
+                )
+        return scores
@@ -3,6 +3,7 @@ CourseGrade Class
 """
 
 from collections import defaultdict, namedtuple, OrderedDict
+from itertools import islice
 from logging import getLogger
 
 from django.conf import settings
@@ -12,10 +13,12 @@ from lazy import lazy
 
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
 from xmodule import block_metadata_utils
 
 from ..models import PersistentCourseGrade
+from .bulk_data import BulkGradesData
 from .subsection_grade import SubsectionGradeFactory
 from ..transformer import GradesTransformer
 
@@ -27,7 +30,7 @@ class CourseGrade(object):
     """
     Course Grade class
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, bulk_grades_data=None):
         self.student = student
         self.course = course
         self.course_version = getattr(course, 'course_version', None)
@@ -35,7 +38,9 @@ class CourseGrade(object):
         self.course_structure = course_structure
         self._percent = None
         self._letter_grade = None
-        self._subsection_grade_factory = SubsectionGradeFactory(self.student, self.course, self.course_structure)
+        self._subsection_grade_factory = SubsectionGradeFactory(
+            self.student, self.course, self.course_structure, bulk_grades_data,
+        )
 
     @lazy
     def graded_subsections_by_format(self):
@@ -215,19 +220,24 @@ class CourseGrade(object):
         )
 
     @classmethod
-    def load_persisted_grade(cls, user, course, course_structure):
+    def load_persisted_grade(cls, user, course, course_structure, bulk_grades_data=None):
         """
         Initializes a CourseGrade object, filling its members with persisted values from the database.
 
         If the grading policy is out of date, recomputes the grade.
 
         If no persisted values are found, returns None.
+
+        If bulk_grades_data is given, the persisted values are read from its prefetched data.
         """
         try:
-            persistent_grade = PersistentCourseGrade.read_course_grade(user.id, course.id)
+            if bulk_grades_data is not None:
+                persistent_grade = bulk_grades_data.course_grade(user.id)
+            else:
+                persistent_grade = PersistentCourseGrade.read_course_grade(user.id, course.id)
         except PersistentCourseGrade.DoesNotExist:
             return None
-        course_grade = CourseGrade(user, course, course_structure)
+        course_grade = CourseGrade(user, course, course_structure, bulk_grades_data)
 
         current_grading_policy_hash = course_grade.get_grading_policy_hash(course.location, course_structure)
         if current_grading_policy_hash != persistent_grade.grading_policy_hash:
@@ -323,25 +333,34 @@ class CourseGradeFactory(object):
     """
     Factory class to create Course Grade objects
     """
-    def create(self, student, course, read_only=True):
+    # Number of students whose grades-related data is prefetched
+    # together by iter.
+    BULK_CHUNK_SIZE = 100
+
+    def create(self, student, course, read_only=True, collected_block_structure=None, bulk_grades_data=None):
         """
         Returns the CourseGrade object for the given student and course.
 
         If read_only is True, doesn't save any updates to the grades.
         Raises a PermissionDenied if the user does not have course access.
+
+        collected_block_structure and bulk_grades_data can be optionally
+        provided if already available for a batch of students, for optimization.
         """
-        course_structure = get_course_blocks(student, course.location)
+        course_structure = get_course_blocks(
+            student, course.location, collected_block_structure=collected_block_structure,
+        )
         # if user does not have access to this course, throw an exception
         if not self._user_has_access_to_course(course_structure):
             raise PermissionDenied("User does not have access to this course")
         return (
-            self._get_saved_grade(student, course, course_structure) or
-            self._compute_and_update_grade(student, course, course_structure, read_only)
+            self._get_saved_grade(student, course, course_structure, bulk_grades_data) or
+            self._compute_and_update_grade(student, course, course_structure, read_only, bulk_grades_data)
         )
 
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'err_msg'])
 
-    def iter(self, course, students):
+    def iter(self, course, students, chunk_size=None):
         """
         Given a course and an iterable of students (User), yield a GradeResult
         for every student enrolled in the course.  GradeResult is a named tuple of:
@@ -350,12 +369,53 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        Students are graded in chunks of chunk_size (BULK_CHUNK_SIZE by default).
+        The collected course structure is retrieved once for all students, and
+        the persisted grades and scores of each chunk of students are prefetched
+        with bulk queries.  If that fails, the students of the chunk are graded
+        without the prefetched data.
+        """
+        students = iter(students)
+        collected_block_structure = None
+        while True:
+            student_chunk = list(islice(students, chunk_size or self.BULK_CHUNK_SIZE))
+            if not student_chunk:
+                return
+
+            try:
+                if collected_block_structure is None:
+                    collected_block_structure = get_course_in_cache(course.id)
+                bulk_grades_data = BulkGradesData(course.id, student_chunk, collected_block_structure)
+            except Exception as exc:  # pylint: disable=broad-except
+                # Grade the students of this chunk without prefetched data
+                # rather than failing all of them.
+                log.exception(
+                    'Cannot prefetch the grades data of %s students in course %s because of exception: %s',
+                    len(student_chunk),
+                    course.id,
+                    exc.message
+                )
+                collected_block_structure = bulk_grades_data = None
+
+            for grade_result in self._iter_chunk(course, student_chunk, collected_block_structure, bulk_grades_data):
+                yield grade_result
+
+    def _iter_chunk(self, course, students, collected_block_structure, bulk_grades_data):
+        """
+        Yields a GradeResult for every student in the given chunk of
+        students, using the data prefetched for the chunk.
         """
         for student in students:
             with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=[u'action:{}'.format(course.id)]):
 
                 try:
-                    course_grade = CourseGradeFactory().create(student, course)
+                    course_grade = self.create(
+                        student,
+                        course,
+                        collected_block_structure=collected_block_structure,
+                        bulk_grades_data=bulk_grades_data,
+                    )
                     yield self.GradeResult(student, course_grade, "")
 
                 except Exception as exc:  # pylint: disable=broad-except
@@ -386,7 +446,7 @@ class CourseGradeFactory(object):
 
         return CourseGrade.get_persisted_grade(student, course)
 
-    def _get_saved_grade(self, student, course, course_structure):
+    def _get_saved_grade(self, student, course, course_structure, bulk_grades_data=None):
         """
         Returns the saved grade for the given course and student.
         """
@@ -396,16 +456,17 @@ class CourseGradeFactory(object):
         return CourseGrade.load_persisted_grade(
             student,
             course,
-            course_structure
+            course_structure,
+            bulk_grades_data,
         )
 
-    def _compute_and_update_grade(self, student, course, course_structure, read_only=False):
+    def _compute_and_update_grade(self, student, course, course_structure, read_only=False, bulk_grades_data=None):
         """
         Freshly computes and updates the grade for the student and course.
 
         If read_only is True, doesn't save any updates to the grades.
         """
-        course_grade = CourseGrade(student, course, course_structure)
+        course_grade = CourseGrade(student, course, course_structure, bulk_grades_data)
         course_grade.compute_and_update(read_only)
         return course_grade
 
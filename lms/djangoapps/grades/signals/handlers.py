@@ -27,7 +27,7 @@ from .signals import (
 )
 from ..new.course_grade import CourseGradeFactory
 from ..scores import weighted_score
-from ..tasks import recalculate_subsection_grade_v2
+from ..tasks import record_subsection_grade_recalculation, recalculate_subsection_grade_v2
 
 log = getLogger(__name__)
 
@@ -173,13 +173,17 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     enqueueing a subsection update operation to occur asynchronously.
     """
     _emit_problem_submitted_event(kwargs)
+    expected_modified_time = to_timestamp(kwargs['modified'])
+    record_subsection_grade_recalculation(
+        kwargs['user_id'], kwargs['usage_id'], expected_modified_time, kwargs.get('only_if_higher'),
+    )
     result = recalculate_subsection_grade_v2.apply_async(
         kwargs=dict(
             user_id=kwargs['user_id'],
             course_id=kwargs['course_id'],
             usage_id=kwargs['usage_id'],
             only_if_higher=kwargs.get('only_if_higher'),
-            expected_modified_time=to_timestamp(kwargs['modified']),
+            expected_modified_time=expected_modified_time,
             score_deleted=kwargs.get('score_deleted', False),
             event_transaction_id=unicode(get_event_transaction_id()),
             event_transaction_type=unicode(get_event_transaction_type()),
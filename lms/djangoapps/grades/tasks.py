@@ -5,6 +5,7 @@ This module contains tasks for asynchronous execution of grade updates.
 from celery import task
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db.utils import DatabaseError
 from logging import getLogger
 
@@ -56,6 +57,9 @@ def recalculate_subsection_grade_v2(**kwargs):
     """
     Updates a saved subsection grade.
 
+    The update is skipped if a more recent change of the same score has
+    been recorded by record_subsection_grade_recalculation, and committed.
+
     Arguments:
         user_id (int): id of applicable User object
         course_id (string): identifying the course
@@ -97,6 +101,21 @@ def recalculate_subsection_grade_v2(**kwargs):
     ):
         raise _retry_recalculate_subsection_grade(**kwargs)
 
+    if _is_recalculation_superseded(
+            kwargs['user_id'],
+            kwargs['usage_id'],
+            scored_block_usage_key,
+            kwargs['expected_modified_time'],
+            kwargs['only_if_higher'],
+    ):
+        log.info(
+            u'Grades: Skipping recalculation of subsection grades for user %s and block %s, '
+            u'superseded by a more recent score change.',
+            kwargs['user_id'],
+            kwargs['usage_id'],
+        )
+        return
+
     _update_subsection_grades(
         course_key,
         scored_block_usage_key,
@@ -109,6 +128,58 @@ def recalculate_subsection_grade_v2(**kwargs):
     )
 
 
+def record_subsection_grade_recalculation(user_id, usage_id, expected_modified_time, only_if_higher):
+    """
+    Records a score change of the given user and scored block, for which a
+    recalculate_subsection_grade_v2 task is being queued.
+
+    Only the most recent score change of each user and block is kept, for
+    settings.RECALCULATE_GRADES_COALESCING_WINDOW seconds; once it is
+    committed, the tasks queued for earlier changes of the same score are
+    skipped, since the task of the most recent change recalculates the same
+    subsection grades from the same, or newer, scores.
+    """
+    cache_key = _recalculation_cache_key(user_id, usage_id)
+    newest_change = cache.get(cache_key)
+    if newest_change is None or expected_modified_time >= newest_change[0]:
+        cache.set(
+            cache_key,
+            (expected_modified_time, bool(only_if_higher)),
+            settings.RECALCULATE_GRADES_COALESCING_WINDOW,
+        )
+
+
+def _is_recalculation_superseded(user_id, usage_id, scored_block_usage_key, expected_modified_time, only_if_higher):
+    """
+    Returns whether a more recent score change of the given user and
+    scored block has been recorded by record_subsection_grade_recalculation,
+    whose task makes the recalculation for this change redundant.
+
+    A change that may lower the grade is not superseded by a more recent
+    change that only updates the grade if it is higher.  Since the more
+    recent change is recorded before its transaction commits, it only
+    supersedes this change once the database has been updated with it;
+    otherwise its transaction may yet be rolled back.
+    """
+    newest_change = cache.get(_recalculation_cache_key(user_id, usage_id))
+    if newest_change is None:
+        return False
+    newest_modified_time, newest_only_if_higher = newest_change
+    if newest_modified_time <= expected_modified_time or (newest_only_if_higher and not only_if_higher):
+        return False
+    return _has_database_updated_with_new_score(
+        user_id, scored_block_usage_key, from_timestamp(newest_modified_time), score_deleted=False,
+    )
+
+
+def _recalculation_cache_key(user_id, usage_id):
+    """
+    Returns the key of the most recent score change of the user and scored
+    block recorded by record_subsection_grade_recalculation.
+    """
+    return u'grades.recalculate_subsection_grade.{}.{}'.format(user_id, usage_id)
+
+
 def _has_database_updated_with_new_score(
         user_id, scored_block_usage_key, expected_modified_time, score_deleted,
 ):
@@ -8,7 +8,7 @@ from mock import patch
 from nose.plugins.attrib import attr
 
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
-from courseware.model_data import set_score
+from courseware.model_data import ScoresClient, set_score
 from courseware.tests.helpers import LoginEnrollmentTestCase
 
 from lms.djangoapps.course_blocks.api import get_course_blocks
@@ -74,6 +74,46 @@ class TestGradeIteration(SharedModuleStoreTestCase):
             self.assertIsNone(course_grade.letter_grade)
             self.assertEqual(course_grade.percent, 0.0)
 
+    def test_chunked_iteration(self):
+        """
+        Students are graded in chunks, with their scores prefetched
+        once per chunk rather than once per student.
+        """
+        with patch(
+            'courseware.model_data.ScoresClient.bulk_create_for_locations',
+            wraps=ScoresClient.bulk_create_for_locations,
+        ) as mock_bulk_create:
+            with patch('courseware.model_data.ScoresClient.create_for_locations') as mock_create:
+                grade_results = list(CourseGradeFactory().iter(self.course, self.students, chunk_size=2))
+
+        self.assertEqual(mock_bulk_create.call_count, 3)
+        self.assertFalse(mock_create.called)
+        self.assertEqual([result.student for result in grade_results], self.students)
+        for result in grade_results:
+            self.assertEqual(result.err_msg, "")
+            self.assertEqual(result.course_grade.percent, 0.0)
+
+    def test_prefetch_exception(self):
+        """
+        Students of a chunk whose data cannot be prefetched are still graded,
+        without the prefetched data.
+        """
+        bulk_grades_data = object()
+        with patch(
+            'lms.djangoapps.grades.new.course_grade.BulkGradesData',
+            side_effect=[Exception("Prefetch error."), bulk_grades_data, bulk_grades_data],
+        ):
+            with patch(
+                'lms.djangoapps.grades.new.course_grade.CourseGradeFactory.create',
+            ) as mock_course_grade:
+                grade_results = list(CourseGradeFactory().iter(self.course, self.students, chunk_size=2))
+
+        self.assertEqual([result.err_msg for result in grade_results], [""] * 5)
+        self.assertEqual(
+            [call[1]['bulk_grades_data'] for call in mock_course_grade.call_args_list],
+            [None, None, bulk_grades_data, bulk_grades_data, bulk_grades_data],
+        )
+
     @patch('lms.djangoapps.grades.new.course_grade.CourseGradeFactory.create')
     def test_grading_exception(self, mock_course_grade):
         """Test that we correctly capture exception messages that bubble up from
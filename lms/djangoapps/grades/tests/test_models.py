@@ -9,12 +9,14 @@ from hashlib import sha1
 import json
 from mock import patch
 
+from django.core.cache.backends.locmem import LocMemCache
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
 from django.test import TestCase
 from django.utils.timezone import now
 from freezegun import freeze_time
 from opaque_keys.edx.locator import CourseLocator, BlockUsageLocator
+from request_cache.middleware import RequestCache
 from track.event_transaction_utils import get_event_transaction_id, get_event_transaction_type
 
 from lms.djangoapps.grades.models import (
@@ -63,6 +65,9 @@ class GradesModelTestCase(TestCase):
     """
     def setUp(self):
         super(GradesModelTestCase, self).setUp()
+        # The cached grades and visible blocks outlive the rolled back
+        # records of earlier tests.
+        RequestCache.clear_request_cache()
         self.course_key = CourseLocator(
             org='some_org',
             course='some_course',
@@ -177,6 +182,26 @@ class VisibleBlocksTest(GradesModelTestCase):
         self.assertNotEqual(stored_vblocks.pk, new_vblocks.pk)
         self.assertNotEqual(stored_vblocks.hashed, new_vblocks.hashed)
 
+    def test_saved_visible_blocks_reused(self):
+        """
+        Ensures that the VisibleBlocks saved or read earlier in the request
+        are not queried again.
+        """
+        stored_vblocks = self._create_block_record_list([self.record_a, self.record_b])
+        with self.assertNumQueries(0):
+            repeat_vblocks = self._create_block_record_list([self.record_a, self.record_b])
+        self.assertEqual(stored_vblocks.pk, repeat_vblocks.pk)
+
+        block_record_lists = [
+            BlockRecordList.from_list(blocks, self.course_key)
+            for blocks in ([self.record_a, self.record_b], [self.record_a], [self.record_b])
+        ]
+        with self.assertNumQueries(2):
+            VisibleBlocks.bulk_get_or_create(block_record_lists, self.course_key)
+        with self.assertNumQueries(0):
+            VisibleBlocks.bulk_get_or_create(block_record_lists, self.course_key)
+        self.assertEqual(VisibleBlocks.objects.filter(course_id=self.course_key).count(), 3)
+
     def test_blocks_property(self):
         """
         Ensures that, given an array of BlockRecord, creating visible_blocks
@@ -427,6 +452,80 @@ class PersistentCourseGradesTest(GradesModelTestCase):
         self.assertIsInstance(created_grade.passed_timestamp, datetime)
         self.assertEqual(created_grade, read_grade)
 
+    def test_read_grade_cached(self):
+        with self.assertNumQueries(1):
+            with self.assertRaises(PersistentCourseGrade.DoesNotExist):
+                PersistentCourseGrade.read_course_grade(self.params["user_id"], self.params["course_id"])
+        with self.assertNumQueries(0):
+            with self.assertRaises(PersistentCourseGrade.DoesNotExist):
+                PersistentCourseGrade.read_course_grade(self.params["user_id"], self.params["course_id"])
+
+        created_grade = PersistentCourseGrade.update_or_create_course_grade(**self.params)
+        with self.assertNumQueries(1):
+            read_grade = PersistentCourseGrade.read_course_grade(self.params["user_id"], self.params["course_id"])
+        self.assertEqual(created_grade, read_grade)
+
+        self.params["percent_grade"] = 88.8
+        PersistentCourseGrade.update_or_create_course_grade(**self.params)
+        with self.assertNumQueries(1):
+            read_grade = PersistentCourseGrade.read_course_grade(self.params["user_id"], self.params["course_id"])
+        self.assertEqual(read_grade.percent_grade, 88.8)
+        with self.assertNumQueries(0):
+            PersistentCourseGrade.read_course_grade(self.params["user_id"], self.params["course_id"])
+
+    def test_read_grade_memcached(self):
+        def read_grade():
+            """Reads the grade in a new request."""
+            RequestCache.clear_request_cache()
+            return PersistentCourseGrade.read_course_grade(self.params["user_id"], self.params["course_id"])
+
+        test_cache = LocMemCache('grades_models_test', {})
+        with patch('lms.djangoapps.grades.models.cache', test_cache):
+            with patch.object(test_cache, 'add', wraps=test_cache.add) as mock_add:
+                # The absence of a grade is only cached briefly.
+                with self.assertNumQueries(1):
+                    with self.assertRaises(PersistentCourseGrade.DoesNotExist):
+                        read_grade()
+                self.assertEqual(mock_add.call_args[0][2], PersistentCourseGrade.MISSING_GRADE_CACHE_TIMEOUT)
+                with self.assertNumQueries(0):
+                    with self.assertRaises(PersistentCourseGrade.DoesNotExist):
+                        read_grade()
+
+                # Updated grades are not cached again until the update is
+                # assumed to be committed, when the invalidation expires.
+                PersistentCourseGrade.update_or_create_course_grade(**self.params)
+                for __ in range(2):
+                    with self.assertNumQueries(1):
+                        read_grade()
+                test_cache.delete(PersistentCourseGrade.cache_key(self.params["user_id"], self.params["course_id"]))
+                with self.assertNumQueries(1):
+                    read_grade()
+                self.assertEqual(mock_add.call_args[0][2], PersistentCourseGrade.CACHE_TIMEOUT)
+                with self.assertNumQueries(0):
+                    self.assertEqual(read_grade().percent_grade, self.params["percent_grade"])
+
+    def test_outdated_grade_not_cached(self):
+        """
+        A grade read before a concurrent update is not cached once the update
+        has invalidated the cached grade.
+        """
+        PersistentCourseGrade.update_or_create_course_grade(**self.params)
+        outdated_grade = PersistentCourseGrade.objects.get(
+            user_id=self.params["user_id"], course_id=self.params["course_id"]
+        )
+        with patch('lms.djangoapps.grades.models.cache', LocMemCache('grades_models_test', {})):
+            with patch.object(PersistentCourseGrade.objects, 'get') as mock_get:
+                def read_then_update(**kwargs):
+                    """Simulates an update of the grade right after it was read."""
+                    PersistentCourseGrade.invalidate_cached_grade(self.params["user_id"], self.params["course_id"])
+                    return outdated_grade
+                mock_get.side_effect = read_then_update
+                PersistentCourseGrade.read_course_grade(self.params["user_id"], self.params["course_id"])
+
+            RequestCache.clear_request_cache()
+            with self.assertNumQueries(1):
+                PersistentCourseGrade.read_course_grade(self.params["user_id"], self.params["course_id"])
+
     def test_course_version_optional(self):
         del self.params["course_version"]
         grade = PersistentCourseGrade.update_or_create_course_grade(**self.params)
@@ -166,8 +166,8 @@ class TestCourseGradeFactory(GradeTestBase):
         self.course.set_grading_policy(new_grading_policy)
 
         # ensure the grade can still be retrieved via get_persisted
-        # despite its outdated grading policy
-        with self.assertNumQueries(1):
+        # despite its outdated grading policy, from the request cache
+        with self.assertNumQueries(0):
             course_grade = grade_factory.get_persisted(self.request.user, self.course)
         self.assertEqual(course_grade.letter_grade, u'Pass')
         self.assertEqual(course_grade.percent, 0.5)
@@ -7,6 +7,7 @@ from contextlib import contextmanager
 from datetime import datetime, timedelta
 import ddt
 from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
 from django.db.utils import IntegrityError
 from mock import patch, MagicMock
 import pytz
@@ -111,6 +112,45 @@ class RecalculateSubsectionGradeTest(ModuleStoreTestCase):
             PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
             mock_task_apply.assert_called_once_with(kwargs=local_task_args)
 
+    @patch('lms.djangoapps.grades.tasks.cache', LocMemCache('grades_tasks_test', {}))
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    @patch('lms.djangoapps.grades.new.subsection_grade.SubsectionGradeFactory.update')
+    def test_superseded_recalculation_skipped(self, mock_update, mock_course_signal):  # pylint: disable=unused-argument
+        """
+        Ensures that the task is skipped when a more recent change of the same score has been queued.
+        """
+        self.set_up_course()
+        send_args = self.problem_weighted_score_changed_kwargs
+        with patch('lms.djangoapps.grades.tasks.recalculate_subsection_grade_v2.apply_async'):
+            PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
+            send_args['modified'] = self.frozen_now_datetime + timedelta(seconds=10)
+            PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
+
+        self._apply_recalculate_subsection_grade()
+        self.assertFalse(mock_update.called)
+
+        self.recalculate_subsection_grade_kwargs['expected_modified_time'] = to_timestamp(send_args['modified'])
+        self._apply_recalculate_subsection_grade()
+        self.assertTrue(mock_update.called)
+
+    @patch('lms.djangoapps.grades.tasks.cache', LocMemCache('grades_tasks_test', {}))
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    @patch('lms.djangoapps.grades.new.subsection_grade.SubsectionGradeFactory.update')
+    def test_rolled_back_change_ignored(self, mock_update, mock_course_signal):  # pylint: disable=unused-argument
+        """
+        Ensures that the task is not skipped for a more recent change of the same
+        score which is not in the database, since its transaction may be rolled back.
+        """
+        self.set_up_course()
+        send_args = self.problem_weighted_score_changed_kwargs
+        with patch('lms.djangoapps.grades.tasks.recalculate_subsection_grade_v2.apply_async'):
+            PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
+            send_args['modified'] = self.frozen_now_datetime + timedelta(seconds=10)
+            PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
+
+        self._apply_recalculate_subsection_grade(mock_score=MagicMock(modified=self.frozen_now_datetime))
+        self.assertTrue(mock_update.called)
+
     @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
     def test_subsection_update_triggers_signal(self, mock_subsection_signal):
         """
@@ -5,6 +5,7 @@ Serve miscellaneous course and student data
 """
 import json
 import datetime
+import itertools
 from shoppingcart.models import (
     PaidCourseRegistration, CouponRedemption, CourseRegCodeItem,
     RegistrationCodeRedemption, CourseRegistrationCodeInvoiceItem
@@ -49,6 +50,9 @@ CERTIFICATE_FEATURES = ('course_id', 'mode', 'status', 'grade', 'created_date',
 
 UNAVAILABLE = "[unavailable]"
 
+# Number of students queried at once when iterating over the enrolled students.
+STUDENTS_QUERY_CHUNK_SIZE = 1000
+
 
 def sale_order_record_features(course_id, features):
     """
@@ -211,6 +215,15 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features):
+    """
+    Yield the student features of enrolled_students_features one student at
+    a time, querying the students in chunks of STUDENTS_QUERY_CHUNK_SIZE, so
+    that only a single chunk of students is held in memory at once.
+    """
     include_cohort_column = 'cohort' in features
     include_team_column = 'team' in features
 
@@ -277,7 +290,12 @@ def enrolled_students_features(course_key, features):
             )
         return student_dict
 
-    return [extract_student(student, features) for student in students]
+    for offset in itertools.count(0, STUDENTS_QUERY_CHUNK_SIZE):
+        student_chunk = list(students[offset:offset + STUDENTS_QUERY_CHUNK_SIZE])
+        for student in student_chunk:
+            yield extract_student(student, features)
+        if len(student_chunk) < STUDENTS_QUERY_CHUNK_SIZE:
+            break
 
 
 def list_may_enroll(course_key, features):
@@ -393,24 +411,30 @@ def list_problem_responses(course_key, problem_location):
     where `state` represents a student's response to the problem
     identified by `problem_location`.
     """
+    return list(iter_problem_responses(course_key, problem_location))
+
+
+def iter_problem_responses(course_key, problem_location):
+    """
+    Yield the responses of list_problem_responses one at a time, without
+    loading all of the problem's StudentModules in memory at once.
+    """
     problem_key = UsageKey.from_string(problem_location)
     # Are we dealing with an "old-style" problem location?
     run = problem_key.run
     if not run:
         problem_key = course_key.make_usage_key_from_deprecated_string(problem_location)
     if problem_key.course_key != course_key:
-        return []
+        return
 
     smdat = StudentModule.objects.filter(
         course_id=course_key,
         module_state_key=problem_key
     )
-    smdat = smdat.order_by('student')
+    smdat = smdat.order_by('student').select_related('student')
 
-    return [
-        {'username': response.student.username, 'state': response.state}
-        for response in smdat
-    ]
+    for response in smdat.iterator():
+        yield {'username': response.student.username, 'state': response.state}
 
 
 def course_registration_features(features, registration_codes, csv_type):
@@ -70,17 +70,29 @@ def format_dictlist(dictlist, features):
     }
     """
 
+    header = features
+    datarows = list(iter_dictlist_rows(dictlist, features))
+
+    return header, datarows
+
+
+def iter_dictlist_rows(dicts, features):
+    """
+    Lazily convert an iterable of dictionaries into datarows, as returned by
+    format_dictlist, yielding one datarow at a time.
+
+    `dicts` is an iterable of dictionaries, such as a generator
+    `features` is a list of features
+    """
     def dict_to_entry(dct):
         """ Convert dictionary to a list for a csv row """
         relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
-        ordered = sorted(relevant_items, key=lambda (k, v): header.index(k))
+        ordered = sorted(relevant_items, key=lambda (k, v): features.index(k))
         vals = [v for (_, v) in ordered]
         return vals
 
-    header = features
-    datarows = map(dict_to_entry, dictlist)
-
-    return header, datarows
+    for dct in dicts:
+        yield dict_to_entry(dct)
 
 
 def format_instances(instances, features):
@@ -3,7 +3,7 @@
 from django.test import TestCase
 from nose.tools import raises
 
-from instructor_analytics.csvs import create_csv_response, format_dictlist, format_instances
+from instructor_analytics.csvs import create_csv_response, format_dictlist, format_instances, iter_dictlist_rows
 
 
 class TestAnalyticsCSVS(TestCase):
@@ -66,6 +66,12 @@ class TestAnalyticsFormatDictlist(TestCase):
         self.assertEqual(header, ideal_header)
         self.assertEqual(datarows, ideal_datarows)
 
+    def test_iter_dictlist_rows(self):
+        dicts = ({'label1': index, 'label2': -index} for index in range(3))
+        rows = iter_dictlist_rows(dicts, ['label2', 'label1'])
+        self.assertEqual(next(rows), [0, 0])
+        self.assertEqual(list(rows), [[-1, 1], [-2, 2]])
+
     def test_format_dictlist_empty(self):
         header, datarows = format_dictlist([], [])
         self.assertEqual(header, [])
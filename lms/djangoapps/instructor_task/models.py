@@ -17,10 +17,11 @@ import csv
 import json
 import hashlib
 import os.path
+from tempfile import TemporaryFile
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import models, transaction
 
 from openedx.core.storage import get_storage
@@ -178,9 +179,9 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Rows can be passed in as a generator, so that reports are
+    written out as they are computed, rather than holding the whole dataset
+    in memory.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -264,12 +265,42 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        `rows` can be any iterable of rows, such as a generator.  The rows
+        are written one at a time to a temporary file, which is then
+        stored, so they never need to be held in memory all at once.
+        """
+        with TemporaryFile() as output_file:
+            csvwriter = csv.writer(output_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_file.seek(0)
+            self.store(course_id, filename, File(output_file))
+
+    def store_concatenated_rows(self, course_id, filename, header_rows, part_filenames):
+        """
+        Given a course_id, filename, header rows and the filenames of CSV
+        files previously stored for the course with `store_rows`, write the
+        header rows followed by the contents of each of those files to the
+        storage backend as a single CSV file.  Missing files are skipped.
+        """
+        with TemporaryFile() as output_file:
+            csvwriter = csv.writer(output_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(header_rows))
+            for part_filename in part_filenames:
+                part_path = self.path_to(course_id, part_filename)
+                if not self.storage.exists(part_path):
+                    continue
+                with self.storage.open(part_path) as part_file:
+                    for chunk in part_file.chunks():
+                        output_file.write(chunk)
+            output_file.seek(0)
+            self.store(course_id, filename, File(output_file))
+
+    def delete(self, course_id, filename):
+        """
+        Delete the file named `filename` for a given course, if it exists.
         """
-        output_buffer = ContentFile('')
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        self.storage.delete(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
@@ -3,6 +3,8 @@ This module contains celery task functions for handling the management of subtas
 """
 from time import time
 import json
+import os
+import socket
 from uuid import uuid4
 import psutil
 from contextlib import contextmanager
@@ -21,6 +23,9 @@ TASK_LOG = logging.getLogger('edx.celery.task')
 
 # Lock expiration should be long enough to allow a subtask to complete.
 SUBTASK_LOCK_EXPIRE = 60 * 10  # Lock expires in 10 minutes
+# A lock whose owner hasn't refreshed it for this long may be taken over by a
+# redelivered subtask, since its owner is then assumed to have been lost.
+SUBTASK_LOCK_HEARTBEAT_TIMEOUT = 60 * 2
 # Number of times to retry if a subtask update encounters a lock on the InstructorTask.
 # (These are recursive retries, so don't make this number too large.)
 MAX_DATABASE_LOCK_RETRIES = 5
@@ -31,6 +36,11 @@ class DuplicateTaskException(Exception):
     pass
 
 
+class LockedSubtaskException(DuplicateTaskException):
+    """Exception indicating that a subtask is locked by another worker, which may still be running it."""
+    pass
+
+
 def _get_number_of_subtasks(total_num_items, items_per_task):
     """
     Determines number of subtasks that would be generated by _generate_items_for_subtask.
@@ -215,7 +225,7 @@ class SubtaskStatus(object):
         return unicode(repr(self))
 
 
-def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
+def initialize_subtask_info(entry, action_name, total_num, subtask_id_list, subtask_chunks=None):
     """
     Store initial subtask information to InstructorTask object.
 
@@ -244,6 +254,10 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
     Monitoring code should assume that if an InstructorTask has subtask information, that it should
     rely on the status stored in the InstructorTask object, rather than status stored in the
     corresponding AsyncResult.
+
+    If `subtask_chunks` is provided, it is a dict that maps each subtask's task_id to the
+    JSON-serializable chunk of items processed by that subtask.  It is stored in a 'chunks' key
+    of the "subtasks" field, so that the subtasks that have not completed can be requeued.
     """
     task_progress = {
         'action_name': action_name,
@@ -269,6 +283,8 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
         'failed': 0,
         'status': subtask_status
     }
+    if subtask_chunks is not None:
+        subtask_dict['chunks'] = subtask_chunks
     entry.subtasks = json.dumps(subtask_dict)
 
     # and save the entry immediately, before any subtasks actually start work:
@@ -354,7 +370,115 @@ def queue_subtasks_for_query(
     return progress
 
 
-def _acquire_subtask_lock(task_id):
+def queue_subtasks_for_chunks(entry, action_name, create_subtask_fcn, chunks, total_num_items):
+    """
+    Queues a subtask to execute each of the given chunks of "items".
+
+    Unlike queue_subtasks_for_query, the chunks are defined up front and are recorded in the
+    InstructorTask along with the subtask ids, so that a rerun of the parent task can use
+    requeue_incomplete_subtasks to resume from the subtasks that have already completed.
+
+    Arguments:
+        `entry` : the InstructorTask object for which subtasks are being queued.
+        `action_name` : a past-tense verb that can be used for constructing readable status messages.
+        `create_subtask_fcn` : a function of two arguments that constructs the desired kind of subtask object.
+            Arguments are the chunk to be processed by this subtask, and a SubtaskStatus
+            object reflecting initial status (and containing the subtask's id).
+        `chunks` : a list of JSON-serializable chunks, each of which defines the "items" that should
+            be processed by a single subtask.
+        `total_num_items` : total amount of items that will be put into subtasks
+
+    Returns:  the task progress as stored in the InstructorTask object.
+    """
+    subtask_chunks = {str(uuid4()): chunk for chunk in chunks}
+
+    TASK_LOG.info(
+        "Task %s: updating InstructorTask %s with subtask info for %s subtasks to process %s items.",
+        entry.task_id,
+        entry.id,
+        len(subtask_chunks),
+        total_num_items,
+    )
+    # Make sure this is committed to database before handing off subtasks to celery.
+    with outer_atomic():
+        progress = initialize_subtask_info(
+            entry, action_name, total_num_items, subtask_chunks.keys(), subtask_chunks=subtask_chunks
+        )
+
+    for subtask_id, chunk in subtask_chunks.iteritems():
+        new_subtask = create_subtask_fcn(chunk, SubtaskStatus.create(subtask_id))
+        new_subtask.apply_async()
+
+    return progress
+
+
+def requeue_incomplete_subtasks(entry, create_subtask_fcn):
+    """
+    Requeues the subtasks of the InstructorTask that have not yet completed.
+
+    The subtasks must have been queued by queue_subtasks_for_chunks.  Subtasks that are still
+    running are requeued as well, but the duplicates are rejected by check_subtask_is_valid.
+
+    Returns:  the number of subtasks that were requeued.
+    """
+    subtask_dict = json.loads(entry.subtasks)
+    num_requeued = 0
+    for subtask_id, chunk in subtask_dict['chunks'].iteritems():
+        subtask_status = SubtaskStatus.from_dict(subtask_dict['status'][subtask_id])
+        if subtask_status.state not in READY_STATES:
+            new_subtask = create_subtask_fcn(chunk, subtask_status)
+            new_subtask.apply_async()
+            num_requeued += 1
+
+    TASK_LOG.info("Task %s: requeued %s incomplete subtasks.", entry.task_id, num_requeued)
+    return num_requeued
+
+
+def _subtask_lock_key(task_id):
+    """
+    Returns the cache key of the lock of the specified task_id.
+    """
+    return "subtask-{}".format(task_id)
+
+
+def _new_subtask_lock_value():
+    """
+    Returns the value of a subtask lock owned by the current process, which
+    identifies the process and records the time of its latest heartbeat.
+    """
+    return {'hostname': socket.gethostname(), 'pid': os.getpid(), 'heartbeat': time()}
+
+
+def _owns_subtask_lock(lock_value):
+    """
+    Returns whether the given subtask lock value is owned by the current process.
+
+    Locks with values set by earlier versions of this code are treated as owned,
+    so that they can still be released.
+    """
+    if not isinstance(lock_value, dict):
+        return True
+    return lock_value['hostname'] == socket.gethostname() and lock_value['pid'] == os.getpid()
+
+
+def _is_subtask_lock_stale(lock_value):
+    """
+    Returns whether the owner of the given subtask lock value is known to be
+    lost: either it hasn't refreshed its lock for SUBTASK_LOCK_HEARTBEAT_TIMEOUT,
+    or it was a process of this host which no longer exists.
+    """
+    if not isinstance(lock_value, dict):
+        return False
+    if time() - lock_value['heartbeat'] > SUBTASK_LOCK_HEARTBEAT_TIMEOUT:
+        return True
+    return (
+        lock_value['hostname'] == socket.gethostname() and
+        lock_value['pid'] != os.getpid() and
+        not psutil.pid_exists(lock_value['pid'])
+    )
+
+
+def _acquire_subtask_lock(task_id, take_over_stale=False):
     """
     Mark the specified task_id as being in progress.
 
@@ -363,29 +487,59 @@ def _acquire_subtask_lock(task_id):
     loss of connection to the task broker.  Most of the time, such duplicate tasks are
     run sequentially, but they can overlap in processing as well.
 
+    If take_over_stale is True, a lock whose owner is known to be lost (see
+    _is_subtask_lock_stale) is taken over.
+
     Returns true if the task_id was not already locked; false if it was.
     """
     # cache.add fails if the key already exists
-    key = "subtask-{}".format(task_id)
-    succeeded = cache.add(key, 'true', SUBTASK_LOCK_EXPIRE)
-    if not succeeded:
-        TASK_LOG.warning("task_id '%s': already locked.  Contains value '%s'", task_id, cache.get(key))
-    return succeeded
+    key = _subtask_lock_key(task_id)
+    if cache.add(key, _new_subtask_lock_value(), SUBTASK_LOCK_EXPIRE):
+        return True
+
+    lock_value = cache.get(key)
+    if take_over_stale and _is_subtask_lock_stale(lock_value):
+        # Only one of several redelivered duplicates may take over the same stale lock.
+        taken_over = cache.add(key + '-takeover', 'true', SUBTASK_LOCK_HEARTBEAT_TIMEOUT)
+    else:
+        taken_over = False
+    if taken_over:
+        TASK_LOG.warning("task_id '%s': taking over stale lock.  Contains value '%s'", task_id, lock_value)
+        cache.set(key, _new_subtask_lock_value(), SUBTASK_LOCK_EXPIRE)
+        return True
+
+    TASK_LOG.warning("task_id '%s': already locked.  Contains value '%s'", task_id, lock_value)
+    return False
+
+
+def refresh_subtask_lock(task_id):
+    """
+    Records a heartbeat of the current process in the lock of the specified
+    task_id, if it still owns it, so that the lock isn't taken over as stale.
+
+    Subtasks which may run longer than SUBTASK_LOCK_HEARTBEAT_TIMEOUT call
+    this regularly while they run.
+    """
+    key = _subtask_lock_key(task_id)
+    if _owns_subtask_lock(cache.get(key)):
+        cache.set(key, _new_subtask_lock_value(), SUBTASK_LOCK_EXPIRE)
 
 
 def _release_subtask_lock(task_id):
     """
-    Unmark the specified task_id as being no longer in progress.
+    Unmark the specified task_id as being no longer in progress, unless its
+    lock has been taken over by another process.
 
     This is most important to permit a task to be retried.
     """
     # According to Celery task cookbook, "Memcache delete is very slow, but we have
     # to use it to take advantage of using add() for atomic locking."
-    key = "subtask-{}".format(task_id)
-    cache.delete(key)
+    key = _subtask_lock_key(task_id)
+    if _owns_subtask_lock(cache.get(key)):
+        cache.delete(key)
 
 
-def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
+def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status, redelivered=False):
     """
     Confirms that the current subtask is known to the InstructorTask and hasn't already been completed.
 
@@ -403,7 +557,13 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
     so that we can detect if another worker has started work but has not yet completed that work.
     The other worker is allowed to finish, and this raises an exception.
 
-    Raises a DuplicateTaskException exception if it's not a task that should be run.
+    If the subtask has been redelivered by the broker because the worker running it may have
+    been lost before acknowledging it (see `acks_late`), the lock of the other worker is taken
+    over if that worker is known to be lost, see _is_subtask_lock_stale.  The broker also
+    redelivers subtasks whose worker is still running them, so the lock is kept otherwise.
+
+    Raises a DuplicateTaskException exception if it's not a task that should be run, or more
+    specifically a LockedSubtaskException if another worker holds the lock of the subtask.
 
     If this succeeds, it requires that update_subtask_status() is called to release the lock on the
     task.
@@ -455,12 +615,12 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
     # Now we are ready to start working on this.  Try to lock it.
     # If it fails, then it means that another worker is already in the
     # middle of working on this.
-    if not _acquire_subtask_lock(current_task_id):
+    if not _acquire_subtask_lock(current_task_id, take_over_stale=redelivered):
         format_str = "Unexpected task_id '{}': already being executed - for subtask of instructor task '{}'"
         msg = format_str.format(current_task_id, entry)
         TASK_LOG.warning(msg)
         dog_stats_api.increment('instructor_task.subtask.duplicate.locked', tags=[entry.course_id])
-        raise DuplicateTaskException(msg)
+        raise LockedSubtaskException(msg)
 
 
 def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0):
@@ -474,9 +634,11 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
     The subtask lock acquired in the call to check_subtask_is_valid() is released here, only when
     the attempting of retries has concluded.
+
+    Returns True if this update completed the last of the InstructorTask's subtasks.
     """
     try:
-        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+        return _update_subtask_status(entry_id, current_task_id, new_subtask_status)
     except DatabaseError:
         # If we fail, try again recursively.
         retry_count += 1
@@ -484,7 +646,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
             TASK_LOG.info("Retrying to update status for subtask %s of instructor task %d with status %s:  retry %d",
                           current_task_id, entry_id, new_subtask_status, retry_count)
             dog_stats_api.increment('instructor_task.subtask.retry_after_failed_update')
-            update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
+            return update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
         else:
             TASK_LOG.info("Failed to update status after %d retries for subtask %s of instructor task %d with status %s",
                           retry_count, current_task_id, entry_id, new_subtask_status)
@@ -524,6 +686,11 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     information for each subtask.  At the moment, the value for each subtask (keyed by its task_id)
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
+
+    The status of a subtask which has already completed is not updated again, so
+    that a duplicate of the subtask doesn't get counted twice.
+
+    Returns True if the InstructorTask's status was changed to SUCCESS.
     """
     TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
                   current_task_id, entry_id, new_subtask_status)
@@ -539,6 +706,17 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
             TASK_LOG.warning(msg)
             raise ValueError(msg)
 
+        # Ignore the status of a subtask that has already completed, which
+        # would otherwise be counted twice: it is reported by a duplicate of
+        # the subtask, which lost its lock while it was running.
+        if SubtaskStatus.from_dict(subtask_status_info[current_task_id]).state in READY_STATES:
+            format_str = (
+                "Unexpected task_id '{}': already completed - ignoring status {} for subtask of instructor task '{}'"
+            )
+            TASK_LOG.warning(format_str.format(current_task_id, new_subtask_status, entry_id))
+            dog_stats_api.increment('instructor_task.subtask.duplicate.update', tags=[entry.course_id])
+            return False
+
         # Update status:
         subtask_status_info[current_task_id] = new_subtask_status.to_dict()
 
@@ -583,6 +761,7 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         entry.save()
         TASK_LOG.info("Task output updated to %s for subtask %s of instructor task %d",
                       entry.task_output, current_task_id, entry_id)
+        return num_remaining <= 0
     except Exception:
         TASK_LOG.exception("Unexpected error while updating InstructorTask.")
         dog_stats_api.increment('instructor_task.subtask.update_exception')
@@ -37,6 +37,7 @@ from lms.djangoapps.instructor_task.tasks_helper import (
     upload_problem_responses_csv,
     upload_grades_csv,
     upload_problem_grade_report,
+    generate_grade_report_chunk as _generate_grade_report_chunk,
     upload_students_csv,
     cohort_students_and_upload,
     upload_enrollment_report,
@@ -44,14 +45,43 @@ from lms.djangoapps.instructor_task.tasks_helper import (
     upload_exec_summary_report,
     upload_course_survey_report,
     generate_students_certificates,
+    generate_certificates_chunk as _generate_certificates_chunk,
     upload_proctored_exam_results_report,
     upload_ora2_data,
 )
+from lms.djangoapps.instructor_task.subtasks import LockedSubtaskException, SUBTASK_LOCK_HEARTBEAT_TIMEOUT
 
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
 
+def _is_redelivered(task_instance):
+    """
+    Returns whether the task currently executed by the given bound task was
+    redelivered by the broker after its worker was lost.
+    """
+    return bool((task_instance.request.delivery_info or {}).get('redelivered'))
+
+
+def _run_chunk_subtask(task_instance, subtask_fn, redelivered, *args):
+    """
+    Runs `subtask_fn` with the given args for the chunk subtask currently
+    executed by the given bound task.
+
+    A redelivered subtask may find its lock still held by the worker it was
+    first delivered to, which is either still running it or was lost without
+    releasing the lock.  Such a subtask is retried once the lock would have
+    gone stale, and takes over the lock if its owner has stopped refreshing it.
+    """
+    redelivered = redelivered or _is_redelivered(task_instance)
+    try:
+        return subtask_fn(*args, redelivered=redelivered)
+    except LockedSubtaskException as exc:
+        if not redelivered:
+            raise
+        raise task_instance.retry(kwargs={'redelivered': True}, countdown=SUBTASK_LOCK_HEARTBEAT_TIMEOUT, exc=exc)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def rescore_problem(entry_id, xmodule_instance_args):
     """Rescores a problem in a course, for all students or one specific student.
@@ -193,6 +223,20 @@ def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(bind=True, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY, acks_late=True)  # pylint: disable=not-callable
+def generate_grade_report_chunk(self, entry_id, report_name, chunk, subtask_status_dict, redelivered=False):
+    """
+    Grade one chunk of the students enrolled in a course for a grade report,
+    as a subtask of `calculate_grades_csv` or `calculate_problem_grade_report`.
+
+    The task is only acknowledged once it has finished, so that it is
+    redelivered if its worker is lost while grading the chunk.
+    """
+    return _run_chunk_subtask(
+        self, _generate_grade_report_chunk, redelivered, entry_id, report_name, chunk, subtask_status_dict,
+    )
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
@@ -281,6 +325,18 @@ def generate_certificates(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(bind=True, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY, acks_late=True)  # pylint: disable=not-callable
+def generate_certificates_chunk(self, entry_id, chunk, subtask_status_dict, redelivered=False):
+    """
+    Generate the certificates of one chunk of students, as a subtask of
+    `generate_certificates`.
+
+    The task is only acknowledged once it has finished, so that it is
+    redelivered if its worker is lost while generating the certificates.
+    """
+    return _run_chunk_subtask(self, _generate_certificates_chunk, redelivered, entry_id, chunk, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def cohort_students(entry_id, xmodule_instance_args):
     """
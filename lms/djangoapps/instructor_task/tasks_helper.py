@@ -42,23 +42,31 @@ from certificates.models import (
 from courseware.courses import get_course_by_id, get_problems_in_section
 from lms.djangoapps.grades.context import grading_context_for_course
 from lms.djangoapps.grades.new.course_grade import CourseGradeFactory
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache
-from courseware.models import StudentModule
+from courseware.model_data import DjangoKeyValueStore, FieldDataCache, MultiUserFieldDataCache
+from courseware.models import StudentModule, chunks
 from courseware.module_render import get_module_for_descriptor_internal
 from edxmako.shortcuts import render_to_string
 from instructor_analytics.basic import (
-    enrolled_students_features,
     get_proctored_exam_results,
+    iter_enrolled_students_features,
+    iter_problem_responses,
     list_may_enroll,
-    list_problem_responses
 )
-from instructor_analytics.csvs import format_dictlist
+from instructor_analytics.csvs import format_dictlist, iter_dictlist_rows
 from shoppingcart.models import (
     PaidCourseRegistration, CourseRegCodeItem, InvoiceTransaction,
     Invoice, CouponRedemption, RegistrationCodeRedemption, CourseRegistrationCode
 )
 from openassessment.data import OraAggregateData
 from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_chunks,
+    refresh_subtask_lock,
+    requeue_incomplete_subtasks,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -82,6 +90,11 @@ FILTERED_OUT_ROLES = ['staff', 'instructor', 'finance_admin', 'sales_admin']
 UPDATE_STATUS_SUCCEEDED = 'succeeded'
 UPDATE_STATUS_FAILED = 'failed'
 UPDATE_STATUS_SKIPPED = 'skipped'
+# number of student modules whose user state perform_module_state_update prefetches at once.
+# Each module's state is written back after the modules before it in its chunk have been
+# updated, so this is kept small to limit how stale the state read for a module can get
+# (and thus the chance of overwriting the effects of a learner's concurrent submission).
+MODULE_STATE_UPDATE_CHUNK_SIZE = 20
 
 # define value to be used in grading events
 GRADES_RESCORE_EVENT_TYPE = 'edx.grades.problem.rescored'
@@ -316,9 +329,11 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     argument, which is the query being filtered, and returns the filtered version of the query.
 
     The `update_fcn` is called on each StudentModule that passes the resulting filtering.
-    It is passed four arguments:  the module_descriptor for the module pointed to by the
-    module_state_key, the particular StudentModule to update, the xmodule_instance_args, and the task_input
-    being passed through.  If the value returned by the update function evaluates to a boolean True,
+    It is passed five arguments:  the module_descriptor for the module pointed to by the
+    module_state_key, the particular StudentModule to update, the xmodule_instance_args, the task_input
+    being passed through, and a MultiUserFieldDataCache holding the user state of the students of the
+    current chunk of StudentModules, which is only read from the database if the update_fcn requests
+    a student's FieldDataCache from it.  If the value returned by the update function evaluates to a boolean True,
     the update is successful; False indicates the update on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
@@ -382,23 +397,33 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[unicode(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
-            update_status = update_fcn(module_descriptor, module_to_update, task_input)
-            if update_status == UPDATE_STATUS_SUCCEEDED:
-                # If the update_fcn returns true, then it performed some kind of work.
-                # Logging of failures is left to the update_fcn itself.
-                task_progress.succeeded += 1
-            elif update_status == UPDATE_STATUS_FAILED:
-                task_progress.failed += 1
-            elif update_status == UPDATE_STATUS_SKIPPED:
-                task_progress.skipped += 1
-            else:
-                raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+    for modules_chunk in chunks(modules_to_update.select_related('student'), MODULE_STATE_UPDATE_CHUNK_SIZE):
+        # Prefetch the user state of all students in the chunk for all of the problems at
+        # once, instead of separately for each student.
+        field_data_caches = MultiUserFieldDataCache.cache_for_descriptors_descendents(
+            course_id,
+            [module_to_update.student for module_to_update in modules_chunk],
+            problems.values(),
+        )
+        for module_to_update in modules_chunk:
+            task_progress.attempted += 1
+            module_descriptor = problems[unicode(module_to_update.module_state_key)]
+            # There is no try here:  if there's an error, we let it throw, and the task will
+            # be marked as FAILED, with a stack trace.
+            with dog_stats_api.timer(
+                'instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]
+            ):
+                update_status = update_fcn(module_descriptor, module_to_update, task_input, field_data_caches)
+                if update_status == UPDATE_STATUS_SUCCEEDED:
+                    # If the update_fcn returns true, then it performed some kind of work.
+                    # Logging of failures is left to the update_fcn itself.
+                    task_progress.succeeded += 1
+                elif update_status == UPDATE_STATUS_FAILED:
+                    task_progress.failed += 1
+                elif update_status == UPDATE_STATUS_SKIPPED:
+                    task_progress.skipped += 1
+                else:
+                    raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
 
     return task_progress.update_task_state()
 
@@ -430,16 +455,22 @@ def _get_track_function_for_task(student, xmodule_instance_args=None, source_pag
 
 
 def _get_module_instance_for_task(course_id, student, module_descriptor, xmodule_instance_args=None,
-                                  grade_bucket_type=None, course=None):
+                                  grade_bucket_type=None, course=None, field_data_caches=None):
     """
     Fetches a StudentModule instance for a given `course_id`, `student` object, and `module_descriptor`.
 
     `xmodule_instance_args` is used to provide information for creating a track function and an XQueue callback.
     These are passed, along with `grade_bucket_type`, to get_module_for_descriptor_internal, which sidesteps
     the need for a Request object when instantiating an xmodule instance.
+
+    If `field_data_caches` is not None, it is the MultiUserFieldDataCache from which the student's
+    prefetched FieldDataCache is taken, rather than loading a new one.
     """
     # reconstitute the problem's corresponding XModule:
-    field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course_id, student, module_descriptor)
+    if field_data_caches is not None:
+        field_data_cache = field_data_caches.field_data_cache_for_user(student)
+    else:
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course_id, student, module_descriptor)
     student_data = KvsFieldData(DjangoKeyValueStore(field_data_cache))
 
     # get request-related tracking information from args passthrough, and supplement with task-specific
@@ -476,11 +507,15 @@ def _get_module_instance_for_task(course_id, student, module_descriptor, xmodule
 
 
 @outer_atomic
-def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
+def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input,
+                                 field_data_caches=None):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
     performs rescoring on the student's problem submission.
 
+    If `field_data_caches` is not None, the student's state is taken from that
+    MultiUserFieldDataCache rather than read separately.
+
     Throws exceptions if the rescoring is fatal and should be aborted if in a loop.
     In particular, raises UpdateProblemModuleStateError if module fails to instantiate,
     or if the module doesn't support rescoring.
@@ -504,7 +539,8 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
             module_descriptor,
             xmodule_instance_args,
             grade_bucket_type='rescore',
-            course=course
+            course=course,
+            field_data_caches=field_data_caches,
         )
 
         if instance is None:
@@ -597,7 +633,8 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
 
 
 @outer_atomic
-def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input):
+def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input,
+                                _field_data_caches=None):
     """
     Resets problem attempts to zero for specified `student_module`.
 
@@ -624,7 +661,8 @@ def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, stude
 
 
 @outer_atomic
-def delete_problem_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input):
+def delete_problem_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input,
+                                _field_data_caches=None):
     """
     Delete the StudentModule entry.
 
@@ -649,6 +687,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            or any other iterable of rows, such as a generator, in which
+            case the rows are written out as they are generated.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
     """
@@ -665,6 +705,31 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
 
 
+def upload_csv_chunks_to_report_store(header_row, chunk_filenames, csv_name, course_id, timestamp,
+                                      config_name='GRADES_DOWNLOAD'):
+    """
+    Upload the CSV files previously stored for chunks of a report as a single
+    CSV using ReportStore.
+
+    Arguments:
+        header_row: the header row of the resulting CSV
+        chunk_filenames: the filenames of the CSV files of the chunks, in
+            the order they appear in the resulting CSV
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
+    """
+    report_store = ReportStore.from_config(config_name)
+    filename = u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+    # Replace the CSV uploaded by an earlier merge of the same chunks, if any.
+    report_store.delete(course_id, filename)
+    report_store.store_concatenated_rows(course_id, filename, [header_row], chunk_filenames)
+    tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
+
+
 def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at, config_name='FINANCIAL_REPORTS'):
     """
     Upload Executive Summary Html file using ReportStore.
@@ -691,7 +756,7 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
@@ -700,130 +765,143 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
     that are visible in ReportStore will be complete ones.
 
-    As we start to add more CSV downloads, it will probably be worthwhile to
-    make a more general CSVDoc class instead of building out the rows like we
-    do here.
+    Courses with more enrolled students than
+    `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK` are graded in parallel
+    subtasks, see `_upload_grade_report`.
     """
-    start_time = time()
-    start_date = datetime.now(UTC)
-    status_interval = 100
-    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    total_enrolled_students = enrolled_students.count()
-    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
-
-    fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
-    task_info_string = fmt.format(
-        task_id=_xmodule_instance_args.get('task_id') if _xmodule_instance_args is not None else None,
-        entry_id=_entry_id,
-        course_id=course_id,
-        task_input=_task_input
+    return _upload_grade_report(
+        CourseGradeReport, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name
     )
-    TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    course = get_course_by_id(course_id)
-    course_is_cohorted = is_course_cohorted(course.id)
-    teams_enabled = course.teams_enabled
-    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
-    teams_header = ['Team Name'] if teams_enabled else []
 
-    experiment_partitions = get_split_user_partitions(course.user_partitions)
-    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
+class GradeReport(object):
+    """
+    Base class for the grade reports of a course, which build the CSV rows
+    of any batch of the course's enrolled students.
+    """
+    csv_name = None
+    error_csv_name = None
+
+    # Whether the report is uploaded even if no students were successfully graded.
+    store_empty_report = True
 
-    certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
+    def __init__(self, course_id):
+        self.course_id = course_id
+        self.course = get_course_by_id(course_id)
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
-    current_step = {'step': 'Calculating Grades'}
+    def iter_rows(self, students):
+        """
+        Grades the given students, and yields a (row, error_row) tuple for
+        each of them, where exactly one of the two rows is None depending on
+        whether the student was successfully graded.
+        """
+        for student, course_grade, err_msg in CourseGradeFactory().iter(self.course, students):
+            if course_grade:
+                yield self.student_row(student, course_grade), None
+            else:
+                # An empty gradeset means we failed to grade a student.
+                yield None, self.error_row(student, err_msg)
 
-    student_counter = 0
-    TASK_LOG.info(
-        u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
-        task_info_string,
-        action_name,
-        current_step,
-        total_enrolled_students,
-    )
+    def header_row(self):
+        """
+        Returns the header row of the report.
+        """
+        raise NotImplementedError
 
-    graded_assignments = _graded_assignments(course_id)
-    grade_header = []
-    for assignment_info in graded_assignments.itervalues():
-        if assignment_info['use_subsection_headers']:
-            grade_header.extend(assignment_info['subsection_headers'].itervalues())
-        grade_header.append(assignment_info['average_header'])
-
-    rows.append(
-        ["Student ID", "Email", "Username", "Grade"] +
-        grade_header +
-        cohorts_header +
-        group_configs_header +
-        teams_header +
-        ['Enrollment Track', 'Verification Status'] +
-        certificate_info_header
-    )
+    def error_header_row(self):
+        """
+        Returns the header row of the report's errors.
+        """
+        raise NotImplementedError
 
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
+    def student_row(self, student, course_grade):
+        """
+        Returns the row of a successfully graded student.
+        """
+        raise NotImplementedError
 
-        # Now add a log entry after each student is graded to get a sense
-        # of the task's progress
-        student_counter += 1
-        TASK_LOG.info(
-            u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
-            task_info_string,
-            action_name,
-            current_step,
-            student_counter,
-            total_enrolled_students
+    def error_row(self, student, err_msg):
+        """
+        Returns the error row of a student that could not be graded.
+        """
+        raise NotImplementedError
+
+
+class CourseGradeReport(GradeReport):
+    """
+    Builds the rows of the grades CSV file of a course.
+    """
+    csv_name = 'grade_report'
+    error_csv_name = 'grade_report_err'
+
+    def __init__(self, course_id):
+        super(CourseGradeReport, self).__init__(course_id)
+        self.course_is_cohorted = is_course_cohorted(course_id)
+        self.teams_enabled = self.course.teams_enabled
+        self.experiment_partitions = get_split_user_partitions(self.course.user_partitions)
+        self.whitelisted_user_ids = set(
+            entry.user_id
+            for entry in CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
         )
+        self.graded_assignments = _graded_assignments(course_id)
 
-        if not course_grade:
-            # An empty gradeset means we failed to grade a student.
-            task_progress.failed += 1
-            err_rows.append([student.id, student.username, err_msg])
-            continue
+    def header_row(self):
+        grade_header = []
+        for assignment_info in self.graded_assignments.itervalues():
+            if assignment_info['use_subsection_headers']:
+                grade_header.extend(assignment_info['subsection_headers'].itervalues())
+            grade_header.append(assignment_info['average_header'])
+
+        return (
+            ["Student ID", "Email", "Username", "Grade"] +
+            grade_header +
+            (['Cohort Name'] if self.course_is_cohorted else []) +
+            [u'Experiment Group ({})'.format(partition.name) for partition in self.experiment_partitions] +
+            (['Team Name'] if self.teams_enabled else []) +
+            ['Enrollment Track', 'Verification Status'] +
+            ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
+        )
 
-        # We were able to successfully grade this student for this course.
-        task_progress.succeeded += 1
+    def error_header_row(self):
+        return ["id", "username", "error_msg"]
 
+    def error_row(self, student, err_msg):
+        return [student.id, student.username, err_msg]
+
+    def student_row(self, student, course_grade):
         cohorts_group_name = []
-        if course_is_cohorted:
-            group = get_cohort(student, course_id, assign=False)
+        if self.course_is_cohorted:
+            group = get_cohort(student, self.course_id, assign=False)
             cohorts_group_name.append(group.name if group else '')
 
         group_configs_group_names = []
-        for partition in experiment_partitions:
-            group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
+        for partition in self.experiment_partitions:
+            group = LmsPartitionService(student, self.course_id).get_group(partition, assign=False)
             group_configs_group_names.append(group.name if group else '')
 
         team_name = []
-        if teams_enabled:
+        if self.teams_enabled:
             try:
-                membership = CourseTeamMembership.objects.get(user=student, team__course_id=course_id)
+                membership = CourseTeamMembership.objects.get(user=student, team__course_id=self.course_id)
                 team_name.append(membership.team.name)
             except CourseTeamMembership.DoesNotExist:
                 team_name.append('')
 
-        enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_id)[0]
+        enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, self.course_id)[0]
         verification_status = SoftwareSecurePhotoVerification.verification_status_for_user(
             student,
-            course_id,
+            self.course_id,
             enrollment_mode
         )
         certificate_info = certificate_info_for_user(
             student,
-            course_id,
+            self.course_id,
             course_grade.letter_grade,
-            student.id in whitelisted_user_ids
+            student.id in self.whitelisted_user_ids
         )
 
         grade_results = []
-        for assignment_type, assignment_info in graded_assignments.iteritems():
+        for assignment_type, assignment_info in self.graded_assignments.iteritems():
             for subsection_location in assignment_info['subsection_headers']:
                 try:
                     subsection_grade = course_grade.graded_subsections_by_format[assignment_type][subsection_location]
@@ -842,38 +920,368 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
         grade_results = list(chain.from_iterable(grade_results))
 
-        rows.append(
+        return (
             [student.id, student.email, student.username, course_grade.percent] +
             grade_results + cohorts_group_name + group_configs_group_names + team_name +
             [enrollment_mode] + [verification_status] + certificate_info
         )
 
+
+class ProblemGradeReport(GradeReport):
+    """
+    Builds the rows of the problem grades CSV file of a course.
+    """
+    csv_name = 'problem_grade_report'
+    error_csv_name = 'problem_grade_report_err'
+    store_empty_report = False
+
+    # This struct encapsulates both the display names of each static item in the
+    # header row as values as well as the django User field names of those items
+    # as the keys.  It is structured in this way to keep the values related.
+    STUDENT_FIELDS = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
+
+    def __init__(self, course_id):
+        super(ProblemGradeReport, self).__init__(course_id)
+        self.graded_scorable_blocks = _graded_scorable_blocks_to_header(course_id)
+
+    def header_row(self):
+        return (
+            list(self.STUDENT_FIELDS.values()) + ['Grade'] +
+            list(chain.from_iterable(self.graded_scorable_blocks.values()))
+        )
+
+    def error_header_row(self):
+        return list(self.STUDENT_FIELDS.values()) + ['error_msg']
+
+    def error_row(self, student, err_msg):
+        student_fields = [getattr(student, field_name) for field_name in self.STUDENT_FIELDS]
+        return student_fields + [err_msg or u'Unknown error']
+
+    def student_row(self, student, course_grade):
+        earned_possible_values = []
+        for block_location in self.graded_scorable_blocks:
+            try:
+                problem_score = course_grade.locations_to_scores[block_location]
+            except KeyError:
+                earned_possible_values.append([u'Not Available', u'Not Available'])
+            else:
+                if problem_score.attempted:
+                    earned_possible_values.append([problem_score.earned, problem_score.possible])
+                else:
+                    earned_possible_values.append([u'Not Attempted', problem_score.possible])
+
+        student_fields = [getattr(student, field_name) for field_name in self.STUDENT_FIELDS]
+        return student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values))
+
+
+# Grade reports that can be generated in parallel subtasks, by csv_name.
+GRADE_REPORTS = {report_class.csv_name: report_class for report_class in (CourseGradeReport, ProblemGradeReport)}
+
+
+def _upload_grade_report(report_class, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    """
+    Generates a grade report of the given `report_class` for all students that
+    are enrolled in the course, and stores it using a `ReportStore`.
+
+    If there are more enrolled students than
+    `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK`, the students are split
+    into chunks of consecutive student ids, and each chunk is graded by a
+    separate `generate_grade_report_chunk` subtask, see
+    `_queue_grade_report_subtasks`.  Otherwise, the students are graded in
+    this task.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+    status_interval = 100
+    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
+    total_enrolled_students = enrolled_students.count()
+
+    fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
+    task_info_string = fmt.format(
+        task_id=_xmodule_instance_args.get('task_id') if _xmodule_instance_args is not None else None,
+        entry_id=_entry_id,
+        course_id=course_id,
+        task_input=_task_input
+    )
+    TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
+
+    if _entry_id is not None and total_enrolled_students > settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK:
+        TASK_LOG.info(
+            u'%s, Task type: %s, Grading total students %s in subtasks',
+            task_info_string,
+            action_name,
+            total_enrolled_students,
+        )
+        return _queue_grade_report_subtasks(report_class, _entry_id, enrolled_students, action_name)
+
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
+    report = report_class(course_id)
+
+    # Only the error rows are kept in memory; the rows of the students that
+    # are successfully graded are written out to the report store as they
+    # are computed.
+    err_rows = [report.error_header_row()]
+    current_step = {'step': 'Calculating Grades'}
+    TASK_LOG.info(
+        u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
+        task_info_string,
+        action_name,
+        current_step,
+        total_enrolled_students,
+    )
+
+    def _graded_rows():
+        """
+        Grades all enrolled students, and yields the rows of those that are
+        successfully graded.
+        """
+        for row, err_row in report.iter_rows(enrolled_students.iterator()):
+            # Periodically update task status (this is a cache write)
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+                TASK_LOG.info(
+                    u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
+                    task_info_string,
+                    action_name,
+                    current_step,
+                    task_progress.attempted,
+                    total_enrolled_students
+                )
+            task_progress.attempted += 1
+
+            if err_row is not None:
+                task_progress.failed += 1
+                err_rows.append(err_row)
+            else:
+                task_progress.succeeded += 1
+                yield row
+
+    # Grade students up to the first one that is successfully graded, to
+    # find out whether there is anything to upload.
+    rows = _graded_rows()
+    first_row = next(rows, None)
+    if first_row is not None:
+        upload_csv_to_report_store(
+            chain([report.header_row(), first_row], rows), report.csv_name, course_id, start_date
+        )
+    elif report.store_empty_report:
+        upload_csv_to_report_store([report.header_row()], report.csv_name, course_id, start_date)
+
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
         task_info_string,
         action_name,
         current_step,
-        student_counter,
+        task_progress.attempted,
         total_enrolled_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
     current_step = {'step': 'Uploading CSVs'}
     task_progress.update_task_state(extra_meta=current_step)
     TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
-
     # If there are any error rows (don't count the header), write them out as well
     if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
+        upload_csv_to_report_store(err_rows, report.error_csv_name, course_id, start_date)
 
     # One last update before we close out...
     TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _queue_grade_report_subtasks(report_class, entry_id, enrolled_students, action_name):
+    """
+    Queues a `generate_grade_report_chunk` subtask for each chunk of
+    `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK` enrolled students.
+
+    The chunks are recorded in the InstructorTask, and each subtask records
+    its chunk as completed once it has stored its rows in the report store.
+    If this task is run again for the same InstructorTask (for instance when
+    it is redelivered after its worker was lost), it resumes from these
+    checkpoints by requeuing only the chunks that have not completed, unless
+    the report has already been completed.
+    """
+    # Imported here, since the celery tasks module imports this module.
+    from lms.djangoapps.instructor_task.tasks import generate_grade_report_chunk
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    def _create_grade_report_subtask(chunk, initial_subtask_status):
+        """Creates a subtask to grade the students of a given chunk."""
+        return generate_grade_report_chunk.subtask(
+            (entry_id, report_class.csv_name, chunk, initial_subtask_status.to_dict()),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    if entry.task_state == SUCCESS:
+        # The report has already been merged, and its chunks deleted.
+        TASK_LOG.warning(u"Task %s: grade report of InstructorTask %s already completed", entry.task_id, entry_id)
+        return json.loads(entry.task_output)
+
+    if len(entry.subtasks) > 0:
+        TASK_LOG.warning(u"Task %s: resuming grade report subtasks of InstructorTask %s", entry.task_id, entry_id)
+        if requeue_incomplete_subtasks(entry, _create_grade_report_subtask) == 0:
+            # All the chunks completed before the report was merged.
+            _merge_grade_report_chunks(entry, report_class(entry.course_id))
+            entry.task_state = SUCCESS
+            entry.save_now()
+        return json.loads(entry.task_output)
+
+    student_ids = list(enrolled_students.order_by('id').values_list('id', flat=True))
+    students_per_task = settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK
+    chunks = []
+    for chunk_index, offset in enumerate(xrange(0, len(student_ids), students_per_task)):
+        chunk_student_ids = student_ids[offset:offset + students_per_task]
+        chunks.append([chunk_index, chunk_student_ids[0], chunk_student_ids[-1]])
+
+    return queue_subtasks_for_chunks(entry, action_name, _create_grade_report_subtask, chunks, len(student_ids))
+
+
+def generate_grade_report_chunk(entry_id, report_name, chunk, subtask_status_dict, redelivered=False):
+    """
+    Grades the students of one chunk of a grade report, and stores their rows
+    as partial CSV files in the report store.
+
+    Inputs are:
+      * `entry_id`: id of the InstructorTask object to which progress should be recorded.
+      * `report_name`: the `csv_name` of the report, see GRADE_REPORTS.
+      * `chunk`: a list of the chunk's index and of the first and last ids of
+        the enrolled students to grade.
+      * `subtask_status_dict` : dict containing values representing current status.
+      * `redelivered`: whether the subtask was redelivered after its worker was lost.
+
+    The subtask that completes the last chunk of the report merges the
+    partial CSV files into the final report.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    chunk_index, first_student_id, last_student_id = chunk
+
+    # Reject duplicates of this subtask, and subtasks of chunks that have
+    # already been completed.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status, redelivered=redelivered)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    report = GRADE_REPORTS[report_name](course_id)
+    students = list(
+        CourseEnrollment.objects.users_enrolled_in(course_id).filter(
+            id__gte=first_student_id,
+            id__lte=last_student_id,
+        ).order_by('id')
+    )
+    TASK_LOG.info(
+        u"Grade report subtask %s of InstructorTask %s: grading %s students of chunk %s",
+        current_task_id,
+        entry_id,
+        len(students),
+        chunk_index,
+    )
+
+    try:
+        rows = []
+        err_rows = []
+        for row, err_row in report.iter_rows(students):
+            # Keep the lock of this subtask from being taken over by a redelivered duplicate.
+            refresh_subtask_lock(current_task_id)
+            if err_row is not None:
+                err_rows.append(err_row)
+            else:
+                rows.append(row)
+
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        for filename, part_rows in (
+                (_grade_report_chunk_filename(entry_id, report.csv_name, chunk_index), rows),
+                (_grade_report_chunk_filename(entry_id, report.error_csv_name, chunk_index), err_rows),
+        ):
+            # Replace any partial file stored by an earlier, interrupted attempt.
+            report_store.delete(course_id, filename)
+            report_store.store_rows(course_id, filename, part_rows)
+    except Exception as exc:
+        TASK_LOG.exception(
+            u"Grade report subtask %s of InstructorTask %s: failed unexpectedly!", current_task_id, entry_id
+        )
+        # Report every student of the chunk as an error, so that the merged
+        # report does not silently leave them out.
+        _store_failed_grade_report_chunk(entry_id, report, chunk_index, students, exc.message)
+        subtask_status.increment(failed=len(students), state=FAILURE)
+        if update_subtask_status(entry_id, current_task_id, subtask_status):
+            _merge_grade_report_chunks(InstructorTask.objects.get(pk=entry_id), report)
+        raise
+
+    subtask_status.increment(succeeded=len(rows), failed=len(err_rows), state=SUCCESS)
+    if update_subtask_status(entry_id, current_task_id, subtask_status):
+        _merge_grade_report_chunks(InstructorTask.objects.get(pk=entry_id), report)
+    return subtask_status.to_dict()
+
+
+def _store_failed_grade_report_chunk(entry_id, report, chunk_index, students, err_msg):
+    """
+    Replaces the partial CSV files of a chunk of a grade report that failed
+    unexpectedly with an error row for each of its students.
+    """
+    course_id = report.course_id
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    try:
+        report_store.delete(course_id, _grade_report_chunk_filename(entry_id, report.csv_name, chunk_index))
+        err_filename = _grade_report_chunk_filename(entry_id, report.error_csv_name, chunk_index)
+        report_store.delete(course_id, err_filename)
+        report_store.store_rows(
+            course_id,
+            err_filename,
+            (report.error_row(student, err_msg or u'Grade report chunk failed') for student in students),
+        )
+    except Exception:  # pylint: disable=broad-except
+        TASK_LOG.exception(
+            u"InstructorTask %s: failed to store the error rows of grade report chunk %s", entry_id, chunk_index
+        )
+
+
+def _grade_report_chunk_filename(entry_id, csv_name, chunk_index):
+    """
+    Returns the filename of the partial CSV file of a grade report chunk.
+
+    The partial files are stored in a subdirectory of the course's directory
+    in the report store, so they are not listed along with the reports.
+    """
+    return u"{csv_name}_chunks/{entry_id}/{chunk_index:05d}.csv".format(
+        csv_name=csv_name,
+        entry_id=entry_id,
+        chunk_index=chunk_index,
+    )
+
+
+def _merge_grade_report_chunks(entry, report):
+    """
+    Merges the partial CSV files of the chunks of a grade report into the
+    final report, and deletes them.
+    """
+    subtask_dict = json.loads(entry.subtasks)
+    task_progress = json.loads(entry.task_output)
+    chunk_indices = sorted(chunk[0] for chunk in subtask_dict['chunks'].itervalues())
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+
+    TASK_LOG.info(
+        u"Task %s: merging %s chunks of %s for InstructorTask %s",
+        entry.task_id,
+        len(chunk_indices),
+        report.csv_name,
+        entry.id,
+    )
+    for csv_name, header_row, num_rows in (
+            (report.csv_name, report.header_row(), task_progress['succeeded']),
+            (report.error_csv_name, report.error_header_row(), task_progress['failed']),
+    ):
+        filenames = [
+            _grade_report_chunk_filename(entry.id, csv_name, chunk_index) for chunk_index in chunk_indices
+        ]
+        if num_rows > 0 or (csv_name == report.csv_name and report.store_empty_report):
+            upload_csv_chunks_to_report_store(header_row, filenames, csv_name, entry.course_id, entry.created)
+        for filename in filenames:
+            report_store.delete(entry.course_id, filename)
+
+
 def _graded_assignments(course_key):
     """
     Returns an OrderedDict that maps an assignment type to a dict of subsection-headers and average-header.
@@ -945,88 +1353,40 @@ def upload_problem_responses_csv(_xmodule_instance_args, _entry_id, course_id, t
 
     # Compute result table and format it
     problem_location = task_input.get('problem_location')
-    student_data = list_problem_responses(course_id, problem_location)
+    student_data = iter_problem_responses(course_id, problem_location)
     features = ['username', 'state']
-    header, rows = format_dictlist(student_data, features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+    rows = _counted_rows(task_progress, iter_dictlist_rows(student_data, features))
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the upload
-    problem_location = re.sub(r'[:/]', '_', problem_location)
-    csv_name = 'student_state_from_{}'.format(problem_location)
-    upload_csv_to_report_store(rows, csv_name, course_id, start_date)
+    # Perform the upload, which computes the rows as they are written out
+    csv_name = 'student_state_from_{}'.format(re.sub(r'[:/]', '_', problem_location))
+    upload_csv_to_report_store(chain([features], rows), csv_name, course_id, start_date)
 
+    task_progress.skipped = task_progress.total - task_progress.attempted
     return task_progress.update_task_state(extra_meta=current_step)
 
 
-def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+def _counted_rows(task_progress, rows):
     """
-    Generate a CSV containing all students' problem grades within a given
-    `course_id`.
+    Yields the given rows, counting each of them as attempted and succeeded
+    in `task_progress`.
     """
-    start_time = time()
-    start_date = datetime.now(UTC)
-    status_interval = 100
-    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
-
-    # This struct encapsulates both the display names of each static item in the
-    # header row as values as well as the django User field names of those items
-    # as the keys.  It is structured in this way to keep the values related.
-    header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
-
-    graded_scorable_blocks = _graded_scorable_blocks_to_header(course_id)
-
-    # Just generate the static fields for now.
-    rows = [list(header_row.values()) + ['Grade'] + list(chain.from_iterable(graded_scorable_blocks.values()))]
-    error_rows = [list(header_row.values()) + ['error_msg']]
-    current_step = {'step': 'Calculating Grades'}
-
-    course = get_course_by_id(course_id)
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
-        student_fields = [getattr(student, field_name) for field_name in header_row]
+    for row in rows:
         task_progress.attempted += 1
-
-        if not course_grade:
-            # There was an error grading this student.
-            if not err_msg:
-                err_msg = u'Unknown error'
-            error_rows.append(student_fields + [err_msg])
-            task_progress.failed += 1
-            continue
-
-        earned_possible_values = []
-        for block_location in graded_scorable_blocks:
-            try:
-                problem_score = course_grade.locations_to_scores[block_location]
-            except KeyError:
-                earned_possible_values.append([u'Not Available', u'Not Available'])
-            else:
-                if problem_score.attempted:
-                    earned_possible_values.append([problem_score.earned, problem_score.possible])
-                else:
-                    earned_possible_values.append([u'Not Attempted', problem_score.possible])
-
-        rows.append(student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values)))
-
         task_progress.succeeded += 1
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
+        yield row
 
-    # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-    # If there are any error rows, write them out as well
-    if len(error_rows) > 1:
-        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
 
-    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    """
+    Generate a CSV containing all students' problem grades within a given
+    `course_id`.
+    """
+    return _upload_grade_report(
+        ProblemGradeReport, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name
+    )
 
 
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -1045,20 +1405,16 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
 
     # compute the student features table and format it
     query_features = task_input
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+    student_data = iter_enrolled_students_features(course_id, query_features)
+    rows = _counted_rows(task_progress, iter_dictlist_rows(student_data, query_features))
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the upload
-    upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
+    # Perform the upload, which computes the rows as they are written out
+    upload_csv_to_report_store(chain([query_features], rows), 'student_profile_info', course_id, start_date)
 
+    task_progress.skipped = task_progress.total - task_progress.attempted
     return task_progress.update_task_state(extra_meta=current_step)
 
 
@@ -1083,13 +1439,11 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
-    header = None
+    # Loop over all our students, writing out their rows to the CSV file as
+    # they are computed
     current_step = {'step': 'Gathering Profile Information'}
     enrollment_report_provider = PaidCourseEnrollmentReportProvider()
     total_students = students_in_course.count()
-    student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, generating detailed enrollment report for total students: %s',
         task_info_string,
@@ -1098,86 +1452,92 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
         total_students
     )
 
-    for student in students_in_course:
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
+    def _enrollment_report_rows():
+        """
+        Yields the header row and the rows of the report, one student at a time.
+        """
+        header = None
+        for student in students_in_course.iterator():
+            # Periodically update task status (this is a cache write)
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+            task_progress.attempted += 1
 
-        # Now add a log entry after certain intervals to get a hint that task is in progress
-        student_counter += 1
-        if student_counter % 100 == 0:
-            TASK_LOG.info(
-                u'%s, Task type: %s, Current step: %s, gathering enrollment profile for students in progress: %s/%s',
-                task_info_string,
-                action_name,
-                current_step,
-                student_counter,
-                total_students
-            )
+            # Now add a log entry after certain intervals to get a hint that task is in progress
+            if task_progress.attempted % 100 == 0:
+                TASK_LOG.info(
+                    u'%s, Task type: %s, Current step: %s, '
+                    u'gathering enrollment profile for students in progress: %s/%s',
+                    task_info_string,
+                    action_name,
+                    current_step,
+                    task_progress.attempted,
+                    total_students
+                )
 
-        user_data = enrollment_report_provider.get_user_profile(student.id)
-        course_enrollment_data = enrollment_report_provider.get_enrollment_info(student, course_id)
-        payment_data = enrollment_report_provider.get_payment_info(student, course_id)
-
-        # display name map for the column headers
-        enrollment_report_headers = {
-            'User ID': _('User ID'),
-            'Username': _('Username'),
-            'Full Name': _('Full Name'),
-            'First Name': _('First Name'),
-            'Last Name': _('Last Name'),
-            'Company Name': _('Company Name'),
-            'Title': _('Title'),
-            'Language': _('Language'),
-            'Year of Birth': _('Year of Birth'),
-            'Gender': _('Gender'),
-            'Level of Education': _('Level of Education'),
-            'Mailing Address': _('Mailing Address'),
-            'Goals': _('Goals'),
-            'City': _('City'),
-            'Country': _('Country'),
-            'Enrollment Date': _('Enrollment Date'),
-            'Currently Enrolled': _('Currently Enrolled'),
-            'Enrollment Source': _('Enrollment Source'),
-            'Manual (Un)Enrollment Reason': _('Manual (Un)Enrollment Reason'),
-            'Enrollment Role': _('Enrollment Role'),
-            'List Price': _('List Price'),
-            'Payment Amount': _('Payment Amount'),
-            'Coupon Codes Used': _('Coupon Codes Used'),
-            'Registration Code Used': _('Registration Code Used'),
-            'Payment Status': _('Payment Status'),
-            'Transaction Reference Number': _('Transaction Reference Number')
-        }
+            user_data = enrollment_report_provider.get_user_profile(student.id)
+            course_enrollment_data = enrollment_report_provider.get_enrollment_info(student, course_id)
+            payment_data = enrollment_report_provider.get_payment_info(student, course_id)
+
+            # display name map for the column headers
+            enrollment_report_headers = {
+                'User ID': _('User ID'),
+                'Username': _('Username'),
+                'Full Name': _('Full Name'),
+                'First Name': _('First Name'),
+                'Last Name': _('Last Name'),
+                'Company Name': _('Company Name'),
+                'Title': _('Title'),
+                'Language': _('Language'),
+                'Year of Birth': _('Year of Birth'),
+                'Gender': _('Gender'),
+                'Level of Education': _('Level of Education'),
+                'Mailing Address': _('Mailing Address'),
+                'Goals': _('Goals'),
+                'City': _('City'),
+                'Country': _('Country'),
+                'Enrollment Date': _('Enrollment Date'),
+                'Currently Enrolled': _('Currently Enrolled'),
+                'Enrollment Source': _('Enrollment Source'),
+                'Manual (Un)Enrollment Reason': _('Manual (Un)Enrollment Reason'),
+                'Enrollment Role': _('Enrollment Role'),
+                'List Price': _('List Price'),
+                'Payment Amount': _('Payment Amount'),
+                'Coupon Codes Used': _('Coupon Codes Used'),
+                'Registration Code Used': _('Registration Code Used'),
+                'Payment Status': _('Payment Status'),
+                'Transaction Reference Number': _('Transaction Reference Number')
+            }
 
-        if not header:
-            header = user_data.keys() + course_enrollment_data.keys() + payment_data.keys()
-            display_headers = []
-            for header_element in header:
-                # translate header into a localizable display string
-                display_headers.append(enrollment_report_headers.get(header_element, header_element))
-            rows.append(display_headers)
+            if not header:
+                header = user_data.keys() + course_enrollment_data.keys() + payment_data.keys()
+                display_headers = []
+                for header_element in header:
+                    # translate header into a localizable display string
+                    display_headers.append(enrollment_report_headers.get(header_element, header_element))
+                yield display_headers
 
-        rows.append(user_data.values() + course_enrollment_data.values() + payment_data.values())
-        task_progress.succeeded += 1
+            task_progress.succeeded += 1
+            yield user_data.values() + course_enrollment_data.values() + payment_data.values()
+
+    upload_csv_to_report_store(
+        _enrollment_report_rows(), 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS'
+    )
 
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Detailed enrollment report generated for students: %s/%s',
         task_info_string,
         action_name,
         current_step,
-        student_counter,
+        task_progress.attempted,
         total_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
+    # By this point, we've uploaded all the rows of the CSV file.
     current_step = {'step': 'Uploading CSVs'}
     task_progress.update_task_state(extra_meta=current_step)
     TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS')
-
     # One last update before we close out...
     TASK_LOG.info(u'%s, Task type: %s, Finalizing detailed enrollment task', task_info_string, action_name)
     return task_progress.update_task_state(extra_meta=current_step)
@@ -1455,6 +1815,13 @@ def generate_students_certificates(
     """
     For a given `course_id`, generate certificates for only students present in 'students' key in task_input
     json column, otherwise generate certificates for all enrolled students.
+
+    If more students require certificates than
+    `settings.CERTIFICATE_GENERATION_STUDENTS_PER_TASK`, they are split into
+    chunks, and the certificates of each chunk are generated by a separate
+    `generate_certificates_chunk` subtask, see
+    `_queue_certificate_generation_subtasks`.  Otherwise, the certificates are
+    generated in this task.
     """
     start_time = time()
     students_to_generate_certs_for = CourseEnrollment.objects.users_enrolled_in(course_id)
@@ -1503,19 +1870,23 @@ def generate_students_certificates(
 
     task_progress.skipped = task_progress.total - len(students_require_certs)
 
+    if _entry_id is not None and len(students_require_certs) > settings.CERTIFICATE_GENERATION_STUDENTS_PER_TASK:
+        TASK_LOG.info(
+            u"InstructorTask %s: generating certificates of %s students in subtasks",
+            _entry_id,
+            len(students_require_certs),
+        )
+        return _queue_certificate_generation_subtasks(
+            _entry_id, students_require_certs, task_progress.total, task_progress.skipped, action_name
+        )
+
     current_step = {'step': 'Generating Certificates'}
     task_progress.update_task_state(extra_meta=current_step)
 
     course = modulestore().get_course(course_id, depth=0)
     # Generate certificate for each student
-    for student in students_require_certs:
+    for status in _generate_certificates(course, students_require_certs):
         task_progress.attempted += 1
-        status = generate_user_certificates(
-            student,
-            course_id,
-            course=course
-        )
-
         if CertificateStatuses.is_passing_status(status):
             task_progress.succeeded += 1
         else:
@@ -1524,6 +1895,129 @@ def generate_students_certificates(
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _generate_certificates(course, students):
+    """
+    Generates the certificates of the given students in the course, and
+    yields the status of each generated certificate.
+
+    The students are graded in batches by `CourseGradeFactory.iter`, and
+    their existing certificates are read with a single query, rather than
+    one student at a time by `generate_user_certificates`.
+    """
+    GeneratedCertificate.prefetch_certificates_for_course(course.id, students)
+    for student, course_grade, __ in CourseGradeFactory().iter(course, students):
+        # If the student couldn't be graded, course_grade is None, and
+        # generate_user_certificates grades the student itself.
+        yield generate_user_certificates(student, course.id, course=course, course_grade=course_grade)
+
+
+def _queue_certificate_generation_subtasks(entry_id, students, total_num_students, num_skipped, action_name):
+    """
+    Queues a `generate_certificates_chunk` subtask for each chunk of
+    `settings.CERTIFICATE_GENERATION_STUDENTS_PER_TASK` of the given students.
+
+    The ids of the students of each chunk are recorded in the InstructorTask,
+    since the students that require certificates can't be selected again
+    once their certificates have been invalidated for regeneration.  If this
+    task is run again for the same InstructorTask, it resumes by requeuing
+    only the chunks that have not completed.
+
+    The students that were skipped because they don't require a certificate
+    are counted by the first chunk, so that the progress aggregated from the
+    subtasks matches that of a task that generates the certificates itself.
+    """
+    # Imported here, since the celery tasks module imports this module.
+    from lms.djangoapps.instructor_task.tasks import generate_certificates_chunk
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    def _create_certificates_subtask(chunk, initial_subtask_status):
+        """Creates a subtask to generate the certificates of a given chunk."""
+        return generate_certificates_chunk.subtask(
+            (entry_id, chunk, initial_subtask_status.to_dict()),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    if len(entry.subtasks) > 0:
+        TASK_LOG.warning(
+            u"Task %s: resuming certificate generation subtasks of InstructorTask %s", entry.task_id, entry_id
+        )
+        if requeue_incomplete_subtasks(entry, _create_certificates_subtask) == 0:
+            entry.task_state = SUCCESS
+            entry.save_now()
+        return json.loads(entry.task_output)
+
+    student_ids = sorted(student.id for student in students)
+    students_per_task = settings.CERTIFICATE_GENERATION_STUDENTS_PER_TASK
+    chunks = []
+    for chunk_index, offset in enumerate(xrange(0, len(student_ids), students_per_task)):
+        chunk_num_skipped = num_skipped if chunk_index == 0 else 0
+        chunks.append([chunk_index, student_ids[offset:offset + students_per_task], chunk_num_skipped])
+
+    return queue_subtasks_for_chunks(
+        entry, action_name, _create_certificates_subtask, chunks, total_num_students
+    )
+
+
+def generate_certificates_chunk(entry_id, chunk, subtask_status_dict, redelivered=False):
+    """
+    Generates the certificates of the students of one chunk of a certificate
+    generation task.
+
+    Inputs are:
+      * `entry_id`: id of the InstructorTask object to which progress should be recorded.
+      * `chunk`: a list of the chunk's index, of the ids of its students, and
+        of the number of skipped students it accounts for.
+      * `subtask_status_dict` : dict containing values representing current status.
+      * `redelivered`: whether the subtask was redelivered after its worker was lost.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    chunk_index, student_ids, num_skipped = chunk
+
+    # Reject duplicates of this subtask, and subtasks of chunks that have
+    # already been completed.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status, redelivered=redelivered)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course = modulestore().get_course(entry.course_id, depth=0)
+    students = list(User.objects.filter(id__in=student_ids).order_by('id'))
+    TASK_LOG.info(
+        u"Certificate generation subtask %s of InstructorTask %s: generating certificates of %s students of chunk %s",
+        current_task_id,
+        entry_id,
+        len(students),
+        chunk_index,
+    )
+
+    succeeded = failed = 0
+    try:
+        for status in _generate_certificates(course, students):
+            # Keep the lock of this subtask from being taken over by a redelivered duplicate.
+            refresh_subtask_lock(current_task_id)
+            if CertificateStatuses.is_passing_status(status):
+                succeeded += 1
+            else:
+                failed += 1
+    except Exception:
+        TASK_LOG.exception(
+            u"Certificate generation subtask %s of InstructorTask %s: failed unexpectedly!", current_task_id, entry_id
+        )
+        subtask_status.increment(
+            succeeded=succeeded,
+            failed=len(students) - succeeded,
+            skipped=num_skipped,
+            state=FAILURE,
+        )
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(succeeded=succeeded, failed=failed, skipped=num_skipped, state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     Within a given course, cohort students in bulk, then upload the results
@@ -4,6 +4,7 @@ Tests for instructor_task/models.py.
 import copy
 from cStringIO import StringIO
 import time
+import zlib
 
 import boto
 from django.conf import settings
@@ -16,6 +17,9 @@ from lms.djangoapps.instructor_task.tests.test_base import TestReportMixin
 from opaque_keys.edx.locator import CourseLocator
 
 
+GZIP_MAGIC = '\x1f\x8b'
+
+
 class ReportStoreTestMixin(object):
     """
     Mixin for report store tests.
@@ -49,6 +53,42 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def _read(self, report_store, filename):
+        """
+        Returns the (uncompressed) contents of the given file in the
+        report store.
+        """
+        with report_store.storage.open(report_store.path_to(self.course_id, filename)) as report_file:
+            contents = report_file.read()
+        if contents.startswith(GZIP_MAGIC):
+            # S3 report storage compresses the files it stores.
+            contents = zlib.decompress(contents, 16 + zlib.MAX_WBITS)
+        return contents
+
+    def test_store_rows_from_generator(self):
+        """
+        Test that ReportStore.store_rows() writes out rows from a generator.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'rows.csv', ([index, u'row\xf1'] for index in range(3)))
+        self.assertEqual(self._read(report_store, 'rows.csv'), '0,row\xc3\xb1\r\n1,row\xc3\xb1\r\n2,row\xc3\xb1\r\n')
+
+    def test_store_concatenated_rows(self):
+        """
+        Test that ReportStore.store_concatenated_rows() writes out the header
+        rows followed by the contents of the existing files, in order.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'parts/2.csv', [['c', 3]])
+        report_store.store_rows(self.course_id, 'parts/1.csv', [['a', 1], ['b', 2]])
+        report_store.store_concatenated_rows(
+            self.course_id, 'report.csv', [['name', 'value']], ['parts/1.csv', 'parts/missing.csv', 'parts/2.csv']
+        )
+        self.assertEqual(self._read(report_store, 'report.csv'), 'name,value\r\na,1\r\nb,2\r\nc,3\r\n')
+
+        report_store.delete(self.course_id, 'parts/1.csv')
+        self.assertFalse(report_store.storage.exists(report_store.path_to(self.course_id, 'parts/1.csv')))
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -19,6 +19,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from opaque_keys.edx.locations import i4xEncoder
 
 from courseware.models import StudentModule
+from courseware.user_state_client import DjangoXBlockUserStateClient
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 
@@ -326,6 +327,36 @@ class TestRescoreInstructorTask(TestInstructorTasks):
         self.assertEquals(output.get('action_name'), 'rescored')
         self.assertGreater(output.get('duration_ms'), 0)
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.MODULE_STATE_UPDATE_CHUNK_SIZE', 4)
+    def test_rescoring_prefetches_user_state(self):
+        """
+        Confirm that the state of the students is read at once for each
+        chunk of students, rather than separately for each student.
+        """
+        input_state = json.dumps({'done': True})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        task_entry = self._create_input_entry()
+        with patch(
+            'courseware.model_data.DjangoXBlockUserStateClient.get_many_for_users',
+            autospec=True,
+            side_effect=DjangoXBlockUserStateClient.get_many_for_users,
+        ) as mock_get_many_for_users:
+            with patch(
+                'courseware.model_data.DjangoXBlockUserStateClient.get_many',
+                autospec=True,
+                side_effect=DjangoXBlockUserStateClient.get_many,
+            ) as mock_get_many:
+                self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+        self.assertEquals(
+            [len(call[0][1]) for call in mock_get_many_for_users.call_args_list],
+            [4, 4, 2],
+        )
+        self.assertFalse(mock_get_many.called)
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        output = json.loads(entry.task_output)
+        self.assertEquals(output.get('attempted'), num_students)
+
 
 @attr(shard=3)
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
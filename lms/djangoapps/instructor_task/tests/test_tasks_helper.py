@@ -8,17 +8,22 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 from datetime import datetime
+from uuid import uuid4
+from time import time
 import urllib
 
+from celery.states import SUCCESS
 import ddt
 from freezegun import freeze_time
 from mock import Mock, patch, MagicMock
 from nose.plugins.attrib import attr
 import tempfile
 import unicodecsv
+from django.core.cache.backends.locmem import LocMemCache
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
 
@@ -27,6 +32,7 @@ from certificates.models import CertificateStatuses, GeneratedCertificate
 from certificates.tests.factories import GeneratedCertificateFactory, CertificateWhitelistFactory
 from course_modes.models import CourseMode
 from courseware.tests.factories import InstructorFactory
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     TestReportMixin,
@@ -48,10 +54,17 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from lms.djangoapps.instructor_task.models import ReportStore
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SUBTASK_LOCK_HEARTBEAT_TIMEOUT,
+    SubtaskStatus,
+    check_subtask_is_valid,
+)
 from survey.models import SurveyForm, SurveyAnswer
 from lms.djangoapps.instructor_task.tasks_helper import (
     cohort_students_and_upload,
+    CourseGradeReport,
+    generate_grade_report_chunk,
     upload_problem_responses_csv,
     upload_grades_csv,
     upload_problem_grade_report,
@@ -60,6 +73,7 @@ from lms.djangoapps.instructor_task.tasks_helper import (
     upload_enrollment_report,
     upload_exec_summary_report,
     upload_course_survey_report,
+    generate_certificates_chunk,
     generate_students_certificates,
     upload_ora2_data,
     UPDATE_STATUS_FAILED,
@@ -349,6 +363,152 @@ class TestTeamGradeReport(InstructorGradeReportTestCase):
         self._verify_cell_data_for_user(self.student2.username, self.course.id, 'Team Name', team2.name)
 
 
+@attr(shard=3)
+@override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2)
+class TestGradeReportSubtasks(InstructorGradeReportTestCase):
+    """
+    Tests that grade reports of large courses are generated in chunks by subtasks.
+    """
+    def setUp(self):
+        super(TestGradeReportSubtasks, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+            for index in range(5)
+        ]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='',
+            task_type='grade_course',
+        )
+
+    def _upload_grades_csv(self):
+        """
+        Runs the grade report task for the test's InstructorTask, and returns
+        the updated InstructorTask.
+        """
+        with patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task'):
+            upload_grades_csv(None, self.entry.id, self.course.id, None, 'graded')
+        return InstructorTask.objects.get(pk=self.entry.id)
+
+    def _verify_grade_report(self, entry):
+        """
+        Verifies that the grade report was merged from all the chunks.
+        """
+        self.assertEquals(entry.task_state, SUCCESS)
+        self.assertEquals(json.loads(entry.subtasks)['total'], 3)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0, 'total': 5},
+            json.loads(entry.task_output),
+        )
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEquals(len(links), 1)
+        self.assertIn('grade_report', links[0][0])
+        self.verify_rows_in_csv(
+            [{'Username': student.username, 'Grade': '0.0'} for student in self.students],
+            ignore_other_columns=True,
+        )
+
+    def test_grade_report_in_chunks(self):
+        self._verify_grade_report(self._upload_grades_csv())
+
+    def test_resume_grade_report(self):
+        def grade_first_chunk_only(entry_id, report_name, chunk, subtask_status_dict, redelivered=False):
+            """Simulates the loss of the workers of all chunks but the first."""
+            if chunk[0] == 0:
+                generate_grade_report_chunk(entry_id, report_name, chunk, subtask_status_dict, redelivered)
+
+        with patch('lms.djangoapps.instructor_task.tasks._generate_grade_report_chunk') as mock_chunk:
+            mock_chunk.side_effect = grade_first_chunk_only
+            entry = self._upload_grades_csv()
+        self.assertNotEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset({'attempted': 2, 'succeeded': 2}, json.loads(entry.task_output))
+
+        with patch(
+            'lms.djangoapps.instructor_task.tasks._generate_grade_report_chunk',
+            wraps=generate_grade_report_chunk,
+        ) as mock_chunk:
+            entry = self._upload_grades_csv()
+        self.assertEquals(sorted(call[0][2][0] for call in mock_chunk.call_args_list), [1, 2])
+        self._verify_grade_report(entry)
+
+    def test_completed_grade_report_not_resumed(self):
+        self._verify_grade_report(self._upload_grades_csv())
+        with patch('lms.djangoapps.instructor_task.tasks_helper._merge_grade_report_chunks') as mock_merge:
+            entry = self._upload_grades_csv()
+        self.assertFalse(mock_merge.called)
+        self._verify_grade_report(entry)
+
+    @patch('lms.djangoapps.instructor_task.subtasks.cache', LocMemCache('instructor_task_subtasks_test', {}))
+    def test_redelivered_chunk(self):
+        def lose_second_chunk(entry_id, report_name, chunk, subtask_status_dict, redelivered=False):
+            """Simulates the loss of the worker of the second chunk once it has locked its subtask."""
+            if chunk[0] == 1:
+                subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+                check_subtask_is_valid(entry_id, subtask_status.task_id, subtask_status)
+            else:
+                generate_grade_report_chunk(entry_id, report_name, chunk, subtask_status_dict, redelivered)
+
+        with patch('lms.djangoapps.instructor_task.tasks._generate_grade_report_chunk') as mock_chunk:
+            mock_chunk.side_effect = lose_second_chunk
+            entry = self._upload_grades_csv()
+        self.assertNotEqual(entry.task_state, SUCCESS)
+
+        # The lock of the lost worker rejects the chunk, even when it is
+        # redelivered, as long as the lock could still be refreshed by its owner.
+        for redelivered in (False, True):
+            with patch('lms.djangoapps.instructor_task.tasks._is_redelivered', return_value=redelivered):
+                entry = self._upload_grades_csv()
+            self.assertNotEqual(entry.task_state, SUCCESS)
+
+        # Once the lock is stale, a redelivered chunk takes it over.
+        stale_time = time() + SUBTASK_LOCK_HEARTBEAT_TIMEOUT + 1
+        with patch('lms.djangoapps.instructor_task.subtasks.time', return_value=stale_time):
+            with patch('lms.djangoapps.instructor_task.tasks._is_redelivered', return_value=False):
+                entry = self._upload_grades_csv()
+            self.assertNotEqual(entry.task_state, SUCCESS)
+
+            with patch('lms.djangoapps.instructor_task.tasks._is_redelivered', return_value=True):
+                entry = self._upload_grades_csv()
+        self._verify_grade_report(entry)
+
+    def test_failed_chunk_reported_as_errors(self):
+        original_iter_rows = CourseGradeReport.iter_rows
+
+        def fail_second_chunk(report, students):
+            """Simulates an unexpected failure of the second chunk."""
+            if self.students[2] in students:
+                raise Exception('Chunk failure')
+            return original_iter_rows(report, students)
+
+        with patch.object(CourseGradeReport, 'iter_rows', autospec=True, side_effect=fail_second_chunk):
+            entry = self._upload_grades_csv()
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 3, 'failed': 2, 'total': 5},
+            json.loads(entry.task_output),
+        )
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEquals(len(report_store.links_for(self.course.id)), 2)
+        self.verify_rows_in_csv(
+            [
+                {'id': unicode(student.id), 'username': student.username, 'error_msg': 'Chunk failure'}
+                for student in self.students[2:4]
+            ],
+        )
+        self.verify_rows_in_csv(
+            [
+                {'Username': student.username, 'Grade': '0.0'}
+                for student in self.students[:2] + self.students[4:]
+            ],
+            file_index=1,
+            ignore_other_columns=True,
+        )
+
+
 class TestProblemResponsesReport(TestReportMixin, InstructorTaskCourseTestCase):
     """
     Tests that generation of CSV files listing student answers to a
@@ -361,12 +521,12 @@ class TestProblemResponsesReport(TestReportMixin, InstructorTaskCourseTestCase):
     def test_success(self):
         task_input = {'problem_location': ''}
         with patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task'):
-            with patch('lms.djangoapps.instructor_task.tasks_helper.list_problem_responses') as patched_data_source:
-                patched_data_source.return_value = [
+            with patch('lms.djangoapps.instructor_task.tasks_helper.iter_problem_responses') as patched_data_source:
+                patched_data_source.return_value = iter([
                     {'username': 'user0', 'state': u'state0'},
                     {'username': 'user1', 'state': u'state1'},
                     {'username': 'user2', 'state': u'state2'},
-                ]
+                ])
                 result = upload_problem_responses_csv(None, None, self.course.id, task_input, 'calculated')
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         links = report_store.links_for(self.course.id)
@@ -1773,7 +1933,7 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
             'failed': 3,
             'skipped': 2
         }
-        with self.assertNumQueries(166):
+        with self.assertNumQueries(160):
             self.assertCertificatesGenerated(task_input, expected_results)
 
         expected_results = {
@@ -2257,6 +2417,98 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
 
         self.assertCertificatesGenerated(task_input, expected_results)
 
+    @override_settings(CERTIFICATE_GENERATION_STUDENTS_PER_TASK=3)
+    def test_certificate_generation_in_subtasks(self):
+        """
+        Verify that the certificates of many students are generated in chunks by subtasks.
+        """
+        students = self._create_students(10)
+
+        # mark 2 students to have certificates generated already
+        for student in students[:2]:
+            GeneratedCertificateFactory.create(
+                user=student,
+                course_id=self.course.id,
+                status=CertificateStatuses.downloadable,
+                mode='honor'
+            )
+
+        # white-list 5 students
+        for student in students[2:7]:
+            CertificateWhitelistFactory.create(user=student, course_id=self.course.id, whitelist=True)
+
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='',
+            task_type='generate_certificates',
+        )
+        with patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task'):
+            with patch('capa.xqueue_interface.XQueueInterface.send_to_queue') as mock_queue:
+                mock_queue.return_value = (0, "Successfully queued")
+                generate_students_certificates(
+                    None, entry.id, self.course.id, {'student_set': None}, 'certificates generated'
+                )
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEquals(entry.task_state, SUCCESS)
+        self.assertEquals(json.loads(entry.subtasks)['total'], 3)
+        self.assertDictContainsSubset(
+            {'total': 10, 'attempted': 8, 'succeeded': 5, 'failed': 3, 'skipped': 2},
+            json.loads(entry.task_output),
+        )
+        self.assertEquals(
+            GeneratedCertificate.objects.filter(
+                course_id=self.course.id, status=CertificateStatuses.generating
+            ).count(),
+            5
+        )
+
+    @override_settings(CERTIFICATE_GENERATION_STUDENTS_PER_TASK=3)
+    @patch('lms.djangoapps.instructor_task.subtasks.cache', LocMemCache('instructor_task_subtasks_test', {}))
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task', Mock())
+    def test_redelivered_certificate_generation_chunk(self):
+        """
+        Verify that a redelivered chunk is only rejected because of the lock of
+        its lost worker until that lock is stale.
+        """
+        self._create_students(4)
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='',
+            task_type='generate_certificates',
+        )
+
+        def lose_second_chunk(entry_id, chunk, subtask_status_dict, redelivered=False):
+            """Simulates the loss of the worker of the second chunk once it has locked its subtask."""
+            if chunk[0] == 1:
+                subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+                check_subtask_is_valid(entry_id, subtask_status.task_id, subtask_status)
+            else:
+                generate_certificates_chunk(entry_id, chunk, subtask_status_dict, redelivered)
+
+        now = time()
+        stale_time = now + SUBTASK_LOCK_HEARTBEAT_TIMEOUT + 1
+        for chunk_side_effect, redelivered, current_time in (
+                (lose_second_chunk, False, now),
+                (generate_certificates_chunk, True, now),
+                (generate_certificates_chunk, True, stale_time),
+        ):
+            with patch('lms.djangoapps.instructor_task.subtasks.time', return_value=current_time):
+                with patch('capa.xqueue_interface.XQueueInterface.send_to_queue') as mock_queue:
+                    mock_queue.return_value = (0, "Successfully queued")
+                    with patch('lms.djangoapps.instructor_task.tasks._generate_certificates_chunk') as mock_chunk:
+                        mock_chunk.side_effect = chunk_side_effect
+                        with patch('lms.djangoapps.instructor_task.tasks._is_redelivered', return_value=redelivered):
+                            generate_students_certificates(
+                                None, entry.id, self.course.id, {'student_set': None}, 'certificates generated'
+                            )
+            entry = InstructorTask.objects.get(pk=entry.id)
+            self.assertEquals(entry.task_state == SUCCESS, current_time == stale_time)
+
+        self.assertDictContainsSubset({'total': 4, 'attempted': 4}, json.loads(entry.task_output))
+
     def assertCertificatesGenerated(self, task_input, expected_results):
         """
         Generate certificates for the given task_input and compare with expected_results.
@@ -60,6 +60,13 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Number of connections to the comments service kept open by each process
+COMMENTS_SERVICE_POOL_SIZE = 10
+# Number of times a request to the comments service is retried when connecting fails
+COMMENTS_SERVICE_MAX_RETRIES = 1
+# Number of calls to the comments service made concurrently to serve a discussion API request
+DISCUSSION_API_MAX_CONCURRENT_REQUESTS = 4
+
 LMS_ROOT_URL = "http://localhost:8000"
 
 # Features
@@ -723,6 +730,20 @@ XBLOCK_SELECT_FUNCTION = prefer_xmodules
 # Paths to wrapper methods which should be applied to every XBlock's FieldData.
 XBLOCK_FIELD_DATA_WRAPPERS = ()
 
+# Local on-disk cache of course assets too large to be cached in the
+# "course_assets" cache, so that they need not be read from the contentstore
+# for each request.  The least recently used assets are evicted to keep the
+# cache under MAX_SIZE bytes.  The disk cache is disabled if DIRECTORY is None.
+COURSE_ASSETS_DISK_CACHE = {
+    'DIRECTORY': None,
+    'MAX_SIZE': 2 * 1024 * 1024 * 1024,
+}
+
+# In-process cache of the most recently used course structures of the Split
+# modulestore, consulted before the "course_structure_cache" cache.  It holds
+# up to this many bytes of (pickled) structures per process; 0 disables it.
+COURSE_STRUCTURE_MEMORY_CACHE_SIZE = 128 * 1024 * 1024
+
 ############# ModuleStore Configuration ##########
 
 MODULESTORE_BRANCH = 'published-only'
@@ -1871,6 +1892,11 @@ BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 # Queue to use for updating persistent grades
 RECALCULATE_GRADES_ROUTING_KEY = LOW_PRIORITY_QUEUE
 
+# Number of seconds for which the newest score change of each user and problem
+# is remembered, so that the grade recalculations queued for earlier changes
+# of the same score within this window are skipped.
+RECALCULATE_GRADES_COALESCING_WINDOW = 60 * 60
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2412,6 +2438,15 @@ BADGR_TIMEOUT = 10
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Grade reports of courses with more enrolled students than this are split
+# into subtasks that each grade this many students, and run in parallel.
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = 1000
+
+# Certificate generation tasks for more students than this are split into
+# subtasks that each generate the certificates of this many students, and run
+# in parallel.
+CERTIFICATE_GENERATION_STUDENTS_PER_TASK = 1000
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
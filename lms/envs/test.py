@@ -60,6 +60,10 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Make the discussion API's calls to the comments service in the test's thread and
+# database transaction, in the order they are made.
+DISCUSSION_API_MAX_CONCURRENT_REQUESTS = 1
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_SHOPPING_CART'] = True
@@ -230,6 +234,9 @@ CACHES = {
     },
 }
 
+# Don't cache course structures across tests
+COURSE_STRUCTURE_MEMORY_CACHE_SIZE = 0
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
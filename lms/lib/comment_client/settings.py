@@ -6,3 +6,8 @@ else:
     SERVICE_HOST = 'http://localhost:4567'
 
 PREFIX = SERVICE_HOST + '/api/v1'
+
+# Size of the pool of connections to the comments service, per process
+POOL_SIZE = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 10)
+# Number of retries of a request whose connection to the comments service fails
+MAX_RETRIES = getattr(settings, 'COMMENTS_SERVICE_MAX_RETRIES', 1)
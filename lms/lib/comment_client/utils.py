@@ -1,13 +1,19 @@
 """" Common utilities for comment client wrapper """
 from contextlib import contextmanager
+from cookielib import DefaultCookiePolicy
 import dogstats_wrapper as dog_stats_api
 import logging
+import os
 import requests
+import threading
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 from time import time
 from uuid import uuid4
 from django.utils.translation import get_language
 
+from . import settings as cc_settings
+
 log = logging.getLogger(__name__)
 
 
@@ -51,6 +57,48 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+class CommentsServiceSession(requests.Session):
+    """
+    A requests session which keeps a pool of connections to the comments
+    service open, so that they are reused by subsequent requests.
+
+    The session is shared by the requests made on behalf of all users, so it
+    keeps none of the cookies set by the comments service.
+    """
+
+    def __init__(self, pool_size=None, max_retries=None):
+        super(CommentsServiceSession, self).__init__()
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_maxsize=cc_settings.POOL_SIZE if pool_size is None else pool_size,
+            max_retries=cc_settings.MAX_RETRIES if max_retries is None else max_retries,
+        )
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the CommentsServiceSession shared by the requests made to the
+    comments service in this process.
+
+    Connections can't be shared with a forked process, so a process forked
+    after the session was created creates its own session.
+    """
+    global _session, _session_pid  # pylint: disable=global-statement
+    if _session_pid != os.getpid():
+        with _session_lock:
+            if _session_pid != os.getpid():
+                _session = CommentsServiceSession()
+                _session_pid = os.getpid()
+    return _session
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
     # To avoid dependency conflict
@@ -83,7 +131,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = get_session().request(
             method,
             url,
             data=data,
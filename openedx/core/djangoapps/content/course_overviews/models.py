@@ -274,6 +274,33 @@ class CourseOverview(TimeStampedModel):
 
         return course_overview or cls.load_from_module_store(course_id)
 
+    @classmethod
+    def get_from_ids_if_exists(cls, course_ids):
+        """
+        Load the CourseOverviews of the given course IDs which are in the
+        database and up to date, in a single query.
+
+        Unlike get_from_id, this doesn't create missing or outdated
+        CourseOverviews; they are simply left out of the result.
+
+        Arguments:
+            course_ids (iterable[CourseKey]): the IDs of the course overviews
+                to be loaded.
+
+        Returns:
+            dict[CourseKey, CourseOverview]: the loaded course overviews, by
+                course ID.
+        """
+        course_overviews = cls.objects.select_related('image_set').filter(
+            id__in=course_ids,
+            version__gte=cls.VERSION,
+        )
+        for course_overview in course_overviews:
+            # As in get_from_id, regenerate the thumbnail images if they're missing.
+            if not hasattr(course_overview, 'image_set'):
+                CourseOverviewImageSet.create_for_course(course_overview)
+        return {course_overview.id: course_overview for course_overview in course_overviews}
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
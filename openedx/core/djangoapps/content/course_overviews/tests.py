@@ -455,6 +455,17 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             set(select_course_ids),
         )
 
+    def test_get_from_ids_if_exists(self):
+        course_ids = [CourseFactory.create().id for __ in range(3)]
+        # Only the first two courses have an overview, and the second one is outdated.
+        outdated_overview = [CourseOverview.get_from_id(course_id) for course_id in course_ids[:2]][1]
+        outdated_overview.version = CourseOverview.VERSION - 1
+        outdated_overview.save()
+
+        course_overviews = CourseOverview.get_from_ids_if_exists(course_ids)
+        self.assertEqual(course_overviews.keys(), [course_ids[0]])
+        self.assertEqual(course_overviews[course_ids[0]].id, course_ids[0])
+
     def test_get_all_courses(self):
         course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
         self.assertEqual(
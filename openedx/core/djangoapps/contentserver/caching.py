@@ -1,10 +1,22 @@
 """
 Helper functions for caching course assets.
+
+Small assets are cached whole in the "course_assets" cache.  Assets too
+large for that cache can be cached as files in a local directory, which is
+kept under a maximum total size by evicting the least recently used files.
 """
+import hashlib
+import logging
+import os
+import tempfile
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContentStream
+
+log = logging.getLogger(__name__)
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -13,6 +25,11 @@ try:
 except InvalidCacheBackendError:
     pass
 
+# Only assets smaller than this are cached whole in CONTENT_CACHE.  This is the
+# default item size limit of memcached, and also keeps us from buffering too much
+# in memory when we're serving an actual request.
+MAX_CACHED_CONTENT_SIZE = 1048576
+
 
 def set_cached_content(content):
     """
@@ -47,3 +64,117 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+
+
+def _disk_cache_config():
+    """
+    Returns the directory and the maximum total size in bytes of the local disk
+    cache of course assets, or (None, None) if the disk cache is not enabled.
+    """
+    config = getattr(settings, 'COURSE_ASSETS_DISK_CACHE', None) or {}
+    directory = config.get('DIRECTORY')
+    if not directory:
+        return None, None
+    return directory, config.get('MAX_SIZE', 0)
+
+
+def _disk_cache_path(directory, content):
+    """
+    Returns the path of the file caching the given content in the disk cache.
+
+    The content digest is part of the file name, so that a changed asset is
+    never served from a file cached for a previous version of it.
+    """
+    key = u'{}:{}:{}'.format(content.location, content.content_digest, content.last_modified_at)
+    return os.path.join(directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def _open_disk_cached_content(path, content):
+    """
+    Returns a StaticContentStream of the given content reading its data from the
+    file at `path`.
+    """
+    return StaticContentStream(
+        content.location, content.name, content.content_type, open(path, 'rb'),
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    )
+
+
+def get_disk_cached_content(content):
+    """
+    Returns a StaticContentStream of the given content that reads its data from
+    the local disk cache, caching the content's data there first if needed, or
+    None if the content cannot be cached on disk.
+
+    `content` is a StaticContentStream of the asset, as loaded from the
+    contentstore, whose data has not been read yet.
+    """
+    directory, max_size = _disk_cache_config()
+    if directory is None or content.length is None or content.length > max_size:
+        return None
+
+    path = _disk_cache_path(directory, content)
+    try:
+        cached_content = _open_disk_cached_content(path, content)
+    except IOError:
+        pass
+    else:
+        try:
+            # Mark the file as recently used.
+            os.utime(path, None)
+        except OSError:
+            pass
+        return cached_content
+
+    try:
+        # Copy the data to a temporary file, and then move it into place, so
+        # that other processes never read a partially written file.
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        temp_fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.')
+        try:
+            with os.fdopen(temp_fd, 'wb') as temp_file:
+                for chunk in content.stream_data():
+                    temp_file.write(chunk)
+            os.rename(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        cached_content = _open_disk_cached_content(path, content)
+    except (IOError, OSError):
+        log.exception(u"Failed to cache content %s on disk", unicode(content.location))
+        return None
+
+    _evict_disk_cached_content(directory, max_size)
+    return cached_content
+
+
+def _evict_disk_cached_content(directory, max_size):
+    """
+    Deletes the least recently used files in the disk cache `directory` until
+    their total size is no more than `max_size` bytes.
+    """
+    cached_files = []
+    for filename in os.listdir(directory):
+        if filename.startswith('.'):
+            # A file still being written by another process.
+            continue
+        path = os.path.join(directory, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        cached_files.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for __, size, __ in cached_files)
+    for __, size, path in sorted(cached_files):
+        if total_size <= max_size:
+            break
+        try:
+            # Processes that are still serving the file can keep reading it.
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
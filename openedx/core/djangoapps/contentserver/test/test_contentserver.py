@@ -6,17 +6,21 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
+from StringIO import StringIO
+import tempfile
 import unittest
 from uuid import uuid4
 
 from django.conf import settings
-from django.test import RequestFactory
+from django.test import RequestFactory, SimpleTestCase
 from django.test.client import Client
 from django.test.utils import override_settings
 from mock import patch
 
 from xmodule.contentstore.django import contentstore
-from xmodule.contentstore.content import StaticContent, VERSIONED_ASSETS_PREFIX
+from xmodule.contentstore.content import StaticContent, StaticContentStream, VERSIONED_ASSETS_PREFIX
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.xml_importer import import_course_from_xml
@@ -27,6 +31,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
+from ..caching import del_cached_content, get_disk_cached_content
 from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
@@ -285,6 +290,47 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=(self.length_unlocked), last=(self.length_unlocked)))
         self.assertEqual(resp.status_code, 416)
 
+    @patch('openedx.core.djangoapps.contentserver.middleware.MAX_CACHED_CONTENT_SIZE', 0)
+    def test_large_asset_streamed(self):
+        """
+        Test that assets too large to be cached in memory are streamed.
+        """
+        del_cached_content(self.unlocked_asset)
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(len(''.join(resp.streaming_content)), self.length_unlocked)
+
+        first_byte = self.length_unlocked / 4
+        last_byte = self.length_unlocked / 2
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}'.format(
+            first=first_byte, last=last_byte))
+        self.assertEqual(resp.status_code, 206)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(
+            ''.join(resp.streaming_content),
+            self.contentstore.find(self.unlocked_asset).data[first_byte:last_byte + 1]
+        )
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.MAX_CACHED_CONTENT_SIZE', 0)
+    def test_large_asset_disk_cached(self):
+        """
+        Test that assets too large to be cached in memory are served from the
+        disk cache, if enabled.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        del_cached_content(self.unlocked_asset)
+        with override_settings(COURSE_ASSETS_DISK_CACHE={'DIRECTORY': directory, 'MAX_SIZE': 1048576}):
+            for __ in range(2):
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(
+                    ''.join(resp.streaming_content),
+                    self.contentstore.find(self.unlocked_asset).data
+                )
+                self.assertEqual(len(os.listdir(directory)), 1)
+
     def test_vary_header_sent(self):
         """
         Tests that we're properly setting the Vary header to ensure browser requests don't get
@@ -447,3 +493,57 @@ class ParseRangeHeaderTestCase(unittest.TestCase):
         self.assertRaisesRegexp(
             exception_class, exception_message_regex, parse_range_header, header_value, self.content_length
         )
+
+
+class DiskCacheTestCase(SimpleTestCase):
+    """
+    Tests for the local disk cache of course assets.
+    """
+    def setUp(self):
+        super(DiskCacheTestCase, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def create_content(self, name, data):
+        """
+        Returns a StaticContentStream of the given data.
+        """
+        return StaticContentStream(name, name, 'text/plain', StringIO(data), length=len(data), content_digest=name)
+
+    def disk_cache_settings(self, max_size):
+        """
+        Returns the settings override that enables the disk cache.
+        """
+        return override_settings(COURSE_ASSETS_DISK_CACHE={'DIRECTORY': self.directory, 'MAX_SIZE': max_size})
+
+    def test_disabled(self):
+        self.assertIsNone(get_disk_cached_content(self.create_content('a', 'data')))
+
+    def test_miss_then_hit(self):
+        with self.disk_cache_settings(100):
+            cached_content = get_disk_cached_content(self.create_content('a', 'data'))
+            self.assertEqual(''.join(cached_content.stream_data()), 'data')
+            self.assertEqual(''.join(cached_content.stream_data_in_range(1, 2)), 'at')
+
+            # The data is read from the disk, rather than from the given content.
+            cached_content = get_disk_cached_content(self.create_content('a', 'changed'))
+            self.assertEqual(''.join(cached_content.stream_data()), 'data')
+
+    def test_too_large(self):
+        with self.disk_cache_settings(3):
+            self.assertIsNone(get_disk_cached_content(self.create_content('a', 'data')))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_evict_least_recently_used(self):
+        with self.disk_cache_settings(10):
+            get_disk_cached_content(self.create_content('a', 'aaaa'))
+            get_disk_cached_content(self.create_content('b', 'bbbb'))
+            for filename in os.listdir(self.directory):
+                os.utime(os.path.join(self.directory, filename), (0, 0))
+            # Use "a" again, so that "b" is the least recently used.
+            get_disk_cached_content(self.create_content('a', 'aaaa'))
+
+            get_disk_cached_content(self.create_content('c', 'cccc'))
+            self.assertEqual(len(os.listdir(self.directory)), 2)
+            self.assertEqual(''.join(get_disk_cached_content(self.create_content('a', '????')).stream_data()), 'aaaa')
+            self.assertEqual(''.join(get_disk_cached_content(self.create_content('b', '????')).stream_data()), '????')
@@ -5,9 +5,10 @@ Module with family of classes for block structures.
     BlockStructureModulestoreData - responsible for xBlock data.
 
 The following internal data structures are implemented:
-    _BlockRelations - Data structure for a single block's relations.
+    _BlockRelationsIndex - Data structure for all blocks' relations.
     _BlockData - Data structure for a single block's data.
 """
+from array import array
 from copy import deepcopy
 from functools import partial
 from logging import getLogger
@@ -23,21 +24,292 @@ logger = getLogger(__name__)  # pylint: disable=invalid-name
 # A dictionary key value for storing a transformer's version number.
 TRANSFORMER_VERSION_KEY = '_version'
 
+# Typecode of the integer arrays used for storing block relations.
+_INDEX_TYPECODE = 'i'
 
-class _BlockRelations(object):
+
+class _BlockRelationsIndex(object):
     """
-    Data structure to encapsulate relationships for a single block,
-    including its children and parents.
+    Data structure to encapsulate the relationships of all blocks in a
+    block structure, including their children and parents.
+
+    Each block's usage key is mapped to a dense integer id, and the
+    children and parents of all blocks are stored by id in flat arrays
+    (in compressed sparse row format: the related ids of the block with
+    id i are found in indices[offsets[i]:offsets[i + 1]]).  Traversals
+    of the structure can then operate on integer ids rather than
+    hashing usage keys at every step.
+
+    The flat arrays are never mutated.  Blocks whose relations are
+    updated after the arrays are built instead store their related ids
+    in mutable lists that take precedence over the arrays.
     """
     def __init__(self):
 
-        # List of usage keys of this block's parents.
+        # List of usage keys of all blocks, indexed by id.  Ids of
+        # removed blocks are not reused.
         # list [UsageKey]
-        self.parents = []
+        self.keys = []
+
+        # Map of a block's usage key to its id. The existence of a block
+        # in the structure is determined by its presence in this map.
+        # dict {UsageKey: int}
+        self.ids = {}
+
+        # Number of blocks whose relations are stored in the flat arrays.
+        # int
+        self._num_indexed = 0
+
+        # Flat arrays of offsets and ids of blocks' children and parents.
+        # array [int]
+        self._children_offsets = array(_INDEX_TYPECODE, [0])
+        self._children = array(_INDEX_TYPECODE)
+        self._parents_offsets = array(_INDEX_TYPECODE, [0])
+        self._parents = array(_INDEX_TYPECODE)
+
+        # Map of a block's id to the ids of its children and parents,
+        # for blocks whose relations were updated after the flat
+        # arrays were built.
+        # dict {int: list [int]}
+        self._updated_children = {}
+        self._updated_parents = {}
 
-        # List of usage keys of this block's children.
-        # list [UsageKey]
-        self.children = []
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, usage_key):
+        return usage_key in self.ids
+
+    @classmethod
+    def from_arrays(cls, keys, children_offsets, children, parents_offsets, parents):
+        """
+        Returns a new _BlockRelationsIndex for the given usage keys, with
+        relations given by the flat arrays as returned by to_arrays.
+        """
+        relations = cls()
+        relations.keys = list(keys)
+        relations.ids = {usage_key: block_id for block_id, usage_key in enumerate(relations.keys)}
+        relations._num_indexed = len(relations.keys)  # pylint: disable=protected-access
+        relations._children_offsets = children_offsets  # pylint: disable=protected-access
+        relations._children = children  # pylint: disable=protected-access
+        relations._parents_offsets = parents_offsets  # pylint: disable=protected-access
+        relations._parents = parents  # pylint: disable=protected-access
+        return relations
+
+    @classmethod
+    def from_lists(cls, keys, children_lists, parents_lists):
+        """
+        Returns a new _BlockRelationsIndex for the given usage keys, with
+        relations given by a list of children ids and a list of parent
+        ids for each block.
+        """
+        children_offsets, children = cls._flatten(children_lists)
+        parents_offsets, parents = cls._flatten(parents_lists)
+        return cls.from_arrays(keys, children_offsets, children, parents_offsets, parents)
+
+    def to_arrays(self):
+        """
+        Returns a tuple of the usage keys of all blocks in the
+        structure, along with flat arrays of offsets and ids of their
+        children and parents, which are indexed by a block's position in
+        the returned usage keys.
+        """
+        if self._updated_children or self._updated_parents or len(self.ids) != self._num_indexed:
+            block_ids = [
+                block_id for block_id, usage_key in enumerate(self.keys)
+                if self.ids.get(usage_key) == block_id
+            ]
+            new_ids = {block_id: new_id for new_id, block_id in enumerate(block_ids)}
+            return self.from_lists(
+                [self.keys[block_id] for block_id in block_ids],
+                [[new_ids[child] for child in self.children_ids(block_id)] for block_id in block_ids],
+                [[new_ids[parent] for parent in self.parent_ids(block_id)] for block_id in block_ids],
+            ).to_arrays()
+
+        return self.keys, self._children_offsets, self._children, self._parents_offsets, self._parents
+
+    def copy(self):
+        """
+        Returns a copy of this _BlockRelationsIndex.  The flat arrays
+        are shared since they are never mutated.
+        """
+        relations = _BlockRelationsIndex.from_arrays(
+            self.keys, self._children_offsets, self._children, self._parents_offsets, self._parents,
+        )
+        relations.ids = dict(self.ids)
+        relations._num_indexed = self._num_indexed  # pylint: disable=protected-access
+        relations._updated_children = {  # pylint: disable=protected-access
+            block_id: list(children) for block_id, children in self._updated_children.iteritems()
+        }
+        relations._updated_parents = {  # pylint: disable=protected-access
+            block_id: list(parents) for block_id, parents in self._updated_parents.iteritems()
+        }
+        return relations
+
+    def children_ids(self, block_id):
+        """
+        Returns the ids of the children of the block with the given id.
+        """
+        children = self._updated_children.get(block_id)
+        if children is not None:
+            return children
+        if block_id < self._num_indexed:
+            return self._children[self._children_offsets[block_id]:self._children_offsets[block_id + 1]]
+        return []
+
+    def parent_ids(self, block_id):
+        """
+        Returns the ids of the parents of the block with the given id.
+        """
+        parents = self._updated_parents.get(block_id)
+        if parents is not None:
+            return parents
+        if block_id < self._num_indexed:
+            return self._parents[self._parents_offsets[block_id]:self._parents_offsets[block_id + 1]]
+        return []
+
+    def get_children(self, usage_key):
+        """
+        Returns the usage keys of the children of the given block.
+        """
+        block_id = self.ids.get(usage_key)
+        if block_id is None:
+            return []
+        keys = self.keys
+        return [keys[child] for child in self.children_ids(block_id)]
+
+    def get_parents(self, usage_key):
+        """
+        Returns the usage keys of the parents of the given block.
+        """
+        block_id = self.ids.get(usage_key)
+        if block_id is None:
+            return []
+        keys = self.keys
+        return [keys[parent] for parent in self.parent_ids(block_id)]
+
+    def add_block(self, usage_key):
+        """
+        Adds the given usage_key, if not already present, and returns
+        its id.
+        """
+        block_id = self.ids.get(usage_key)
+        if block_id is None:
+            block_id = len(self.keys)
+            self.keys.append(usage_key)
+            self.ids[usage_key] = block_id
+        return block_id
+
+    def add_relation(self, parent_key, child_key):
+        """
+        Adds a parent to child relationship, adding the blocks if
+        not already present.
+        """
+        self._add_relation_ids(self.add_block(parent_key), self.add_block(child_key))
+
+    def clear_parents(self, usage_key):
+        """
+        Removes all parents of the given block, without updating the
+        children of those parents.
+        """
+        self._updated_parents[self.ids[usage_key]] = []
+
+    def remove_block(self, usage_key, keep_descendants):
+        """
+        Removes the given block and its immediate relations.  See the
+        description in BlockStructureBlockData.remove_block.
+
+        Raises KeyError if the block is not present.
+        """
+        block_id = self.ids.pop(usage_key)
+        children = list(self.children_ids(block_id))
+        parents = list(self.parent_ids(block_id))
+        self._updated_children[block_id] = []
+        self._updated_parents[block_id] = []
+
+        # Remove block from its children.
+        for child in children:
+            self._mutable_parent_ids(child).remove(block_id)
+
+        # Remove block from its parents.
+        for parent in parents:
+            self._mutable_children_ids(parent).remove(block_id)
+
+        # Recreate the graph connections if descendants are to be kept.
+        if keep_descendants:
+            for child in children:
+                for parent in parents:
+                    self._add_relation_ids(parent, child)
+
+    def pruned(self, root_key):
+        """
+        Returns a new _BlockRelationsIndex containing only the blocks
+        reachable from the given root block.
+        """
+        root_id = self.ids.get(root_key)
+        if root_id is None:
+            return _BlockRelationsIndex()
+
+        # Build the structure from the leaves up by doing a post-order
+        # traversal, thereby encountering only reachable blocks, with
+        # children encountered before their parents.
+        new_ids = {}
+        keys = []
+        children_lists = []
+        parents_lists = []
+        for block_id in traverse_post_order(start_node=root_id, get_children=self.children_ids):
+            new_id = len(keys)
+            new_ids[block_id] = new_id
+            keys.append(self.keys[block_id])
+            parents_lists.append([])
+
+            # Add a relationship to only those children that were also
+            # added to the new pruned structure.
+            children = [new_ids[child] for child in self.children_ids(block_id) if child in new_ids]
+            children_lists.append(children)
+            for child in children:
+                parents_lists[child].append(new_id)
+
+        return self.from_lists(keys, children_lists, parents_lists)
+
+    def _add_relation_ids(self, parent_id, child_id):
+        """
+        Adds a parent to child relationship between the blocks with the
+        given ids.
+        """
+        self._mutable_parent_ids(child_id).append(parent_id)
+        self._mutable_children_ids(parent_id).append(child_id)
+
+    def _mutable_children_ids(self, block_id):
+        """
+        Returns a mutable list of the children ids of the given block.
+        """
+        children = self._updated_children.get(block_id)
+        if children is None:
+            children = self._updated_children[block_id] = list(self.children_ids(block_id))
+        return children
+
+    def _mutable_parent_ids(self, block_id):
+        """
+        Returns a mutable list of the parent ids of the given block.
+        """
+        parents = self._updated_parents.get(block_id)
+        if parents is None:
+            parents = self._updated_parents[block_id] = list(self.parent_ids(block_id))
+        return parents
+
+    @staticmethod
+    def _flatten(lists):
+        """
+        Returns a pair of flat arrays (offsets, indices) for the given
+        list of lists of ids.
+        """
+        offsets = array(_INDEX_TYPECODE, [0])
+        indices = array(_INDEX_TYPECODE)
+        for ids in lists:
+            indices.extend(ids)
+            offsets.append(len(indices))
+        return offsets, indices
 
 
 class BlockStructure(object):
@@ -56,14 +328,14 @@ class BlockStructure(object):
         # UsageKey
         self.root_block_usage_key = root_block_usage_key
 
-        # Map of a block's usage key to its block relations. The
+        # Integer-indexed relations of all blocks in the structure. The
         # existence of a block in the structure is determined by its
-        # presence in this map.
-        # dict {UsageKey: _BlockRelations}
-        self._block_relations = {}
+        # presence in this index.
+        # _BlockRelationsIndex
+        self._block_relations = _BlockRelationsIndex()
 
         # Add the root block.
-        self._add_block(self._block_relations, root_block_usage_key)
+        self._block_relations.add_block(root_block_usage_key)
 
     def __iter__(self):
         """
@@ -91,7 +363,7 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        return self._block_relations.get_parents(usage_key)
 
     def get_children(self, usage_key):
         """
@@ -105,7 +377,7 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        return self._block_relations.get_children(usage_key)
 
     def set_root_block(self, usage_key):
         """
@@ -120,7 +392,7 @@ class BlockStructure(object):
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._block_relations.clear_parents(usage_key)
 
     def __contains__(self, usage_key):
         """
@@ -145,7 +417,7 @@ class BlockStructure(object):
             iterator(UsageKey) - An iterator of the usage
             keys of all the blocks in the block structure.
         """
-        return self._block_relations.iterkeys()
+        return self._block_relations.ids.iterkeys()
 
     #--- Block structure traversal methods ---#
 
@@ -159,6 +431,8 @@ class BlockStructure(object):
         Performs a topological sort of the block structure and yields
         the usage_key of each block as it is encountered.
 
+        The traversal itself operates on the blocks' integer ids.
+
         Arguments:
             See the description in
             openedx.core.lib.graph_traversals.traverse_topologically.
@@ -167,13 +441,24 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_topologically method.
         """
-        return traverse_topologically(
-            start_node=start_node or self.root_block_usage_key,
-            get_parents=self.get_parents,
-            get_children=self.get_children,
-            filter_func=filter_func,
+        start_node = start_node or self.root_block_usage_key
+        if start_node not in self:
+            return traverse_topologically(
+                start_node=start_node,
+                get_parents=self.get_parents,
+                get_children=self.get_children,
+                filter_func=filter_func,
+                yield_descendants_of_unyielded=yield_descendants_of_unyielded,
+            )
+
+        relations = self._block_relations
+        return self._usage_keys(traverse_topologically(
+            start_node=relations.ids[start_node],
+            get_parents=relations.parent_ids,
+            get_children=relations.children_ids,
+            filter_func=self._id_filter(filter_func),
             yield_descendants_of_unyielded=yield_descendants_of_unyielded,
-        )
+        ))
 
     def post_order_traversal(
             self,
@@ -184,6 +469,8 @@ class BlockStructure(object):
         Performs a post-order sort of the block structure and yields
         the usage_key of each block as it is encountered.
 
+        The traversal itself operates on the blocks' integer ids.
+
         Arguments:
             See the description in
             openedx.core.lib.graph_traversals.traverse_post_order.
@@ -192,11 +479,20 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_post_order method.
         """
-        return traverse_post_order(
-            start_node=start_node or self.root_block_usage_key,
-            get_children=self.get_children,
-            filter_func=filter_func,
-        )
+        start_node = start_node or self.root_block_usage_key
+        if start_node not in self:
+            return traverse_post_order(
+                start_node=start_node,
+                get_children=self.get_children,
+                filter_func=filter_func,
+            )
+
+        relations = self._block_relations
+        return self._usage_keys(traverse_post_order(
+            start_node=relations.ids[start_node],
+            get_children=relations.children_ids,
+            filter_func=self._id_filter(filter_func),
+        ))
 
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
@@ -205,29 +501,7 @@ class BlockStructure(object):
         """
         Mutates this block structure by removing any unreachable blocks.
         """
-
-        # Create a new block relations map to store only those blocks
-        # that are still linked
-        pruned_block_relations = {}
-        old_block_relations = self._block_relations
-
-        # Build the structure from the leaves up by doing a post-order
-        # traversal of the old structure, thereby encountering only
-        # reachable blocks.
-        for block_key in self.post_order_traversal():
-            # If the block is in the old structure,
-            if block_key in old_block_relations:
-                # Add it to the new pruned structure
-                self._add_block(pruned_block_relations, block_key)
-
-                # Add a relationship to only those old children that
-                # were also added to the new pruned structure.
-                for child in old_block_relations[block_key].children:
-                    if child in pruned_block_relations:
-                        self._add_to_relations(pruned_block_relations, block_key, child)
-
-        # Replace this structure's relations with the newly pruned one.
-        self._block_relations = pruned_block_relations
+        self._block_relations = self._block_relations.pruned(self.root_block_usage_key)
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -237,44 +511,25 @@ class BlockStructure(object):
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
-        self._add_to_relations(self._block_relations, parent_key, child_key)
+        self._block_relations.add_relation(parent_key, child_key)
 
-    @staticmethod
-    def _add_to_relations(block_relations, parent_key, child_key):
+    def _usage_keys(self, block_ids):
         """
-        Adds a parent to child relationship in the given block
-        relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            parent_key (UsageKey) - Usage key of the parent block.
-
-            child_key (UsageKey) - Usage key of the child block.
+        Generator that yields the usage key of each of the given block ids.
         """
-        BlockStructure._add_block(block_relations, parent_key)
-        BlockStructure._add_block(block_relations, child_key)
-
-        block_relations[child_key].parents.append(parent_key)
-        block_relations[parent_key].children.append(child_key)
+        keys = self._block_relations.keys
+        for block_id in block_ids:
+            yield keys[block_id]
 
-    @staticmethod
-    def _add_block(block_relations, usage_key):
+    def _id_filter(self, filter_func):
         """
-        Adds the given usage_key to the given block_relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            usage_key (UsageKey) - Usage key of the block that is to
-                be added to the given block_relations.
+        Returns a filter function on block ids for the given filter
+        function on usage keys.
         """
-        if usage_key not in block_relations:
-            block_relations[usage_key] = _BlockRelations()
+        if filter_func is None:
+            return None
+        keys = self._block_relations.keys
+        return lambda block_id: filter_func(keys[block_id])
 
 
 class FieldData(object):
@@ -401,7 +656,7 @@ class BlockStructureBlockData(BlockStructure):
     # update this value whenever the data structure changes. Dependent storage
     # layers can then use this value when serializing/deserializing block
     # structures, and invalidating any previously cached/stored data.
-    VERSION = 1
+    VERSION = 2
 
     def __init__(self, root_block_usage_key):
         super(BlockStructureBlockData, self).__init__(root_block_usage_key)
@@ -422,7 +677,7 @@ class BlockStructureBlockData(BlockStructure):
         from .factory import BlockStructureFactory
         return BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
+            self._block_relations.copy(),
             deepcopy(self.transformer_data),
             deepcopy(self._block_data_map),
         )
@@ -602,27 +857,9 @@ class BlockStructureBlockData(BlockStructure):
                 removed block's children become children of the
                 removed block's parents.
         """
-        children = self._block_relations[usage_key].children
-        parents = self._block_relations[usage_key].parents
-
-        # Remove block from its children.
-        for child in children:
-            self._block_relations[child].parents.remove(usage_key)
-
-        # Remove block from its parents.
-        for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
-
-        # Remove block.
-        self._block_relations.pop(usage_key, None)
+        self._block_relations.remove_block(usage_key, keep_descendants)
         self._block_data_map.pop(usage_key, None)
 
-        # Recreate the graph connections if descendants are to be kept.
-        if keep_descendants:
-            for child in children:
-                for parent in parents:
-                    self._add_relation(parent, child)
-
     def create_universal_filter(self):
         """
         Returns a filter function that always returns True for all blocks.
@@ -4,10 +4,9 @@ Module for the Cache class for BlockStructure objects.
 # pylint: disable=protected-access
 from logging import getLogger
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
-
 from .block_structure import BlockStructureBlockData
-from .factory import BlockStructureFactory
+from .exceptions import BlockStructureSerializationError
+from .serializer import BlockStructureSerializer
 
 
 logger = getLogger(__name__)  # pylint: disable=C0103
@@ -28,37 +27,33 @@ class BlockStructureCache(object):
 
     def add(self, block_structure):
         """
-        Store a compressed and pickled serialization of the given
-        block structure into the given cache.
+        Store a compact serialization of the given block structure
+        into the given cache.
 
         The key in the cache is 'root.key.<root_block_usage_key>'.
         The data stored in the cache includes the structure's
-        block relations, transformer data, and block data.
+        block relations, transformer data, and block data, as
+        serialized by BlockStructureSerializer.
 
         Arguments:
             block_structure (BlockStructure) - The block structure
                 that is to be serialized to the given cache.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        zp_data_to_cache = zpickle(data_to_cache)
+        serialized_data = BlockStructureSerializer.serialize(block_structure)
 
         # Set the timeout value for the cache to 1 day as a fail-safe
         # in case the signal to invalidate the cache doesn't come through.
         timeout_in_seconds = 60 * 60 * 24
         self._cache.set(
             self._encode_root_cache_key(block_structure.root_block_usage_key),
-            zp_data_to_cache,
+            serialized_data,
             timeout=timeout_in_seconds,
         )
 
         logger.info(
             "Wrote BlockStructure %s to cache, size: %s",
             block_structure.root_block_usage_key,
-            len(zp_data_to_cache),
+            len(serialized_data),
         )
 
     def get(self, root_block_usage_key):
@@ -82,8 +77,8 @@ class BlockStructureCache(object):
         """
 
         # Find root_block_usage_key in the cache.
-        zp_data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
-        if not zp_data_from_cache:
+        serialized_data = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
+        if not serialized_data:
             logger.info(
                 "Did not find BlockStructure %r in the cache.",
                 root_block_usage_key,
@@ -93,17 +88,18 @@ class BlockStructureCache(object):
             logger.info(
                 "Read BlockStructure %r from cache, size: %s",
                 root_block_usage_key,
-                len(zp_data_from_cache),
+                len(serialized_data),
             )
 
         # Deserialize and construct the block structure.
-        block_relations, transformer_data, block_data_map = zunpickle(zp_data_from_cache)
-        return BlockStructureFactory.create_new(
-            root_block_usage_key,
-            block_relations,
-            transformer_data,
-            block_data_map,
-        )
+        try:
+            return BlockStructureSerializer.deserialize(root_block_usage_key, serialized_data)
+        except BlockStructureSerializationError:
+            logger.info(
+                "Ignoring BlockStructure %r in the cache with an outdated serialization format.",
+                root_block_usage_key,
+            )
+            return None
 
     def delete(self, root_block_usage_key):
         """
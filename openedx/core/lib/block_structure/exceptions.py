@@ -15,3 +15,10 @@ class UsageKeyNotInBlockStructure(Exception):
     Exception for when a usage key is not found within a block structure.
     """
     pass
+
+
+class BlockStructureSerializationError(Exception):
+    """
+    Exception for when serialized block structure data cannot be read.
+    """
+    pass
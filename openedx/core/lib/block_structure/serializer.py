@@ -0,0 +1,307 @@
+"""
+Module for the compact, versioned serialization of BlockStructure objects.
+
+A collected block structure is serialized in a columnar format rather
+than as pickled per-block objects:
+
+    * Usage keys are interned in a single key table and all other
+      sections refer to a block by its integer index in that table.
+    * Parent and child relations are stored as the flat integer
+      adjacency arrays (offsets + indices) of the structure's
+      _BlockRelationsIndex.
+    * Collected xBlock fields are stored as one column per field name,
+      mapping block index to value.
+    * Block-specific transformer data is stored as one separately
+      compressed column per transformer, which is only decompressed and
+      unpickled when a block's data for that transformer is first
+      accessed.
+
+The serialized data is prefixed with a format header so readers can
+detect (and ignore) data written with a different format version.
+"""
+from array import array
+import cPickle as pickle
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import _INDEX_TYPECODE, _BlockRelationsIndex, BlockData, TransformerData, TransformerDataMap
+from .exceptions import BlockStructureSerializationError
+from .factory import BlockStructureFactory
+
+
+class BlockStructureSerializer(object):
+    """
+    Serializer for the collected data of BlockStructureBlockData objects.
+    """
+    # The version of the serialization format.  Increment this value
+    # whenever the layout of the serialized data changes.
+    FORMAT_VERSION = 2
+
+    @classmethod
+    def format_header(cls):
+        """
+        Returns the header that prefixes all data serialized with the
+        current format version.
+        """
+        return 'BSv{}:'.format(cls.FORMAT_VERSION)
+
+    @classmethod
+    def serialize(cls, block_structure):
+        """
+        Returns a compact serialization of the given block structure's
+        block relations, transformer data, and block data.
+
+        Arguments:
+            block_structure (BlockStructureBlockData) - The block
+                structure that is to be serialized.
+
+        Returns:
+            str - The serialized data, including the format header.
+        """
+        # pylint: disable=protected-access
+        block_relations = block_structure._block_relations
+        block_data_map = block_structure._block_data_map
+
+        # Intern all usage keys, starting with those of the blocks in
+        # the structure's relations, whose relations are stored in flat
+        # arrays indexed by the key's position.
+        block_keys, children_offsets, children, parents_offsets, parents = block_relations.to_arrays()
+        num_blocks = len(block_keys)
+        block_keys = list(block_keys)
+        block_keys.extend(key for key in block_data_map if key not in block_relations)
+        index_by_key = {block_key: index for index, block_key in enumerate(block_keys)}
+
+        blocks_with_data = array(_INDEX_TYPECODE, sorted(index_by_key[key] for key in block_data_map))
+
+        xblock_field_columns = {}
+        transformer_columns = {}
+        for block_key, block_data in block_data_map.iteritems():
+            block_index = index_by_key[block_key]
+            for field_name, value in block_data.fields.iteritems():
+                xblock_field_columns.setdefault(field_name, {})[block_index] = value
+            for transformer_name, transformer_data in block_data.transformer_data.iteritems():
+                transformer_columns.setdefault(transformer_name, {})[block_index] = transformer_data.fields
+
+        sections = (
+            zpickle((
+                block_keys,
+                num_blocks,
+                children_offsets.tostring(),
+                children.tostring(),
+                parents_offsets.tostring(),
+                parents.tostring(),
+                blocks_with_data.tostring(),
+            )),
+            zpickle(block_structure.transformer_data),
+            zpickle(xblock_field_columns),
+            {
+                transformer_name: zpickle(column)
+                for transformer_name, column in transformer_columns.iteritems()
+            },
+        )
+        return cls.format_header() + pickle.dumps(sections, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def deserialize(cls, root_block_usage_key, serialized_data):
+        """
+        Returns a new block structure from the given data that was
+        previously returned by serialize.
+
+        Block-specific transformer data is not materialized until it is
+        first accessed.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure.
+
+            serialized_data (str) - The data returned by serialize.
+
+        Raises:
+            BlockStructureSerializationError - if the data was not
+                serialized with the current format version.
+        """
+        header = cls.format_header()
+        if not serialized_data.startswith(header):
+            raise BlockStructureSerializationError(
+                "Serialized block structure data does not match format version {}.".format(cls.FORMAT_VERSION)
+            )
+
+        structure_section, transformer_data_section, xblock_fields_section, transformer_sections = pickle.loads(
+            serialized_data[len(header):]
+        )
+        (
+            block_keys,
+            num_blocks,
+            children_offsets,
+            children,
+            parents_offsets,
+            parents,
+            blocks_with_data,
+        ) = zunpickle(structure_section)
+
+        block_relations = _BlockRelationsIndex.from_arrays(
+            block_keys[:num_blocks],
+            cls._decode_array(children_offsets),
+            cls._decode_array(children),
+            cls._decode_array(parents_offsets),
+            cls._decode_array(parents),
+        )
+
+        transformer_columns = _TransformerBlockColumns(transformer_sections)
+        block_data_map = {}
+        for block_index in cls._decode_array(blocks_with_data):
+            block_key = block_keys[block_index]
+            block_data = BlockData(block_key)
+            block_data.transformer_data = _LazyTransformerDataMap(transformer_columns, block_index)
+            block_data_map[block_key] = block_data
+
+        for field_name, column in zunpickle(xblock_fields_section).iteritems():
+            for block_index, value in column.iteritems():
+                block_data_map[block_keys[block_index]].fields[field_name] = value
+
+        return BlockStructureFactory.create_new(
+            root_block_usage_key,
+            block_relations,
+            zunpickle(transformer_data_section),
+            block_data_map,
+        )
+
+    @staticmethod
+    def _decode_array(encoded):
+        """
+        Returns the integer array for the given encoded string.
+        """
+        decoded = array(_INDEX_TYPECODE)
+        decoded.fromstring(encoded)
+        return decoded
+
+
+class _TransformerBlockColumns(object):
+    """
+    Data structure holding the serialized block-specific transformer data
+    of a deserialized block structure, with one column per transformer.
+    A column is decompressed and unpickled only once a block's data for
+    that transformer is requested.
+    """
+    def __init__(self, encoded_columns):
+
+        # Map of a transformer's name to its compressed and pickled
+        # column of block-specific data.
+        # dict {string: str}
+        self._encoded_columns = encoded_columns
+
+        # Map of a transformer's name to its unpickled column of
+        # block-specific data that has not been handed out yet.
+        # dict {string: dict {int: dict}}
+        self._decoded_columns = {}
+
+    def transformer_names(self):
+        """
+        Returns the names of all transformers with data in the columns.
+        """
+        return list(self._encoded_columns) + list(self._decoded_columns)
+
+    def pop(self, transformer_name, block_index):
+        """
+        Removes and returns the TransformerData of the given transformer
+        for the block at the given index.
+
+        Raises KeyError if not found.
+        """
+        column = self._decoded_columns.get(transformer_name)
+        if column is None:
+            column = zunpickle(self._encoded_columns.pop(transformer_name))
+            self._decoded_columns[transformer_name] = column
+
+        transformer_data = TransformerData()
+        transformer_data.fields = column.pop(block_index)
+        return transformer_data
+
+
+class _LazyTransformerDataMap(TransformerDataMap):
+    """
+    A TransformerDataMap for a single block of a deserialized block
+    structure, which materializes the block's data for a transformer
+    from the shared _TransformerBlockColumns on first access.
+    """
+    def __init__(self, transformer_columns, block_index):
+        super(_LazyTransformerDataMap, self).__init__()
+        self._transformer_columns = transformer_columns
+        self._block_index = block_index
+
+    def __reduce__(self):
+        # Copy and pickle only the materialized entries, along with the
+        # shared columns, so that copying a block structure does not
+        # materialize all of its transformer data.
+        return (
+            _LazyTransformerDataMap,
+            (self._transformer_columns, self._block_index),
+            None,
+            None,
+            dict.iteritems(self),
+        )
+
+    def __getitem__(self, key):
+        key = self._translate_key(key)
+        try:
+            return dict.__getitem__(self, key)
+        except KeyError:
+            transformer_data = self._transformer_columns.pop(key, self._block_index)
+            dict.__setitem__(self, key, transformer_data)
+            return transformer_data
+
+    def __delitem__(self, key):
+        self.__getitem__(key)
+        super(_LazyTransformerDataMap, self).__delitem__(key)
+
+    def __contains__(self, key):
+        try:
+            self.__getitem__(key)
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self.__getitem__(key)
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        return self.iterkeys()
+
+    def __len__(self):
+        self._materialize_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._materialize_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._materialize_all()
+        return dict.values(self)
+
+    def items(self):
+        self._materialize_all()
+        return dict.items(self)
+
+    def iterkeys(self):
+        self._materialize_all()
+        return dict.iterkeys(self)
+
+    def itervalues(self):
+        self._materialize_all()
+        return dict.itervalues(self)
+
+    def iteritems(self):
+        self._materialize_all()
+        return dict.iteritems(self)
+
+    def _materialize_all(self):
+        """
+        Materializes this block's data for all transformers.
+        """
+        for transformer_name in self._transformer_columns.transformer_names():
+            if not dict.__contains__(self, transformer_name):
+                self.get(transformer_name)
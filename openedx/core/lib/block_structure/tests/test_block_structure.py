@@ -9,7 +9,7 @@ import itertools
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
-from openedx.core.lib.graph_traversals import traverse_post_order
+from openedx.core.lib.graph_traversals import traverse_post_order, traverse_topologically
 
 from ..block_structure import BlockStructure, BlockStructureModulestoreData
 from ..exceptions import TransformerException
@@ -223,6 +223,45 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         block_structure.remove_block_traversal(lambda block: block == 2)
         self.assert_block_structure(block_structure, [[1], [], [], []], missing_blocks=[2])
 
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_traversals(self, children_map):
+        block_structure = self.create_block_structure(children_map)
+        self.assertEquals(
+            list(block_structure.topological_traversal()),
+            list(traverse_topologically(0, self.get_parents_map(children_map).__getitem__, children_map.__getitem__)),
+        )
+        self.assertEquals(
+            list(block_structure.post_order_traversal(filter_func=lambda block: block != 1)),
+            list(traverse_post_order(0, children_map.__getitem__, filter_func=lambda block: block != 1)),
+        )
+
+    def test_relations_after_prune(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        block_structure.remove_block(2, keep_descendants=False)
+        block_structure._prune_unreachable()
+        self.assert_block_structure(
+            block_structure, [[1], [3], [], [5, 6], [], [], []], missing_blocks=[2, 4],
+        )
+
+        # the pruned relations are still mutable
+        block_structure.remove_block(3, keep_descendants=True)
+        block_structure._add_relation(6, 4)
+        self.assert_block_structure(
+            block_structure, [[1], [5, 6], [], [], [], [], [4]], missing_blocks=[2, 3],
+        )
+
+        keys, children_offsets, children, _, _ = block_structure._block_relations.to_arrays()
+        self.assertEquals(len(keys), 5)
+        self.assertEquals(
+            {keys[index]: {keys[child] for child in children[children_offsets[index]:children_offsets[index + 1]]}
+             for index in range(len(keys))},
+            {0: {1}, 1: {5, 6}, 4: set(), 5: set(), 6: {4}},
+        )
+
     def test_copy(self):
         def _set_value(structure, value):
             """
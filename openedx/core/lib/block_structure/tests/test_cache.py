@@ -54,3 +54,14 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
         self.assertIsNone(
             self.block_structure_cache.get(self.block_structure.root_block_usage_key)
         )
+
+    def test_get_outdated_format(self):
+        self.add_transformers()
+        self.block_structure_cache.add(self.block_structure)
+        cache_key = self.block_structure_cache._encode_root_cache_key(  # pylint: disable=protected-access
+            self.block_structure.root_block_usage_key
+        )
+        self.mock_cache.map[cache_key] = 'outdated serialized data'
+        self.assertIsNone(
+            self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        )
@@ -0,0 +1,96 @@
+"""
+Tests for block_structure/serializer.py
+"""
+from copy import deepcopy
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from ..exceptions import BlockStructureSerializationError
+from ..serializer import BlockStructureSerializer
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@attr(shard=2)
+class TestBlockStructureSerializer(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockStructureSerializer
+    """
+    def setUp(self):
+        super(TestBlockStructureSerializer, self).setUp()
+        self.children_map = self.DAG_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.block_structure._add_transformer(MockTransformer)  # pylint: disable=protected-access
+        for block_key in self.block_structure:
+            self.block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key * 10)
+            block = self.block_structure._get_or_create_block(block_key)  # pylint: disable=protected-access
+            block.display_name = u'Block {}'.format(block_key)
+
+    def round_trip(self):
+        """
+        Returns a new block structure serialized from and deserialized
+        into this test's block structure.
+        """
+        return BlockStructureSerializer.deserialize(
+            self.block_structure.root_block_usage_key,
+            BlockStructureSerializer.serialize(self.block_structure),
+        )
+
+    def test_round_trip(self):
+        deserialized = self.round_trip()
+        self.assert_block_structure(deserialized, self.children_map)
+        self.assertEquals(
+            deserialized._get_transformer_data_version(MockTransformer),  # pylint: disable=protected-access
+            MockTransformer.VERSION,
+        )
+        for block_key in self.block_structure:
+            self.assertEquals(deserialized.get_xblock_field(block_key, 'display_name'), u'Block {}'.format(block_key))
+            self.assertEquals(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'test'),
+                block_key * 10,
+            )
+            self.assertEquals(deserialized[block_key].transformer_data[MockTransformer].test, block_key * 10)
+
+    def test_relations_order(self):
+        deserialized = self.round_trip()
+        for block_key in self.block_structure:
+            self.assertEquals(deserialized.get_children(block_key), self.block_structure.get_children(block_key))
+            self.assertEquals(deserialized.get_parents(block_key), self.block_structure.get_parents(block_key))
+
+    def test_lazy_transformer_data(self):
+        deserialized = self.round_trip()
+        transformer_columns = deserialized[0].transformer_data._transformer_columns  # pylint: disable=protected-access
+        self.assertEquals(transformer_columns._decoded_columns, {})  # pylint: disable=protected-access
+
+        self.assertEquals(deserialized.get_transformer_block_field(3, MockTransformer, 'test'), 30)
+        self.assertIn(MockTransformer.name(), transformer_columns._decoded_columns)  # pylint: disable=protected-access
+
+    def test_missing_transformer_data(self):
+        deserialized = self.round_trip()
+        self.assertIsNone(deserialized.get_transformer_block_field(0, 'unknown_transformer', 'test'))
+        self.assertNotIn('unknown_transformer', deserialized[0].transformer_data)
+
+    def test_copy(self):
+        deserialized = self.round_trip()
+        self.assertEquals(deserialized.get_transformer_block_field(1, MockTransformer, 'test'), 10)
+
+        copied = deserialized.copy()
+        copied.set_transformer_block_field(1, MockTransformer, 'test', 'updated')
+        copied.set_transformer_block_field(2, MockTransformer, 'test', 'updated')
+        self.assertEquals(deserialized.get_transformer_block_field(1, MockTransformer, 'test'), 10)
+        self.assertEquals(deserialized.get_transformer_block_field(2, MockTransformer, 'test'), 20)
+        self.assertEquals(
+            dict(deepcopy(copied[4].transformer_data).iteritems())[MockTransformer.name()].test,
+            40,
+        )
+
+    def test_reserialize(self):
+        self.block_structure = self.round_trip()
+        self.test_round_trip()
+
+    def test_format_version_mismatch(self):
+        serialized_data = BlockStructureSerializer.serialize(self.block_structure)
+        with self.assertRaises(BlockStructureSerializationError):
+            BlockStructureSerializer.deserialize(
+                self.block_structure.root_block_usage_key,
+                'BSv0:' + serialized_data[len(BlockStructureSerializer.format_header()):],
+            )
@@ -53,6 +53,7 @@ setup(
             "course_blocks_api = lms.djangoapps.course_api.blocks.transformers.blocks_api:BlocksAPITransformer",
             "milestones = lms.djangoapps.course_api.blocks.transformers.milestones:MilestonesTransformer",
             "grades = lms.djangoapps.grades.transformer:GradesTransformer",
+            "discussion_topics = lms.djangoapps.django_comment_client.transformers:DiscussionTopicsTransformer",
         ],
     }
 )